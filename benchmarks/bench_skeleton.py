@@ -0,0 +1,117 @@
+"""Benchmark loading and sharing configuration skeletons.
+
+Builds the skeleton of the captured 502 frame in ``tests/data/v2messages``,
+serializes it in JSON and binary formats and measures how long it takes to
+load it ``--count`` times, as the fleet service does at startup. Then measures
+the memory held by ``--clients`` copies of that skeleton, with and without a
+shared SkeletonStore.
+
+Usage:
+    uv run python benchmarks/bench_skeleton.py
+    uv run python benchmarks/bench_skeleton.py --count 1000 --rounds 10 --clients 800
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from aioiregul.v2.client import IRegulClient  # noqa: E402
+from aioiregul.v2.decoder import decode_file  # noqa: E402
+from aioiregul.v2.skeleton import (  # noqa: E402
+    Skeleton,
+    SkeletonStore,
+    dump_skeleton,
+    load_skeleton,
+    skeleton_from_json,
+    skeleton_to_json,
+)
+
+FRAME = ROOT / "tests" / "data" / "v2messages" / "502-NEW.txt"
+
+
+def build_skeleton() -> Skeleton:
+    """Build the skeleton cached by the client for the captured 502 frame."""
+    decoded = asyncio.run(decode_file(str(FRAME)))
+    client = IRegulClient(host="bench", port=1, device_id="dev", password="pw")
+    skeleton: Skeleton = {}
+    client._merge_values_into_skeleton(skeleton, decoded.groups)  # pyright: ignore[reportPrivateUsage]
+    return skeleton
+
+
+def time_loads(loader: Callable[[bytes], Skeleton], blobs: list[bytes], rounds: int) -> list[float]:
+    """Return the time in milliseconds to load every blob, per round."""
+    durations: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for blob in blobs:
+            loader(blob)
+        durations.append((time.perf_counter_ns() - start) / 1e6)
+    return durations
+
+
+def measure_memory(blob: bytes, clients: int, store: SkeletonStore | None) -> int:
+    """Return the bytes held by ``clients`` skeletons loaded from ``blob``."""
+    tracemalloc.start()
+    try:
+        skeletons: list[Skeleton] = []
+        for _ in range(clients):
+            skeleton = load_skeleton(blob)
+            skeletons.append(store.intern(skeleton) if store is not None else skeleton)
+        del skeleton
+        current, _ = tracemalloc.get_traced_memory()
+        return current
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000, help="Skeletons loaded per round")
+    parser.add_argument("--rounds", type=int, default=10, help="Number of rounds")
+    parser.add_argument(
+        "--clients", type=int, default=800, help="Skeletons held for the memory comparison"
+    )
+    args = parser.parse_args()
+
+    skeleton = build_skeleton()
+    entries = sum(len(indexes) for indexes in skeleton.values())
+    formats: dict[str, tuple[bytes, Callable[[bytes], Skeleton]]] = {
+        "json": (skeleton_to_json(skeleton).encode(), skeleton_from_json),
+        "binary": (dump_skeleton(skeleton), load_skeleton),
+    }
+    for blob, loader in formats.values():
+        assert loader(blob) == skeleton
+
+    print(f"Skeleton: {len(skeleton)} groups, {entries} entries; loading {args.count} per round")
+    print(f"{'format':>8} {'size B':>8} {'median ms':>10} {'min ms':>8} {'us/skeleton':>12}")
+    for name, (blob, loader) in formats.items():
+        # Distinct objects per skeleton, as when reading separate files
+        blobs = [bytes(bytearray(blob)) for _ in range(args.count)]
+        durations = time_loads(loader, blobs, args.rounds)
+        median = statistics.median(durations)
+        print(
+            f"{name:>8} {len(blob):>8} {median:>10.2f} {min(durations):>8.2f} "
+            f"{median * 1000 / args.count:>12.1f}"
+        )
+
+    blob = formats["binary"][0]
+    print(f"\nMemory held by {args.clients} skeletons:")
+    for name, store in (("private", None), ("shared", SkeletonStore())):
+        held = measure_memory(blob, args.clients, store)
+        print(f"{name:>8} {held / 1e6:>8.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Benchmark the v2 frame transports on large synthetic frames.
+
+Starts a local TCP server answering each command with a single frame of the
+requested size, written in 64 KiB chunks, and measures how long each transport
+takes to connect, send the command and read the frame back.
+
+The stream transport is given a buffer limit larger than the frame so that it
+can read it at all; with its default limit of 100 000 bytes every frame below
+would fail with ``LimitOverrunError``.
+
+Usage:
+    uv run python benchmarks/bench_transport.py
+    uv run python benchmarks/bench_transport.py --sizes 100000 1000000 --rounds 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from aioiregul.v2.transport import FrameTransport, ProtocolTransport, StreamTransport  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_frame(size: int) -> bytes:
+    """Build a syntactically valid 502-like frame of roughly ``size`` bytes."""
+    token = b"B@1&nom_registre[Temperature depart]#"
+    body = token * max(1, size // len(token))
+    return b"15/01/2025 23:38:51{200#" + body + b"}"
+
+
+async def start_server(frame: bytes) -> asyncio.Server:
+    """Start a local server replying to every command with ``frame``."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readuntil(b"}")
+        view = memoryview(frame)
+        for start in range(0, len(frame), CHUNK_SIZE):
+            writer.write(view[start : start + CHUNK_SIZE])
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def time_transport(transport: FrameTransport, port: int, rounds: int) -> list[float]:
+    """Return per-round durations in milliseconds."""
+    durations: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        connection = await transport.connect("127.0.0.1", port)
+        try:
+            await connection.send(b"cdraminfodevpw{502#}")
+            await connection.read_frame()
+        finally:
+            await connection.close()
+        durations.append((time.perf_counter_ns() - start) / 1e6)
+    return durations
+
+
+async def run(sizes: list[int], rounds: int) -> None:
+    """Run the benchmark for every frame size and print a summary table."""
+    print(f"{'frame size':>12} {'transport':>10} {'median ms':>10} {'p95 ms':>10} {'MB/s':>8}")
+    for size in sizes:
+        frame = build_frame(size)
+        server = await start_server(frame)
+        port = server.sockets[0].getsockname()[1]
+        transports: dict[str, FrameTransport] = {
+            "stream": StreamTransport(limit=len(frame) + 1),
+            "protocol": ProtocolTransport(),
+        }
+        try:
+            for name, transport in transports.items():
+                durations = await time_transport(transport, port, rounds)
+                median = statistics.median(durations)
+                p95 = statistics.quantiles(durations, n=20)[-1] if rounds > 1 else median
+                throughput = len(frame) / (median / 1000) / 1e6
+                print(
+                    f"{len(frame):>12} {name:>10} {median:>10.2f} {p95:>10.2f} {throughput:>8.1f}"
+                )
+        finally:
+            server.close()
+            await server.wait_closed()
+
+
+def main() -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[80_000, 500_000, 2_000_000, 8_000_000],
+        help="Frame sizes in bytes",
+    )
+    parser.add_argument("--rounds", type=int, default=20, help="Requests per transport and size")
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.rounds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Benchmark mapping the v1 status pages of repeated polls.
+
+Scans the recorded status pages in ``tests/data/static`` once, then maps their
+rows ``--polls`` times, as a device polled that many times does: first by
+slugifying every alias on every poll, then positionally with the row layout
+cached by :class:`~aioiregul.v1.Device`. The time to scan the pages is printed
+for reference; it does not depend on the mapping.
+
+Usage:
+    uv run python benchmarks/bench_v1_pages.py
+    uv run python benchmarks/bench_v1_pages.py --polls 1000 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from slugify import slugify  # noqa: E402
+
+from aioiregul.v1 import Device, IRegulData  # noqa: E402
+from aioiregul.v1.parser import scan_page  # noqa: E402
+
+STATIC_DIR = ROOT / "tests" / "data" / "static"
+PAGES = ("sorties", "sondes", "entrees", "mesures")
+
+Rows = list[tuple[str, str, str]]
+
+
+def map_full(_type: str, rows: Rows) -> dict[str, IRegulData]:
+    """Map rows the way every poll did before the layout cache."""
+    result: dict[str, IRegulData] = {}
+    for alias, raw_value, unit in rows:
+        identifier = slugify(alias)
+        value = Decimal(raw_value)
+        if unit == "MWh":
+            unit = "KWh"
+            value = value * Decimal(1000)
+        if identifier in result:
+            result[identifier].value = result[identifier].value + value
+        else:
+            result[identifier] = IRegulData(identifier, alias, value, unit)
+    return result
+
+
+def time_polls(
+    mapper: Callable[[str, Rows], dict[str, IRegulData]],
+    pages: dict[str, Rows],
+    polls: int,
+    rounds: int,
+) -> list[float]:
+    """Return the time in milliseconds to map every page ``polls`` times, per round."""
+    durations: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(polls):
+            for type_, rows in pages.items():
+                mapper(type_, rows)
+        durations.append((time.perf_counter_ns() - start) / 1e6)
+    return durations
+
+
+def main() -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=1000, help="Polls mapped per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of rounds")
+    args = parser.parse_args()
+
+    html = {type_: (STATIC_DIR / f"{type_}.html").read_text(encoding="utf-8") for type_ in PAGES}
+    start = time.perf_counter_ns()
+    pages = {type_: scan_page(text).rows for type_, text in html.items()}
+    scan_ms = (time.perf_counter_ns() - start) / 1e6
+
+    device = Device(None, host="bench", port=1, device_id="dev", password="pw")  # type: ignore[arg-type]
+    cached = device._Device__map_rows  # type: ignore[attr-defined]  # pyright: ignore[reportAttributeAccessIssue]
+    for type_, rows in pages.items():
+        assert cached(type_, rows) == map_full(type_, rows)
+
+    rows_per_poll = sum(len(rows) for rows in pages.values())
+    print(
+        f"Pages: {len(pages)}, {rows_per_poll} rows per poll; scanning them takes {scan_ms:.2f} ms"
+    )
+    print(f"Mapping {args.polls} polls per round")
+    print(f"{'mapping':>8} {'median ms':>10} {'min ms':>8} {'us/poll':>8}")
+    for name, mapper in (("full", map_full), ("layout", cached)):
+        durations = time_polls(mapper, pages, args.polls, args.rounds)
+        median = statistics.median(durations)
+        print(
+            f"{name:>8} {median:>10.2f} {min(durations):>8.2f} {median * 1000 / args.polls:>8.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""Benchmark the v1 HTTP API against the v2 socket API.
+
+Runs ``--devices`` v1 :class:`~aioiregul.v1.Device` instances against a local
+:class:`~aioiregul.testing.FakeIRegulWebServer`, then as many v2
+:class:`~aioiregul.v2.client.IRegulClient` instances against a local
+:class:`~aioiregul.testing.FakeIRegulServer`. Both stand-ins serve the same
+synthetic device (:func:`~aioiregul.testing.generate_groups` with seed 0) with
+the same ``--latency``, and every device polls ``--polls`` times with the same
+schedule through :class:`~aioiregul.iregulapi.IRegulApiInterface`. Frame
+caches are disabled and v1 refreshes the data on every poll, so that each poll
+reaches the server, as a v2 poll does.
+
+Each API is measured against two data sets, selected with ``--data``:
+
+- ``changing``: every reply carries new values, as a live device does. This
+  is the case to compare: each poll decodes and maps its data.
+- ``static``: every reply is the same. v2 then reuses its previous frame
+  after the first 501 (the payload is unchanged), so its numbers only measure
+  that shortcut.
+
+Reported per API:
+
+- End-to-end latency of ``get_data`` (p50/p95/p99).
+- Client CPU time per poll. The stand-in runs in its own thread and its CPU
+  time is subtracted from the process CPU time.
+- Memory held per device after a first poll, traced with ``tracemalloc``
+  before the timed run.
+
+Usage:
+    uv run python benchmarks/bench_v1_v2.py
+    uv run python benchmarks/bench_v1_v2.py --devices 200 --polls 10 --interval 0.5
+    uv run python benchmarks/bench_v1_v2.py --data changing
+    uv run python benchmarks/bench_v1_v2.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Protocol
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from aioiregul.iregulapi import IRegulApiInterface  # noqa: E402
+from aioiregul.testing import (  # noqa: E402
+    FakeIRegulServer,
+    FakeIRegulWebServer,
+    changing_frames,
+    generate_groups,
+    generate_status_page,
+)
+from aioiregul.testing.web_server import PageSource  # noqa: E402
+from aioiregul.v1.fleet import DeviceFleet  # noqa: E402
+from aioiregul.v2.client import IRegulClient  # noqa: E402
+from aioiregul.v2.decoder import ValueType  # noqa: E402
+
+PERCENTILES = (50, 95, 99)
+DATA_SETS = ("changing", "static")
+
+
+class StandIn(Protocol):
+    """Local server started and stopped by :class:`ServerThread`."""
+
+    async def start(self) -> None: ...
+    async def close(self) -> None: ...
+
+
+class ServerThread:
+    """Run a stand-in server on its own event loop and thread."""
+
+    def __init__(self, server: StandIn) -> None:
+        self.server = server
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def _call(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def start(self) -> None:
+        self._thread.start()
+        self._call(self.server.start())
+
+    def cpu_time(self) -> float:
+        """CPU time consumed by the server thread, in seconds."""
+
+        async def thread_time() -> float:
+            return time.thread_time()
+
+        return self._call(thread_time())
+
+    def stop(self) -> None:
+        self._call(self.server.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def changing_pages(seed: int = 0) -> PageSource:
+    """v1 counterpart of :func:`~aioiregul.testing.changing_frames`.
+
+    Serves the device of :func:`~aioiregul.testing.default_pages`, with new
+    input, output and measurement values for every status page.
+    """
+    groups = generate_groups(seed=seed)
+    rng = random.Random(seed)
+
+    def page(_device_id: str | None, name: str) -> str | None:
+        for group in ("I", "O"):
+            for values in groups[group].values():
+                values["valeur"] = rng.randint(0, 1)
+        for values in groups["M"].values():
+            values["valeur"] = round(rng.uniform(-10.0, 60.0), 1)
+        measurements = list(groups["M"].values())
+        half = len(measurements) // 2
+        entries: dict[str, list[dict[str, ValueType]]] = {
+            "sorties": list(groups["O"].values()),
+            "sondes": measurements[:half],
+            "entrees": list(groups["I"].values()),
+            "mesures": measurements[half:],
+        }
+        if name not in entries:
+            return None
+        return generate_status_page(
+            (str(values["alias"]), values["valeur"], str(values.get("unit", "")))
+            for values in entries[name]
+        )
+
+    return page
+
+
+@dataclass
+class ApiReport:
+    """Results of one API against one data set."""
+
+    api: str
+    data: str
+    devices: int
+    polls: int
+    errors: int
+    duration_s: float
+    polls_per_s: float
+    latency_ms: dict[str, float]
+    cpu_ms_per_poll: float
+    memory_kb_per_device: float
+
+
+def percentile(values: list[float], q: int) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, -(-q * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+async def poll_schedule(
+    devices: list[IRegulApiInterface], polls: int, interval: float
+) -> tuple[list[float], int]:
+    """Poll every device ``polls`` times, ``interval`` seconds apart.
+
+    Returns:
+        The latency of every successful poll in milliseconds, and the number
+        of failed polls.
+    """
+    latencies: list[float] = []
+    errors = 0
+
+    async def poll(device: IRegulApiInterface) -> None:
+        nonlocal errors
+        for _ in range(polls):
+            start = time.perf_counter_ns()
+            try:
+                frame = await device.get_data()
+            except Exception:
+                frame = None
+            if frame is None:
+                errors += 1
+            else:
+                latencies.append((time.perf_counter_ns() - start) / 1e6)
+            if interval:
+                await asyncio.sleep(interval)
+
+    await asyncio.gather(*(poll(device) for device in devices))
+    return latencies, errors
+
+
+async def run_api(
+    api: str,
+    data: str,
+    server: ServerThread,
+    create: Callable[[AsyncExitStack, int], list[IRegulApiInterface]],
+    args: argparse.Namespace,
+) -> ApiReport:
+    """Measure one API against its running stand-in serving ``data``."""
+    async with AsyncExitStack() as stack:
+        # Memory held by the devices once they have polled and cached their state
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        devices = create(stack, args.devices)
+        await poll_schedule(devices, 1, 0.0)
+        held = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        process_start = time.process_time()
+        server_start = server.cpu_time()
+        start = time.perf_counter()
+        latencies, errors = await poll_schedule(devices, args.polls, args.interval)
+        duration = time.perf_counter() - start
+        cpu = (time.process_time() - process_start) - (server.cpu_time() - server_start)
+
+    total = args.devices * args.polls
+    return ApiReport(
+        api=api,
+        data=data,
+        devices=args.devices,
+        polls=len(latencies),
+        errors=errors,
+        duration_s=round(duration, 3),
+        polls_per_s=round(len(latencies) / duration, 1),
+        latency_ms={
+            f"p{q}": round(percentile(latencies, q), 3) if latencies else 0.0 for q in PERCENTILES
+        },
+        cpu_ms_per_poll=round(cpu * 1000 / total, 3),
+        memory_kb_per_device=round(held / 1024 / args.devices, 1),
+    )
+
+
+async def bench_v1(server: ServerThread, data: str, args: argparse.Namespace) -> ApiReport:
+    """Measure v1 devices sharing one connection pool."""
+    web_server = server.server
+    assert isinstance(web_server, FakeIRegulWebServer)
+
+    def create(stack: AsyncExitStack, count: int) -> list[IRegulApiInterface]:
+        fleet = DeviceFleet(
+            limit=0,
+            limit_per_host=0,
+            base_url=web_server.url,
+            refresh_rate=timedelta(0),
+            frame_max_age=timedelta(0),
+        )
+        stack.push_async_callback(fleet.close)
+        return [fleet.add(f"dev{i}", "pw") for i in range(count)]
+
+    return await run_api("v1", data, server, create, args)
+
+
+async def bench_v2(server: ServerThread, data: str, args: argparse.Namespace) -> ApiReport:
+    """Measure v2 clients."""
+    socket_server = server.server
+    assert isinstance(socket_server, FakeIRegulServer)
+
+    def create(_stack: AsyncExitStack, count: int) -> list[IRegulApiInterface]:
+        return [
+            IRegulClient(
+                host=socket_server.host,
+                port=socket_server.port,
+                device_id=f"dev{i}",
+                password="pw",
+                timeout=30.0,
+            )
+            for i in range(count)
+        ]
+
+    return await run_api("v2", data, server, create, args)
+
+
+def print_reports(reports: list[ApiReport]) -> None:
+    """Print the reports side by side."""
+    rows: list[tuple[str, Callable[[ApiReport], str]]] = [
+        ("devices", lambda r: str(r.devices)),
+        ("polls", lambda r: str(r.polls)),
+        ("errors", lambda r: str(r.errors)),
+        ("polls/s", lambda r: f"{r.polls_per_s:.1f}"),
+        *((f"latency p{q} ms", lambda r, q=q: f"{r.latency_ms[f'p{q}']:.2f}") for q in PERCENTILES),
+        ("CPU ms/poll", lambda r: f"{r.cpu_ms_per_poll:.3f}"),
+        ("memory KB/device", lambda r: f"{r.memory_kb_per_device:.1f}"),
+    ]
+    print(f"{'':<18}" + "".join(f"{r.api + '/' + r.data:>12}" for r in reports))
+    for label, cell in rows:
+        print(f"{label:<18}" + "".join(f"{cell(r):>12}" for r in reports))
+
+
+def main() -> int:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50, help="Devices per API")
+    parser.add_argument("--polls", type=int, default=20, help="Timed polls per device")
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="Pause between two polls of a device, in s"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="Server response latency, in s"
+    )
+    parser.add_argument(
+        "--data",
+        choices=(*DATA_SETS, "both"),
+        default="both",
+        help="Serve new values on every request, the same reply, or both in turn",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    args = parser.parse_args()
+
+    reports: list[ApiReport] = []
+    for data in DATA_SETS if args.data == "both" else (args.data,):
+        # Without a source, the stand-ins serve the same reply to every request
+        changing = data == "changing"
+        pages = changing_pages() if changing else None
+        frames = changing_frames() if changing else None
+        for stand_in, bench in (
+            (FakeIRegulWebServer(pages, latency=args.latency), bench_v1),
+            (FakeIRegulServer(frames, latency=args.latency), bench_v2),
+        ):
+            server = ServerThread(stand_in)
+            server.start()
+            try:
+                reports.append(asyncio.run(bench(server, data, args)))
+            finally:
+                server.stop()
+
+    if args.json:
+        print(json.dumps([asdict(report) for report in reports], indent=2))
+    else:
+        print_reports(reports)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,7 @@ Before running this example:
 
 import asyncio
 
-from aioiregul.iregulapi import IRegulApiInterface
+from aioiregul.iregulapi import IRegulApiInterface, load_env
 from aioiregul.v2 import IRegulClient
 
 
@@ -71,4 +71,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    load_env()
     asyncio.run(main())
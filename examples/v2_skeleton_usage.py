@@ -27,7 +27,7 @@ import asyncio
 import json
 from pathlib import Path
 
-from aioiregul.iregulapi import IRegulApiInterface
+from aioiregul.iregulapi import IRegulApiInterface, load_env
 from aioiregul.v2 import IRegulClient
 
 
@@ -141,4 +141,5 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    load_env()
     asyncio.run(main())
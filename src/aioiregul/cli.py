@@ -1,20 +1,33 @@
 #!/usr/bin/env python3
-"""CLI tool to decode IRegul protocol frames from files.
+"""CLI tool to decode IRegul protocol frames from files and load test clients.
 
 Usage:
     python -m aioiregul.cli examples/501-NEW.txt
     python -m aioiregul.cli examples/502-OLD.txt --mapped
     python -m aioiregul.cli examples/501-NEW.txt --json
+    python -m aioiregul.cli decode examples/501-NEW.txt
+    python -m aioiregul.cli bench --clients 100 --duration 30
+    python -m aioiregul.cli bench --host i-regul.fr --device-id ID --password PW
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
 import json
 import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .models import Timings
+    from .v2.client import IRegulClient
+
+PERCENTILES = (50, 95, 99)
 
 
 def _serialize_value(value: Any) -> Any:  # noqa: ANN401
@@ -116,33 +129,313 @@ async def decode_command(args: argparse.Namespace) -> int:
     return 0
 
 
-def main() -> int:
-    """Main CLI entry point.
+def _empty_timings_list() -> list[Timings]:
+    """Return an empty list of Timings for dataclass defaults."""
+
+    return []
+
+
+@dataclass
+class BenchReport:
+    """Aggregated results of a ``bench`` run.
+
+    Attributes:
+        clients: Number of concurrent clients.
+        duration: Measured wall-clock duration in seconds.
+        timings: Timings of every completed or failed poll.
+    """
+
+    clients: int
+    duration: float
+    timings: list[Timings] = field(default_factory=_empty_timings_list)
+
+    @property
+    def polls(self) -> int:
+        """Number of successful polls."""
+        return sum(1 for t in self.timings if t.error is None)
+
+    @property
+    def errors(self) -> dict[str, int]:
+        """Number of failed polls per exception class name."""
+        errors: dict[str, int] = {}
+        for t in self.timings:
+            if t.error is not None:
+                errors[t.error] = errors.get(t.error, 0) + 1
+        return errors
+
+    @property
+    def bytes_received(self) -> int:
+        """Total number of response bytes received."""
+        return sum(t.bytes_received for t in self.timings)
+
+    def phase_percentiles(self) -> dict[str, dict[int, float]]:
+        """Latency percentiles in milliseconds per phase, plus ``total``.
+
+        Only successful polls are included.
+        """
+        samples: dict[str, list[int]] = {}
+        for t in self.timings:
+            if t.error is not None:
+                continue
+            for phase, elapsed_ns in t.phases.items():
+                samples.setdefault(phase, []).append(elapsed_ns)
+            samples.setdefault("total", []).append(t.total_ns)
+
+        return {
+            phase: {q: _percentile(values, q) / 1e6 for q in PERCENTILES}
+            for phase, values in samples.items()
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the report as JSON-serializable data."""
+        duration = self.duration or 1.0
+        return {
+            "clients": self.clients,
+            "duration_s": round(self.duration, 3),
+            "polls": self.polls,
+            "polls_per_s": round(self.polls / duration, 2),
+            "bytes_per_s": round(self.bytes_received / duration, 1),
+            "errors": self.errors,
+            "latency_ms": {
+                phase: {f"p{q}": round(value, 3) for q, value in values.items()}
+                for phase, values in self.phase_percentiles().items()
+            },
+        }
+
+
+def _percentile(values: list[int], q: int) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, -(-q * len(ordered) // 100))
+    return float(ordered[rank - 1])
+
+
+async def _bench_poller(client: IRegulClient, deadline: float, interval: float) -> None:
+    """Poll ``client`` until ``deadline``; failures are recorded by its hook."""
+    loop = asyncio.get_running_loop()
+    while loop.time() < deadline:
+        with contextlib.suppress(ConnectionError, TimeoutError, ValueError):
+            await client.get_data()
+        if interval:
+            await asyncio.sleep(interval)
+
+
+async def run_bench(
+    host: str,
+    port: int,
+    clients: int,
+    duration: float,
+    device_id: str = "bench",
+    password: str = "bench",
+    interval: float = 0.0,
+    timeout: float = 10.0,
+) -> BenchReport:
+    """Poll a server with concurrent clients for a fixed duration.
+
+    Args:
+        host: Server hostname.
+        port: Server port.
+        clients: Number of concurrent IRegulClient instances.
+        duration: Run time in seconds.
+        device_id: Device identifier used by every client.
+        password: Device password used by every client.
+        interval: Pause between two polls of the same client, in seconds.
+        timeout: Per-request timeout in seconds.
 
     Returns:
-        Exit code.
+        The aggregated report.
     """
+    from .v2.client import IRegulClient
+
+    report = BenchReport(clients=clients, duration=0.0)
+    pollers = [
+        IRegulClient(
+            host=host,
+            port=port,
+            device_id=device_id,
+            password=password,
+            timeout=timeout,
+            timings_hook=report.timings.append,
+        )
+        for _ in range(clients)
+    ]
+
+    start = time.perf_counter()
+    deadline = asyncio.get_running_loop().time() + duration
+    await asyncio.gather(*(_bench_poller(client, deadline, interval) for client in pollers))
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def _print_report(report: BenchReport) -> None:
+    """Print a human-readable bench report."""
+    summary = report.as_dict()
+    print(f"Clients: {summary['clients']}")
+    print(f"Duration: {summary['duration_s']:.2f} s")
+    print(f"Polls: {summary['polls']} ({summary['polls_per_s']:.1f}/s)")
+    print(f"Throughput: {summary['bytes_per_s'] / 1e6:.2f} MB/s")
+    errors = summary["errors"]
+    print(f"Errors: {sum(errors.values())}")
+    for name, count in sorted(errors.items()):
+        print(f"  {name}: {count}")
+
+    print("\nLatency (ms):")
+    print(f"  {'phase':<10} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for phase, values in summary["latency_ms"].items():
+        print(f"  {phase:<10} {values['p50']:>10.3f} {values['p95']:>10.3f} {values['p99']:>10.3f}")
+
+
+async def bench_command(args: argparse.Namespace) -> int:
+    """Execute the bench command.
+
+    Runs against ``args.host`` when given, otherwise against an embedded
+    :class:`~aioiregul.testing.FakeIRegulServer`. The embedded server serves
+    new values on every request unless ``args.data`` is ``static``: with
+    static replies, every 501 after the first reuses the previous frame and
+    the decode, merge and map phases are skipped.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        Exit code (0 when at least one poll succeeded).
+    """
+    if args.host is not None:
+        report = await run_bench(
+            args.host,
+            args.port,
+            args.clients,
+            args.duration,
+            device_id=args.device_id,
+            password=args.password,
+            interval=args.interval,
+            timeout=args.timeout,
+        )
+    else:
+        from .testing import FakeIRegulServer, changing_frames
+
+        frames = changing_frames() if args.data == "changing" else None
+        async with FakeIRegulServer(frames, latency=args.latency) as server:
+            report = await run_bench(
+                server.host,
+                server.port,
+                args.clients,
+                args.duration,
+                interval=args.interval,
+                timeout=args.timeout,
+            )
+
+    if args.json:
+        print(json.dumps(report.as_dict(), indent=2))
+    else:
+        _print_report(report)
+
+    return 0 if report.polls else 1
+
+
+_COMMANDS = ("decode", "bench")
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the CLI and its commands."""
     parser = argparse.ArgumentParser(
+        prog="aioiregul",
+        description="Decode IRegul protocol frames and load test clients",
+        epilog="Without a command, the arguments are those of decode.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    decode = commands.add_parser(
+        "decode",
+        help="Decode IRegul protocol frames from files (default)",
         description="Decode IRegul protocol frames from files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
-    parser.add_argument(
+    decode.add_argument(
         "file",
         help="Path to file containing IRegul frame data",
     )
-    parser.add_argument(
+    decode.add_argument(
         "--mapped",
         action="store_true",
         help="Map decoded data to typed dataclasses",
     )
-    parser.add_argument(
+    decode.add_argument(
+        "--json",
+        action="store_true",
+        help="Output as JSON instead of human-readable summary",
+    )
+
+    bench = commands.add_parser(
+        "bench",
+        help="Load test IRegulClient",
+        description="Load test IRegulClient against a server or an embedded stand-in",
+    )
+    bench.add_argument(
+        "--host",
+        help="Server to poll; an embedded fake server is started when omitted",
+    )
+    bench.add_argument("--port", type=int, default=443, help="Server port (default: 443)")
+    bench.add_argument("--device-id", default="bench", help="Device identifier")
+    bench.add_argument("--password", default="bench", help="Device password")
+    bench.add_argument(
+        "--clients", type=int, default=10, help="Number of concurrent clients (default: 10)"
+    )
+    bench.add_argument(
+        "--duration", type=float, default=10.0, help="Run time in seconds (default: 10)"
+    )
+    bench.add_argument(
+        "--interval",
+        type=float,
+        default=0.0,
+        help="Pause between polls of a client in seconds (default: 0)",
+    )
+    bench.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    bench.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Reply latency of the embedded server in seconds (default: 0)",
+    )
+    bench.add_argument(
+        "--data",
+        choices=("changing", "static"),
+        default="changing",
+        help="Whether the embedded server serves new values on every request "
+        "or the same reply (default: changing)",
+    )
+    bench.add_argument(
         "--json",
         action="store_true",
         help="Output as JSON instead of human-readable summary",
     )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Main CLI entry point.
+
+    ``decode`` is the default command: arguments not starting with a command
+    name are decoded as a frame file, so ``aioiregul FILE`` still works. A
+    frame file named after a command is decoded with ``aioiregul decode FILE``.
+
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``.
+
+    Returns:
+        Exit code.
+    """
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    if arguments and arguments[0] not in (*_COMMANDS, "-h", "--help"):
+        arguments.insert(0, "decode")
 
-    args = parser.parse_args()
-    return asyncio.run(decode_command(args))
+    parser = _parser()
+    args = parser.parse_args(arguments)
+    if args.command == "bench":
+        return asyncio.run(bench_command(args))
+    if args.command == "decode":
+        return asyncio.run(decode_command(args))
+    parser.error("a command or a frame file is required")
 
 
 if __name__ == "__main__":
@@ -3,10 +3,42 @@ This type stub file was generated by pyright.
 """
 
 import argparse
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .models import Timings
 
 """
 This type stub file was generated by pyright.
 """
+PERCENTILES: tuple[int, ...]
 
 async def decode_command(args: argparse.Namespace) -> int: ...
-def main() -> int: ...
+
+@dataclass
+class BenchReport:
+    clients: int
+    duration: float
+    timings: list[Timings] = ...
+    @property
+    def polls(self) -> int: ...
+    @property
+    def errors(self) -> dict[str, int]: ...
+    @property
+    def bytes_received(self) -> int: ...
+    def phase_percentiles(self) -> dict[str, dict[int, float]]: ...
+    def as_dict(self) -> dict[str, Any]: ...
+
+async def run_bench(
+    host: str,
+    port: int,
+    clients: int,
+    duration: float,
+    device_id: str = ...,
+    password: str = ...,
+    interval: float = ...,
+    timeout: float = ...,
+) -> BenchReport: ...
+async def bench_command(args: argparse.Namespace) -> int: ...
+def main(argv: Sequence[str] | None = ...) -> int: ...
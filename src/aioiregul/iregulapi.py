@@ -2,10 +2,16 @@
 Docstring for aioiregul.iregulapi
 """
 
+import os
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from typing import Protocol
 from urllib.parse import urlsplit
 
-from .models import MappedFrame
+from .models import MappedFrame, Timings
+
+TimingsHook = Callable[[Timings], None]
+"""Callback receiving the :class:`Timings` of every completed client operation."""
 
 
 def split_host_port(host: str, port: int | None = None) -> tuple[str, int | None]:
@@ -49,6 +55,60 @@ def split_host_port(host: str, port: int | None = None) -> tuple[str, int | None
     return parsed.hostname, port
 
 
+def load_env(dotenv_path: str | os.PathLike[str] | None = None, override: bool = False) -> bool:
+    """Load ``IREGUL_*`` settings from a ``.env`` file into ``os.environ``.
+
+    Importing aioiregul never reads the filesystem or touches the environment;
+    applications relying on a ``.env`` file call this once at startup, before
+    creating clients without explicit credentials.
+
+    Args:
+        dotenv_path: File to load. Defaults to the first ``.env`` found from
+            the current working directory upwards.
+        override: Whether values from the file replace existing variables.
+
+    Returns:
+        True if at least one variable was loaded.
+    """
+    from dotenv import find_dotenv, load_dotenv
+
+    return load_dotenv(dotenv_path or find_dotenv(usecwd=True), override=override)
+
+
+@contextmanager
+def track_timings(
+    operation: str, hook: TimingsHook | None = None
+) -> Generator[Timings, None, None]:
+    """Collect the timings of a client operation and report them to a hook.
+
+    The hook is called once the block exits, whether it succeeded or not.
+    On failure, ``Timings.error`` holds the exception class name.
+
+    Args:
+        operation: Name of the operation being measured.
+        hook: Optional callback receiving the completed timings. It runs on
+            the event loop and must not raise.
+
+    Yields:
+        The Timings instance to record phases into.
+
+    Example:
+        >>> with track_timings("get_data", print) as timings:
+        ...     with timings.measure("decode"):
+        ...         pass  # doctest: +ELLIPSIS
+        Timings(operation='get_data', phases={'decode': ...}, bytes_received=0, error=None)
+    """
+    timings = Timings(operation)
+    try:
+        yield timings
+    except BaseException as e:
+        timings.error = type(e).__name__
+        raise
+    finally:
+        if hook is not None:
+            hook(timings)
+
+
 class IRegulApiInterface(Protocol):
     """Interface for IRegul device operations.
 
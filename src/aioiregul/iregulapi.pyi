@@ -2,15 +2,24 @@
 This type stub file was generated by pyright.
 """
 
+import os
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from typing import Protocol
 
 from .models import MappedFrame as MappedFrame
+from .models import Timings
 
 """
 This type stub file was generated by pyright.
 """
 
+TimingsHook = Callable[[Timings], None]
+
 def split_host_port(host: str, port: int | None = ...) -> tuple[str, int | None]: ...
+def load_env(dotenv_path: str | os.PathLike[str] | None = ..., override: bool = ...) -> bool: ...
+@contextmanager
+def track_timings(operation: str, hook: TimingsHook | None = ...) -> Generator[Timings]: ...
 
 class IRegulApiInterface(Protocol):
     async def get_data(self) -> MappedFrame | None: ...
@@ -3,12 +3,15 @@
 This module defines strongly-typed representations for the main data groups
 returned by the IRegul API: zones (Z), inputs (I), outputs (O), measurements (M),
 parameters (P), labels (J), and other supporting structures, plus MappedFrame
-and the IRegulDeviceInterface protocol for device operations.
+and the Timings latency breakdown attached to it by the clients.
 """
 
 from __future__ import annotations
 
 import json
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any
@@ -20,6 +23,67 @@ def _empty_str_str_dict() -> dict[str, str]:
     return {}
 
 
+def _empty_str_int_dict() -> dict[str, int]:
+    """Return an empty dict with str keys and int values for dataclass defaults."""
+
+    return {}
+
+
+@dataclass
+class Timings:
+    """Per-phase latency of a single client operation.
+
+    Durations are measured with ``time.perf_counter_ns`` and accumulated per
+    phase, so a phase entered several times (e.g. one ``collect`` per page)
+    reports its total time.
+
+    Attributes:
+        operation: Client operation name (``get_data``, ``defrost``, ...).
+        phases: Mapping of phase name to elapsed nanoseconds, in entry order.
+        bytes_received: Number of response bytes received from the server.
+        error: Exception class name when the operation failed, else None.
+    """
+
+    operation: str
+    phases: dict[str, int] = field(default_factory=_empty_str_int_dict)
+    bytes_received: int = 0
+    error: str | None = None
+
+    @contextmanager
+    def measure(self, phase: str) -> Generator[None, None, None]:
+        """Add the duration of the enclosed block to ``phase``.
+
+        Args:
+            phase: Name of the phase being measured.
+
+        Example:
+            >>> timings = Timings("get_data")
+            >>> with timings.measure("decode"):
+            ...     pass
+            >>> "decode" in timings.phases
+            True
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter_ns() - start)
+
+    def add(self, phase: str, elapsed_ns: int) -> None:
+        """Add an already measured duration to ``phase``.
+
+        Args:
+            phase: Name of the phase.
+            elapsed_ns: Duration in nanoseconds.
+        """
+        self.phases[phase] = self.phases.get(phase, 0) + elapsed_ns
+
+    @property
+    def total_ns(self) -> int:
+        """Sum of all measured phases in nanoseconds."""
+        return sum(self.phases.values())
+
+
 @dataclass
 class Zone:
     """Zone configuration and status (group Z).
@@ -292,6 +356,8 @@ class MappedFrame:
         analog_sensors: Dictionary of analog sensor data indexed by sensor ID.
         configuration: System configuration.
         memory: System memory/state.
+        timings: Latency breakdown of the operation that produced the frame.
+            Not part of equality comparisons nor of the JSON serialization.
     """
 
     is_old: bool
@@ -307,6 +373,7 @@ class MappedFrame:
     analog_sensors: dict[int, AnalogSensor]
     configuration: Configuration | None
     memory: Memory | None
+    timings: Timings | None = field(default=None, compare=False, repr=False)
 
     def as_json(self, indent: int | None = None, ensure_ascii: bool = False) -> str:
         """Serialize the mapped frame to a JSON string.
@@ -319,6 +386,7 @@ class MappedFrame:
             JSON string representation of the mapped frame.
         """
         payload: dict[str, Any] = asdict(self)
+        del payload["timings"]
         # Ensure timestamp is ISO-formatted string for JSON serialization
         payload["timestamp"] = self.timestamp.isoformat()
         return json.dumps(payload, indent=indent, ensure_ascii=ensure_ascii)
@@ -2,6 +2,8 @@
 This type stub file was generated by pyright.
 """
 
+from collections.abc import Generator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -9,6 +11,18 @@ from datetime import datetime
 This type stub file was generated by pyright.
 """
 
+@dataclass
+class Timings:
+    operation: str
+    phases: dict[str, int] = ...
+    bytes_received: int = ...
+    error: str | None = ...
+    @contextmanager
+    def measure(self, phase: str) -> Generator[None]: ...
+    def add(self, phase: str, elapsed_ns: int) -> None: ...
+    @property
+    def total_ns(self) -> int: ...
+
 @dataclass
 class Zone:
     index: int
@@ -134,4 +148,5 @@ class MappedFrame:
     analog_sensors: dict[int, AnalogSensor]
     configuration: Configuration | None
     memory: Memory | None
+    timings: Timings | None = ...
     def as_json(self, indent: int | None = ..., ensure_ascii: bool = ...) -> str: ...
@@ -0,0 +1,76 @@
+"""Test helpers for code using aioiregul.
+
+Key Components:
+- FakeIRegulServer: Local asyncio server speaking the v2 socket protocol
+- generate_frame / generate_groups: Synthetic frames and devices
+- changing_frames: Synthetic device whose values change on every request
+- load_frames: Captured frames loaded from disk
+- FakeIRegulWebServer: Local aiohttp server serving the v1 web interface
+- default_pages / generate_status_page / load_pages: v1 status pages
+
+The v1 helpers are imported on first access, so that the v2 helpers do not
+load ``aiohttp.web``.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+from .socket_server import (
+    FakeIRegulServer,
+    ServerStats,
+    changing_frames,
+    default_frames,
+    generate_frame,
+    generate_groups,
+    load_frames,
+)
+
+if TYPE_CHECKING:
+    from .web_server import (
+        FakeIRegulWebServer,
+        WebServerStats,
+        default_pages,
+        generate_status_page,
+        load_pages,
+    )
+
+# Public name -> module defining it, for the names imported on first access (PEP 562)
+_LAZY_EXPORTS = {
+    "FakeIRegulWebServer": ".web_server",
+    "WebServerStats": ".web_server",
+    "default_pages": ".web_server",
+    "generate_status_page": ".web_server",
+    "load_pages": ".web_server",
+}
+
+__all__ = [
+    "FakeIRegulServer",
+    "FakeIRegulWebServer",
+    "ServerStats",
+    "WebServerStats",
+    "changing_frames",
+    "default_frames",
+    "default_pages",
+    "generate_frame",
+    "generate_groups",
+    "generate_status_page",
+    "load_frames",
+    "load_pages",
+]
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining ``name`` on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names, including those not imported yet."""
+    return sorted(set(globals()) | set(__all__))
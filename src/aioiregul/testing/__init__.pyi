@@ -0,0 +1,31 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from .socket_server import FakeIRegulServer as FakeIRegulServer
+from .socket_server import ServerStats as ServerStats
+from .socket_server import changing_frames as changing_frames
+from .socket_server import default_frames as default_frames
+from .socket_server import generate_frame as generate_frame
+from .socket_server import generate_groups as generate_groups
+from .socket_server import load_frames as load_frames
+from .web_server import FakeIRegulWebServer as FakeIRegulWebServer
+from .web_server import WebServerStats as WebServerStats
+from .web_server import default_pages as default_pages
+from .web_server import generate_status_page as generate_status_page
+from .web_server import load_pages as load_pages
+
+__all__ = [
+    "FakeIRegulServer",
+    "FakeIRegulWebServer",
+    "ServerStats",
+    "WebServerStats",
+    "changing_frames",
+    "default_frames",
+    "default_pages",
+    "generate_frame",
+    "generate_groups",
+    "generate_status_page",
+    "load_frames",
+    "load_pages",
+]
@@ -0,0 +1,433 @@
+"""Local stand-in for the IRegul v2 socket server.
+
+:class:`FakeIRegulServer` speaks the same protocol as the remote server used by
+:class:`aioiregul.v2.client.IRegulClient`: it reads the
+``cdraminfo<device_id><password>{<command>#}`` handshake and replies with the
+frames configured for the command, typically an OLD snapshot followed by the
+NEW frame, then closes the connection.
+
+Frames come either from captures on disk (:func:`load_frames`) or from
+synthetic devices (:func:`generate_groups` and :func:`generate_frame`, or
+:func:`changing_frames` for values changing on every request). Faults
+can be injected to exercise the client under adverse network conditions:
+
+- ``latency``: delay before the first reply byte, and ``frame_gap`` between
+  consecutive frames.
+- ``bytes_per_second``: throttle the reply bandwidth.
+- ``chunk_size``: split replies into partial writes.
+- ``disconnect_after``: abort the connection after that many reply bytes,
+  optionally only for every ``disconnect_every``-th connection.
+
+A single server handles many concurrent connections, which makes it suitable
+for benchmarking fleet polling locally.
+
+Example:
+    >>> async def main():
+    ...     async with FakeIRegulServer() as server:
+    ...         client = IRegulClient(
+    ...             host=server.host, port=server.port, device_id="dev", password="pw"
+    ...         )
+    ...         return await client.get_data()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+import re
+from collections.abc import Callable, Collection, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+
+from ..v2.decoder import ValueType
+
+LOGGER = logging.getLogger(__name__)
+
+FrameSource = Callable[[str | None, str], Sequence[bytes]]
+"""Callable returning the reply frames for a ``(device_id, command)`` pair.
+
+``device_id`` is None when the server does not check credentials.
+"""
+
+VALUE_FIELDS = frozenset({"valeur", "resultat", "etat", "mode", "mode_select"})
+"""Fields reported by the values-only command 501."""
+
+_HANDSHAKE_RE = re.compile(rb"^cdraminfo(?P<credentials>.*)\{(?P<command>[^#}]*)#\}$", re.DOTALL)
+
+
+def _empty_str_int_dict() -> dict[str, int]:
+    """Return an empty dict with str keys and int values for dataclass defaults."""
+
+    return {}
+
+
+@dataclass
+class ServerStats:
+    """Counters collected by :class:`FakeIRegulServer`.
+
+    Attributes:
+        connections: Total number of accepted connections.
+        active_connections: Connections currently being served.
+        peak_connections: Highest number of simultaneous connections.
+        commands: Number of handshakes received per command.
+        bytes_sent: Total number of reply bytes written.
+        auth_failures: Handshakes rejected because of invalid credentials.
+        disconnects: Connections aborted by fault injection.
+    """
+
+    connections: int = 0
+    active_connections: int = 0
+    peak_connections: int = 0
+    commands: dict[str, int] = field(default_factory=_empty_str_int_dict)
+    bytes_sent: int = 0
+    auth_failures: int = 0
+    disconnects: int = 0
+
+
+def generate_frame(
+    groups: Mapping[str, Mapping[int, Mapping[str, ValueType]]],
+    *,
+    is_old: bool = False,
+    timestamp: datetime | None = None,
+    message_type: str = "10",
+    fields: Collection[str] | None = None,
+) -> bytes:
+    """Encode groups into a frame understood by the decoder.
+
+    Args:
+        groups: Nested mapping of group -> index -> field -> value.
+        is_old: Whether to prefix the frame with ``OLD``.
+        timestamp: Frame timestamp, defaults to now.
+        message_type: First payload token.
+        fields: If given, only these fields are included.
+
+    Returns:
+        The encoded frame, terminated by ``}``.
+
+    Example:
+        >>> generate_frame({"M": {1: {"valeur": 21.5}}}, timestamp=datetime(2025, 1, 15))
+        b'15/01/2025 00:00:00{10#M@1&valeur[21.5]}'
+    """
+    tokens = [message_type]
+    for group, indexes in groups.items():
+        for index, values in indexes.items():
+            for name, value in values.items():
+                if fields is not None and name not in fields:
+                    continue
+                if isinstance(value, bool):
+                    value = int(value)
+                tokens.append(f"{group}@{index}&{name}[{value}]")
+
+    header = (timestamp or datetime.now()).strftime("%d/%m/%Y %H:%M:%S")
+    prefix = "OLD" if is_old else ""
+    return f"{prefix}{header}{{{'#'.join(tokens)}}}".encode()
+
+
+def generate_groups(
+    *,
+    zones: int = 2,
+    inputs: int = 4,
+    outputs: int = 4,
+    measurements: int = 8,
+    seed: int | None = None,
+) -> dict[str, dict[int, dict[str, ValueType]]]:
+    """Build the configuration and values of a synthetic device.
+
+    Args:
+        zones: Number of heating zones (group Z).
+        inputs: Number of digital inputs (group I).
+        outputs: Number of digital outputs (group O).
+        measurements: Number of measurements (group M).
+        seed: Seed for the random values, for reproducible devices.
+
+    Returns:
+        Groups suitable for :func:`generate_frame`.
+    """
+    rng = random.Random(seed)
+    groups: dict[str, dict[int, dict[str, ValueType]]] = {
+        "mem": {0: {"etat": 10, "sous_etat": 20, "alarme": 0}},
+        "C": {0: {"autorisation_chauffage": 1, "autorisation_rafraichissement": 0}},
+    }
+    groups["Z"] = {
+        i: {
+            "zone_nom": f"Zone {i}",
+            "consigne_normal": 20 + i,
+            "consigne_reduit": 17,
+            "consigne_horsgel": 10,
+            "mode_select": 0,
+            "mode": 4,
+        }
+        for i in range(1, zones + 1)
+    }
+    groups["I"] = {
+        i: {"alias": f"Entree {i}", "valeur": rng.randint(0, 1)} for i in range(1, inputs + 1)
+    }
+    groups["O"] = {
+        i: {"alias": f"Sortie {i}", "valeur": rng.randint(0, 1)} for i in range(1, outputs + 1)
+    }
+    groups["M"] = {
+        i: {
+            "alias": f"Mesure {i}",
+            "unit": "°C",
+            "valeur": round(rng.uniform(-10.0, 60.0), 1),
+        }
+        for i in range(1, measurements + 1)
+    }
+    return groups
+
+
+def load_frames(directory: Path | str) -> dict[str, list[bytes]]:
+    """Load captured ``<command>-OLD.txt``/``<command>-NEW.txt`` frames.
+
+    Args:
+        directory: Directory containing the captures, such as
+            ``tests/data/v2messages``.
+
+    Returns:
+        Mapping of command to its reply frames, OLD first.
+    """
+    path = Path(directory)
+    frames: dict[str, list[bytes]] = {}
+    for kind in ("OLD", "NEW"):
+        for file in sorted(path.glob(f"*-{kind}.txt")):
+            command = file.name.removesuffix(f"-{kind}.txt")
+            frames.setdefault(command, []).append(file.read_bytes().strip())
+    return frames
+
+
+def default_frames() -> dict[str, list[bytes]]:
+    """Build the replies of a synthetic device for the 501, 502 and 203 commands."""
+    groups = generate_groups(seed=0)
+    return {
+        "501": [
+            generate_frame(groups, is_old=True, fields=VALUE_FIELDS),
+            generate_frame(groups, fields=VALUE_FIELDS),
+        ],
+        "502": [generate_frame(groups, is_old=True), generate_frame(groups)],
+        "203": [b"{203#defrost_ok}"],
+    }
+
+
+def changing_frames(seed: int | None = 0) -> FrameSource:
+    """Build the replies of a synthetic device whose values change on every request.
+
+    The device is the one of :func:`default_frames`. Each 501 or 502 reply
+    carries the previous values as OLD frame, then new input, output and
+    measurement values as NEW frame, as a live device does. Static replies
+    would let :class:`~aioiregul.v2.client.IRegulClient` reuse its previous
+    frame after the first 501, since the payload is unchanged.
+
+    Args:
+        seed: Seed for the device and its successive values.
+
+    Returns:
+        A frame source for :class:`FakeIRegulServer`.
+    """
+    groups = generate_groups(seed=seed)
+    rng = random.Random(seed)
+
+    def frames(_device_id: str | None, command: str) -> list[bytes]:
+        if command == "203":
+            return [b"{203#defrost_ok}"]
+        fields = VALUE_FIELDS if command == "501" else None
+        old = generate_frame(groups, is_old=True, fields=fields)
+        for group in ("I", "O"):
+            for values in groups[group].values():
+                values["valeur"] = rng.randint(0, 1)
+        for values in groups["M"].values():
+            values["valeur"] = round(rng.uniform(-10.0, 60.0), 1)
+        return [old, generate_frame(groups, fields=fields)]
+
+    return frames
+
+
+class FakeIRegulServer:
+    """Asyncio TCP server replaying IRegul frames.
+
+    Use it as an async context manager, or call :meth:`start` and
+    :meth:`close` explicitly. The bound port is available as :attr:`port`.
+    """
+
+    def __init__(
+        self,
+        frames: Mapping[str, Sequence[bytes]] | FrameSource | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        devices: Mapping[str, str] | None = None,
+        latency: float = 0.0,
+        frame_gap: float = 0.0,
+        bytes_per_second: float | None = None,
+        chunk_size: int | None = None,
+        disconnect_after: int | None = None,
+        disconnect_every: int | None = None,
+        backlog: int = 4096,
+        handshake_timeout: float = 10.0,
+    ) -> None:
+        """Configure the server.
+
+        Args:
+            frames: Reply frames per command, or a callable returning them for a
+                device and command. Defaults to :func:`default_frames`.
+            host: Interface to bind.
+            port: Port to bind, 0 picks a free port.
+            devices: Accepted ``device_id -> password`` pairs. When None, any
+                credentials are accepted.
+            latency: Seconds to wait before sending the first frame.
+            frame_gap: Seconds to wait between consecutive frames.
+            bytes_per_second: Reply bandwidth limit, None for unlimited.
+            chunk_size: Size of each partial write. Defaults to whole frames,
+                or 4096 bytes when ``bytes_per_second`` is set.
+            disconnect_after: Abort connections after sending this many bytes.
+            disconnect_every: Only abort every N-th connection (1-based). When
+                None, every connection is aborted.
+            backlog: Listen backlog, sized for thousands of simulated devices.
+            handshake_timeout: Seconds to wait for the client handshake.
+        """
+        if frames is None:
+            frames = default_frames()
+        if callable(frames):
+            self._frame_source: FrameSource = frames
+        else:
+            replies = {command: list(items) for command, items in frames.items()}
+            self._frame_source = lambda _device_id, command: replies.get(command, ())
+
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.frame_gap = frame_gap
+        self.bytes_per_second = bytes_per_second
+        self.chunk_size = chunk_size or (4096 if bytes_per_second else None)
+        self.disconnect_after = disconnect_after
+        self.disconnect_every = disconnect_every
+        self.backlog = backlog
+        self.handshake_timeout = handshake_timeout
+        self.stats = ServerStats()
+
+        # Credentials are sent as "<device_id><password>" without separator
+        self._credentials: dict[bytes, str] | None = (
+            None
+            if devices is None
+            else {
+                f"{device_id}{password}".encode(): device_id
+                for device_id, password in devices.items()
+            }
+        )
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> FakeIRegulServer:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        await self.close()
+
+    async def start(self) -> None:
+        """Start listening and record the bound port."""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, backlog=self.backlog
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        LOGGER.debug(f"Fake IRegul server listening on {self.host}:{self.port}")
+
+    async def close(self) -> None:
+        """Stop accepting connections and wait for the server to close."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve a single client connection."""
+        stats = self.stats
+        stats.connections += 1
+        connection_number = stats.connections
+        stats.active_connections += 1
+        stats.peak_connections = max(stats.peak_connections, stats.active_connections)
+        try:
+            await self._serve(reader, writer, connection_number)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            LOGGER.debug(f"Fake IRegul connection {connection_number} ended: {e!r}")
+        except TimeoutError:
+            LOGGER.debug(f"Fake IRegul connection {connection_number} sent no handshake")
+        finally:
+            stats.active_connections -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _serve(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        connection_number: int,
+    ) -> None:
+        """Read the handshake and write the configured reply."""
+        handshake = await asyncio.wait_for(reader.readuntil(b"}"), self.handshake_timeout)
+        match = _HANDSHAKE_RE.match(handshake)
+        if match is None:
+            LOGGER.debug(f"Invalid handshake: {handshake[:50]!r}")
+            return
+
+        command = match["command"].decode()
+        self.stats.commands[command] = self.stats.commands.get(command, 0) + 1
+
+        device_id: str | None = None
+        if self._credentials is not None:
+            device_id = self._credentials.get(match["credentials"])
+            if device_id is None:
+                self.stats.auth_failures += 1
+                return
+
+        budget: int | None = None
+        if self.disconnect_after is not None and (
+            self.disconnect_every is None or connection_number % self.disconnect_every == 0
+        ):
+            budget = self.disconnect_after
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        for position, frame in enumerate(self._frame_source(device_id, command)):
+            if position and self.frame_gap:
+                await asyncio.sleep(self.frame_gap)
+            budget = await self._write(writer, frame, budget)
+            if budget == 0:
+                self.stats.disconnects += 1
+                writer.transport.abort()
+                return
+
+    async def _write(
+        self, writer: asyncio.StreamWriter, frame: bytes, budget: int | None
+    ) -> int | None:
+        """Write a frame in chunks, honoring throttling and the byte budget.
+
+        Returns:
+            The remaining byte budget, 0 when the connection must be aborted.
+        """
+        chunk_size = self.chunk_size or len(frame)
+        for start in range(0, len(frame), chunk_size):
+            chunk = frame[start : start + chunk_size]
+            if budget is not None:
+                chunk = chunk[:budget]
+                budget -= len(chunk)
+            writer.write(chunk)
+            await writer.drain()
+            self.stats.bytes_sent += len(chunk)
+            if budget == 0:
+                return 0
+            if self.bytes_per_second:
+                await asyncio.sleep(len(chunk) / self.bytes_per_second)
+        return budget
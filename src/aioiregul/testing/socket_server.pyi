@@ -0,0 +1,88 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from collections.abc import Callable, Collection, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+
+from _typeshed import Incomplete
+
+from ..v2.decoder import ValueType
+
+"""
+This type stub file was generated by pyright.
+"""
+LOGGER: Incomplete
+FrameSource = Callable[[str | None, str], Sequence[bytes]]
+VALUE_FIELDS: frozenset[str]
+
+@dataclass
+class ServerStats:
+    connections: int = ...
+    active_connections: int = ...
+    peak_connections: int = ...
+    commands: dict[str, int] = ...
+    bytes_sent: int = ...
+    auth_failures: int = ...
+    disconnects: int = ...
+
+def generate_frame(
+    groups: Mapping[str, Mapping[int, Mapping[str, ValueType]]],
+    *,
+    is_old: bool = ...,
+    timestamp: datetime | None = ...,
+    message_type: str = ...,
+    fields: Collection[str] | None = ...,
+) -> bytes: ...
+def generate_groups(
+    *,
+    zones: int = ...,
+    inputs: int = ...,
+    outputs: int = ...,
+    measurements: int = ...,
+    seed: int | None = ...,
+) -> dict[str, dict[int, dict[str, ValueType]]]: ...
+def load_frames(directory: Path | str) -> dict[str, list[bytes]]: ...
+def default_frames() -> dict[str, list[bytes]]: ...
+def changing_frames(seed: int | None = ...) -> FrameSource: ...
+
+class FakeIRegulServer:
+    host: str
+    port: int
+    latency: float
+    frame_gap: float
+    bytes_per_second: float | None
+    chunk_size: int | None
+    disconnect_after: int | None
+    disconnect_every: int | None
+    backlog: int
+    handshake_timeout: float
+    stats: ServerStats
+    def __init__(
+        self,
+        frames: Mapping[str, Sequence[bytes]] | FrameSource | None = ...,
+        *,
+        host: str = ...,
+        port: int = ...,
+        devices: Mapping[str, str] | None = ...,
+        latency: float = ...,
+        frame_gap: float = ...,
+        bytes_per_second: float | None = ...,
+        chunk_size: int | None = ...,
+        disconnect_after: int | None = ...,
+        disconnect_every: int | None = ...,
+        backlog: int = ...,
+        handshake_timeout: float = ...,
+    ) -> None: ...
+    async def __aenter__(self) -> FakeIRegulServer: ...
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None: ...
+    async def start(self) -> None: ...
+    async def close(self) -> None: ...
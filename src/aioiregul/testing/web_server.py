@@ -0,0 +1,368 @@
+"""Local stand-in for the IRegul v1 web interface.
+
+:class:`FakeIRegulWebServer` serves the pages used by :class:`aioiregul.v1.Device`
+over plain HTTP, with the same session handling as the remote server:
+
+- ``login/main.php`` shows the ``btn_i-regul`` button to logged-in clients and
+  the login form to the others.
+- ``login/process.php`` checks the credentials and sets the ``PHPSESSID``
+  session cookie.
+- ``i-regul/includes/processform.php`` refreshes the data or triggers a
+  defrost, then redirects to ``index-Etat.php?CMD=Success``.
+- ``i-regul/index-Etat.php?Etat=<page>`` serves the status pages.
+
+Requests without a valid session are redirected to the login page. Status
+pages come either from recorded pages on disk (:func:`load_pages`) or from a
+synthetic device (:func:`default_pages`). Faults can be injected to exercise
+the device under adverse conditions:
+
+- ``latency``: delay before every response.
+- ``session_lifetime``: sessions expire after that many seconds, see also
+  :meth:`FakeIRegulWebServer.expire_sessions`.
+- ``error_every``: answer every N-th status page with an HTTP 500 error.
+- ``disconnect_every``: drop the connection of every N-th request.
+
+Example:
+    >>> async def main():
+    ...     async with FakeIRegulWebServer() as server, aiohttp.ClientSession(
+    ...         cookie_jar=aiohttp.CookieJar(unsafe=True)
+    ...     ) as session:
+    ...         device = Device(session, device_id="dev", password="pw", base_url=server.url)
+    ...         return await device.get_data()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import html
+import secrets
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import NoReturn
+
+from aiohttp import web
+
+from .socket_server import generate_groups
+
+PageSource = Callable[[str | None, str], str | None]
+"""Callable returning the HTML of a status page for a ``(device_id, page)`` pair.
+
+``device_id`` is None when the server does not check credentials. Returning
+None answers with a 404 error.
+"""
+
+STATUS_PAGES = ("sorties", "sondes", "entrees", "mesures")
+"""Status pages served by ``index-Etat.php``."""
+
+_SESSION_COOKIE = "PHPSESSID"
+
+_MAIN_PAGE = (
+    "<html><body><div id='btn_i-regul'><a href='../i-regul/'>i-regul</a></div></body></html>"
+)
+
+_LOGIN_PAGE = (
+    "<html><body><form action='process.php' method='post'>"
+    "<input type='text' name='user'><input type='password' name='pass'>"
+    "<input type='hidden' name='sublogin' value='1'>"
+    "</form></body></html>"
+)
+
+
+def _empty_str_int_dict() -> dict[str, int]:
+    """Return an empty dict with str keys and int values for dataclass defaults."""
+
+    return {}
+
+
+@dataclass
+class WebServerStats:
+    """Counters collected by :class:`FakeIRegulWebServer`.
+
+    Attributes:
+        requests: Number of requests received per endpoint (``main``,
+            ``login``, ``processform`` and ``etat``).
+        active_requests: Requests currently being served.
+        peak_requests: Highest number of simultaneous requests.
+        logins: Successful logins.
+        auth_failures: Logins rejected because of invalid credentials.
+        expired: Requests redirected to the login page for lack of a session.
+        bytes_sent: Total number of response body bytes.
+        errors: Status pages answered with an injected HTTP 500 error.
+        disconnects: Connections dropped by fault injection.
+    """
+
+    requests: dict[str, int] = field(default_factory=_empty_str_int_dict)
+    active_requests: int = 0
+    peak_requests: int = 0
+    logins: int = 0
+    auth_failures: int = 0
+    expired: int = 0
+    bytes_sent: int = 0
+    errors: int = 0
+    disconnects: int = 0
+
+
+def generate_status_page(rows: Iterable[tuple[str, object, str]]) -> str:
+    """Render a status page holding the given ``tbl_etat`` rows.
+
+    Args:
+        rows: ``(alias, value, unit)`` of each row.
+
+    Returns:
+        The page HTML.
+
+    Example:
+        >>> generate_status_page([("T ext", 12.5, "°C")])[:40]
+        "<html><body><table id='tbl_etat'><tr><t"
+    """
+    cells = "".join(
+        "<tr>"
+        f"<td id='id_td_tbl_etat'>{index}</td>"
+        f"<td id='ali_td_tbl_etat'>{html.escape(alias)}</td>"
+        f"<td id='val_td_tbl_etat'>{value}</td>"
+        f"<td id='unit_td_tbl_etat'>{html.escape(unit)}</td>"
+        "</tr>"
+        for index, (alias, value, unit) in enumerate(rows, start=1)
+    )
+    return f"<html><body><table id='tbl_etat'>{cells}</table></body></html>"
+
+
+def default_pages() -> dict[str, str]:
+    """Build the status pages of a synthetic device."""
+    groups = generate_groups(seed=0)
+
+    def rows(group: str) -> list[tuple[str, object, str]]:
+        return [
+            (str(values["alias"]), values["valeur"], str(values.get("unit", "")))
+            for values in groups[group].values()
+        ]
+
+    measurements = rows("M")
+    half = len(measurements) // 2
+    return {
+        "sorties": generate_status_page(rows("O")),
+        "sondes": generate_status_page(measurements[:half]),
+        "entrees": generate_status_page(rows("I")),
+        "mesures": generate_status_page(measurements[half:]),
+    }
+
+
+def load_pages(directory: Path | str) -> dict[str, str]:
+    """Load recorded ``<page>.html`` status pages.
+
+    Args:
+        directory: Directory containing the pages, such as ``tests/data/static``.
+
+    Returns:
+        Mapping of page name to its HTML, for the pages found.
+    """
+    path = Path(directory)
+    return {
+        page: (path / f"{page}.html").read_text(encoding="utf-8")
+        for page in STATUS_PAGES
+        if (path / f"{page}.html").is_file()
+    }
+
+
+class FakeIRegulWebServer:
+    """aiohttp server replaying the v1 web interface.
+
+    Use it as an async context manager, or call :meth:`start` and
+    :meth:`close` explicitly. Devices reach it through :attr:`url`. The
+    server is addressed by IP, so client sessions need
+    ``aiohttp.CookieJar(unsafe=True)`` to keep the session cookie.
+    """
+
+    def __init__(
+        self,
+        pages: Mapping[str, str] | PageSource | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        devices: Mapping[str, str] | None = None,
+        latency: float = 0.0,
+        session_lifetime: float | None = None,
+        error_every: int | None = None,
+        disconnect_every: int | None = None,
+    ) -> None:
+        """Configure the server.
+
+        Args:
+            pages: HTML per status page, or a callable returning it for a
+                device and page. Defaults to :func:`default_pages`.
+            host: Interface to bind.
+            port: Port to bind, 0 picks a free port.
+            devices: Accepted ``device_id -> password`` pairs. When None, any
+                credentials are accepted.
+            latency: Seconds to wait before every response.
+            session_lifetime: Seconds after which a session expires. When
+                None, sessions never expire on their own.
+            error_every: Answer every N-th status page request (1-based) with
+                an HTTP 500 error.
+            disconnect_every: Drop the connection of every N-th request
+                (1-based) without answering.
+        """
+        if pages is None:
+            pages = default_pages()
+        if callable(pages):
+            self._page_source: PageSource = pages
+        else:
+            served = dict(pages)
+            self._page_source = lambda _device_id, page: served.get(page)
+
+        self.host = host
+        self.port = port
+        self.devices = None if devices is None else dict(devices)
+        self.latency = latency
+        self.session_lifetime = session_lifetime
+        self.error_every = error_every
+        self.disconnect_every = disconnect_every
+        self.stats = WebServerStats()
+
+        # Session cookie -> (device id, monotonic creation time)
+        self._sessions: dict[str, tuple[str | None, float]] = {}
+        self._request_count = 0
+        self._page_count = 0
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        """Root of the web interface, to pass as the device ``base_url``."""
+        return f"http://{self.host}:{self.port}/modules/"
+
+    async def __aenter__(self) -> FakeIRegulWebServer:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        await self.close()
+
+    async def start(self) -> None:
+        """Start listening and record the bound port."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/modules/login/main.php", self._main)
+        app.router.add_post("/modules/login/process.php", self._login)
+        app.router.add_post("/modules/i-regul/includes/processform.php", self._processform)
+        app.router.add_get("/modules/i-regul/index-Etat.php", self._etat)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+
+    def expire_sessions(self) -> None:
+        """Drop every session, as the remote server does after inactivity."""
+        self._sessions.clear()
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Count requests, apply latency and inject disconnects."""
+        stats = self.stats
+        self._request_count += 1
+        stats.active_requests += 1
+        stats.peak_requests = max(stats.peak_requests, stats.active_requests)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.disconnect_every and self._request_count % self.disconnect_every == 0:
+                stats.disconnects += 1
+                if request.transport is not None:
+                    request.transport.abort()
+                raise asyncio.CancelledError
+            response = await handler(request)
+            if isinstance(response, web.Response) and response.body is not None:
+                stats.bytes_sent += len(response.body)  # type: ignore[arg-type]
+            return response
+        finally:
+            stats.active_requests -= 1
+
+    def _count(self, endpoint: str) -> None:
+        self.stats.requests[endpoint] = self.stats.requests.get(endpoint, 0) + 1
+
+    def _session(self, request: web.Request) -> tuple[str | None, float] | None:
+        """Return the valid session of a request, if any."""
+        token = request.cookies.get(_SESSION_COOKIE)
+        session = self._sessions.get(token) if token is not None else None
+        if session is None:
+            return None
+        if (
+            self.session_lifetime is not None
+            and time.monotonic() - session[1] >= self.session_lifetime
+        ):
+            del self._sessions[token]  # type: ignore[arg-type]
+            return None
+        return session
+
+    def _to_login(self) -> NoReturn:
+        """Redirect a request without a valid session to the login page."""
+        self.stats.expired += 1
+        raise web.HTTPFound("/modules/login/main.php")
+
+    @staticmethod
+    def _html(text: str, status: int = 200) -> web.Response:
+        return web.Response(text=text, status=status, content_type="text/html")
+
+    async def _main(self, request: web.Request) -> web.Response:
+        self._count("main")
+        return self._html(_MAIN_PAGE if self._session(request) is not None else _LOGIN_PAGE)
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self._count("login")
+        form = await request.post()
+        device_id = str(form.get("user", ""))
+        if self.devices is not None and self.devices.get(device_id) != form.get("pass"):
+            self.stats.auth_failures += 1
+            return self._html(_LOGIN_PAGE)
+
+        self.stats.logins += 1
+        token = secrets.token_hex(16)
+        self._sessions[token] = (device_id if self.devices is not None else None, time.monotonic())
+        response = self._html(_MAIN_PAGE)
+        response.set_cookie(_SESSION_COOKIE, token, path="/")
+        return response
+
+    async def _processform(self, request: web.Request) -> web.Response:
+        self._count("processform")
+        if self._session(request) is None:
+            self._to_login()
+        raise web.HTTPFound("/modules/i-regul/index-Etat.php?CMD=Success")
+
+    async def _etat(self, request: web.Request) -> web.Response:
+        self._count("etat")
+        session = self._session(request)
+        if session is None:
+            self._to_login()
+        page = request.query.get("Etat")
+        if page is None:
+            # Landing page of the processform redirect
+            return self._html(_MAIN_PAGE)
+
+        self._page_count += 1
+        if self.error_every and self._page_count % self.error_every == 0:
+            self.stats.errors += 1
+            return self._html("<html><body>Internal error</body></html>", status=500)
+        text = self._page_source(session[0], page)
+        if text is None:
+            raise web.HTTPNotFound()
+        return self._html(text)
@@ -0,0 +1,64 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+"""
+This type stub file was generated by pyright.
+"""
+PageSource = Callable[[str | None, str], str | None]
+STATUS_PAGES: tuple[str, ...]
+
+@dataclass
+class WebServerStats:
+    requests: dict[str, int] = ...
+    active_requests: int = ...
+    peak_requests: int = ...
+    logins: int = ...
+    auth_failures: int = ...
+    expired: int = ...
+    bytes_sent: int = ...
+    errors: int = ...
+    disconnects: int = ...
+
+def generate_status_page(rows: Iterable[tuple[str, object, str]]) -> str: ...
+def default_pages() -> dict[str, str]: ...
+def load_pages(directory: Path | str) -> dict[str, str]: ...
+
+class FakeIRegulWebServer:
+    host: str
+    port: int
+    devices: dict[str, str] | None
+    latency: float
+    session_lifetime: float | None
+    error_every: int | None
+    disconnect_every: int | None
+    stats: WebServerStats
+    def __init__(
+        self,
+        pages: Mapping[str, str] | PageSource | None = ...,
+        *,
+        host: str = ...,
+        port: int = ...,
+        devices: Mapping[str, str] | None = ...,
+        latency: float = ...,
+        session_lifetime: float | None = ...,
+        error_every: int | None = ...,
+        disconnect_every: int | None = ...,
+    ) -> None: ...
+    @property
+    def url(self) -> str: ...
+    async def __aenter__(self) -> FakeIRegulWebServer: ...
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None: ...
+    async def start(self) -> None: ...
+    async def close(self) -> None: ...
+    def expire_sessions(self) -> None: ...
@@ -1,7 +1,7 @@
 """IRegul v1 API - Legacy HTTP-based API client.
 
 This module provides HTTP-based communication with IRegul devices through
-the web interface using BeautifulSoup for HTML parsing.
+the web interface, extracting the data from its HTML pages.
 
 Key Components:
 - IRegulDeviceInterface: Protocol defining device operations (get_data, defrost).
@@ -11,24 +11,38 @@ Key Components:
 - Exceptions: CannotConnect, InvalidAuth
 """
 
+import asyncio
 import logging
 import os
+import time
+from collections.abc import Awaitable, Callable, Collection
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import TypeVar
 from urllib import parse
 from urllib.parse import urljoin
 
 import aiohttp
-from bs4 import BeautifulSoup, Tag
-from dotenv import load_dotenv
 from slugify import slugify
+from yarl import URL
 
-from ..iregulapi import IRegulApiInterface, split_host_port
-from ..models import AnalogSensor, Input, MappedFrame, Measurement, Output
+from ..iregulapi import IRegulApiInterface, TimingsHook, split_host_port, track_timings
+from ..models import AnalogSensor, Input, MappedFrame, Measurement, Output, Timings
+from .parser import scan_page
 
 LOGGER = logging.getLogger(__name__)
-load_dotenv()
+
+# Status pages collected by get_data and the MappedFrame group each one backs
+_PAGES = {
+    "sorties": "outputs",
+    "sondes": "analog_sensors",
+    "entrees": "inputs",
+    "mesures": "measurements",
+}
+
+_T = TypeVar("_T")
 
 
 def _get_env(key: str, default: str | None = None) -> str:
@@ -58,6 +72,94 @@ class InvalidAuth(Exception):
     """Error to indicate there is invalid auth."""
 
 
+class _SessionExpired(Exception):
+    """Error raised when the server answers with the login page instead of data."""
+
+
+def _is_login_page(url: str | URL) -> bool:
+    """Tell whether a response was redirected to the login page."""
+    return "/login/" in URL(url).path
+
+
+def _scan_status_page(html: str) -> list[tuple[str, str, str]] | None:
+    """Extract the rows of the data table of a status page.
+
+    Runs in an executor, possibly in another process, so it only takes and
+    returns picklable values.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        The ``(alias, value, unit)`` text of each row, or None if the page
+        has no data table.
+
+    Raises:
+        _SessionExpired: If the page is the login form.
+    """
+    page = scan_page(html)
+    if not page.has_table:
+        if page.login_form:
+            raise _SessionExpired()
+        return None
+    return page.rows
+
+
+def _is_logged_in(html: str) -> bool:
+    """Tell whether a page is served to a logged-in session.
+
+    Runs in an executor like :func:`_scan_status_page`.
+    """
+    return scan_page(html).logged_in
+
+
+@dataclass(frozen=True)
+class _PageLayout:
+    """Row layout of a status page, derived once from its aliases and units.
+
+    Attributes:
+        keys: ``(alias, unit)`` of each row, as served by the device.
+        slots: Identifier, alias, unit and value scale of each row. Rows
+            sharing an identifier are summed.
+    """
+
+    keys: tuple[tuple[str, str], ...]
+    slots: tuple[tuple[str, str, str, Decimal | None], ...]
+
+    @classmethod
+    def of(cls, rows: list[tuple[str, str, str]]) -> "_PageLayout":
+        """Build the layout of a page from its rows."""
+        slots: list[tuple[str, str, str, Decimal | None]] = []
+        for alias, _, unit in rows:
+            if unit == "MWh":
+                slots.append((slugify(alias), alias, "KWh", Decimal(1000)))
+            else:
+                slots.append((slugify(alias), alias, unit, None))
+        return cls(tuple((alias, unit) for alias, _, unit in rows), tuple(slots))
+
+    def matches(self, rows: list[tuple[str, str, str]]) -> bool:
+        """Tell whether the rows have this layout."""
+        return len(rows) == len(self.keys) and all(
+            key[0] == alias and key[1] == unit
+            for key, (alias, _, unit) in zip(self.keys, rows, strict=True)
+        )
+
+    def map(self, rows: list[tuple[str, str, str]]) -> dict[str, IRegulData]:
+        """Map rows having this layout to data keyed by identifier."""
+        result: dict[str, IRegulData] = {}
+        for (identifier, alias, unit, scale), (_, raw_value, _) in zip(
+            self.slots, rows, strict=True
+        ):
+            value = Decimal(raw_value)
+            if scale is not None:
+                value = value * scale
+            if identifier in result:
+                result[identifier].value = result[identifier].value + value
+            else:
+                result[identifier] = IRegulData(identifier, alias, value, unit)
+        return result
+
+
 class Device(IRegulApiInterface):
     """IRegul device representation.
 
@@ -79,36 +181,90 @@ class Device(IRegulApiInterface):
         device_id: str | None = None,
         password: str | None = None,
         refresh_rate: timedelta = timedelta(minutes=5),
+        timings_hook: TimingsHook | None = None,
+        max_concurrent_pages: int = len(_PAGES),
+        session_ttl: timedelta = timedelta(minutes=20),
+        parse_executor: Executor | None = None,
+        frame_max_age: timedelta | None = None,
+        base_url: str | None = None,
     ):
         """Initialize Device with connection options and HTTP session.
 
         Args:
             options: Connection configuration.
             http_session: Shared aiohttp ClientSession for requests.
+            timings_hook: Optional callback receiving the per-phase
+                :class:`~aioiregul.models.Timings` of every operation.
+            max_concurrent_pages: Maximum number of status pages fetched at
+                once by ``get_data``. 1 fetches them one after the other.
+            session_ttl: How long after the last successful request the login
+                session is trusted without probing ``login/main.php``, as long
+                as the session cookie is still in the cookie jar. A data page
+                answered with the login form triggers a new login regardless.
+            parse_executor: Executor parsing the HTML pages, status pages and
+                login checks alike, so that parsing does not block the event
+                loop. None uses the loop's default thread pool; a
+                ``ProcessPoolExecutor`` also sidesteps the GIL when polling
+                many devices.
+            frame_max_age: How long the last frame is returned by ``get_data``
+                without any request. None uses ``refresh_rate``: the device
+                data cannot change before the next refresh. ``timedelta(0)``
+                disables the cache.
+            base_url: Root of the web interface, defaults to
+                ``https://<host>:<port>/modules/``. Useful to reach a local
+                :class:`~aioiregul.testing.FakeIRegulWebServer`.
+
+        Raises:
+            ValueError: If ``max_concurrent_pages`` is lower than 1.
         """
+        if max_concurrent_pages < 1:
+            raise ValueError("max_concurrent_pages must be at least 1")
         raw_host = host or os.getenv("IREGUL_HOST", "vpn.i-regul.com")
         raw_port = port or int(os.getenv("IREGUL_PORT", "443"))
         self.host, self.port = split_host_port(raw_host, raw_port)  # type: ignore[assignment]
         self.device_id = device_id or _get_env("IREGUL_DEVICE_ID")
         self.password = password or _get_env("IREGUL_PASSWORD_V1")
 
-        self.base_url = f"https://{self.host}:{self.port}/modules/"
+        if base_url is None:
+            base_url = f"https://{self.host}:{self.port}/modules/"
+        self.base_url = base_url.rstrip("/") + "/"
 
         self._http_session = http_session
         self.refresh_rate = refresh_rate
+        self.timings_hook = timings_hook
+        self.max_concurrent_pages = max_concurrent_pages
+        self._page_semaphore = asyncio.Semaphore(max_concurrent_pages)
+        self.session_ttl = session_ttl
+        self.parse_executor = parse_executor
+        self.frame_max_age = frame_max_age
+        # Row layout of each status page, rebuilt when the page changes
+        self._layouts: dict[str, _PageLayout] = {}
+        self._last_frame: MappedFrame | None = None
+        self._last_frame_groups: frozenset[str] = frozenset()
+        # Monotonic time at which _last_frame was collected
+        self._last_frame_at: float | None = None
+        # Monotonic time of the last request proving the session is valid
+        self._authenticated_at: float | None = None
 
         self.main_url = urljoin(self.base_url, "login/main.php")
         self.login_url = urljoin(self.base_url, "login/process.php")
         self.iregulApiBaseUrl = urljoin(self.base_url, "i-regul/")
 
-    async def __isauth(self) -> bool:
+    async def __is_logged_in(self, html: str) -> bool:
+        """Scan a page for the logged-in marker in the parse executor."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.parse_executor, _is_logged_in, html
+        )
+
+    async def __isauth(self, timings: Timings) -> bool:
         try:
-            async with self._http_session.get(self.main_url) as resp:
-                result_text = await resp.text()
-                soup_login = BeautifulSoup(result_text, "html.parser")
-                table_login = soup_login.find("div", attrs={"id": "btn_i-regul"})
-                if table_login is not None:
+            with timings.measure("auth"):
+                async with self._http_session.get(self.main_url) as resp:
+                    timings.bytes_received += len(await resp.read())
+                    result_text = await resp.text()
+                if await self.__is_logged_in(result_text):
                     LOGGER.debug("Login Ok")
+                    self._authenticated_at = time.monotonic()
                     return True
 
                 LOGGER.debug("Not Auth")
@@ -116,7 +272,7 @@ class Device(IRegulApiInterface):
         except aiohttp.ClientConnectionError as e:
             raise CannotConnect() from e
 
-    async def __connect(self, throwException: bool) -> bool:
+    async def __connect(self, throwException: bool, timings: Timings) -> bool:
         payload = {
             "sublogin": "1",
             "user": self.device_id,
@@ -124,12 +280,13 @@ class Device(IRegulApiInterface):
         }
 
         try:
-            async with self._http_session.post(self.login_url, data=payload) as resp:
-                result_text = await resp.text()
-                soup_login = BeautifulSoup(result_text, "html.parser")
-                table_login = soup_login.find("div", attrs={"id": "btn_i-regul"})
-                if table_login is not None:
+            with timings.measure("login"):
+                async with self._http_session.post(self.login_url, data=payload) as resp:
+                    timings.bytes_received += len(await resp.read())
+                    result_text = await resp.text()
+                if await self.__is_logged_in(result_text):
                     LOGGER.debug("Login Ok")
+                    self._authenticated_at = time.monotonic()
                     return True
 
                 LOGGER.error("Login Ko")
@@ -139,7 +296,46 @@ class Device(IRegulApiInterface):
         except aiohttp.ClientConnectionError as e:
             raise CannotConnect() from e
 
-    async def __refresh(self, refreshMandatory: bool) -> bool:
+    def __session_valid(self) -> bool:
+        """Tell whether the login session can be trusted without probing it."""
+        if self._authenticated_at is None:
+            return False
+        if time.monotonic() - self._authenticated_at >= self.session_ttl.total_seconds():
+            return False
+        # Without a cookie for the server, the session cannot still be open
+        return bool(self._http_session.cookie_jar.filter_cookies(URL(self.main_url)))
+
+    async def __ensure_auth(self, timings: Timings) -> None:
+        """Log in, unless the session is known to be valid."""
+        if self.__session_valid():
+            LOGGER.debug("Session still valid, skipping auth probe")
+            return
+        if not await self.__isauth(timings):
+            self._http_session.cookie_jar.clear()
+            await self.__connect(True, timings)
+
+    async def __with_session(self, operation: Callable[[], Awaitable[_T]], timings: Timings) -> _T:
+        """Run ``operation`` with a valid session, logging in again once if it expired.
+
+        Raises:
+            InvalidAuth: If the session expires again right after a new login.
+        """
+        await self.__ensure_auth(timings)
+        try:
+            result = await operation()
+        except _SessionExpired:
+            LOGGER.info("Session expired, logging in again")
+            self._authenticated_at = None
+            self._http_session.cookie_jar.clear()
+            await self.__connect(True, timings)
+            try:
+                result = await operation()
+            except _SessionExpired as e:
+                raise InvalidAuth() from e
+        self._authenticated_at = time.monotonic()
+        return result
+
+    async def __refresh(self, refreshMandatory: bool, timings: Timings) -> bool:
         payload = {"SNiregul": self.device_id, "Update": "etat", "EtatSel": "1"}
 
         # Refresh rate limit
@@ -156,11 +352,14 @@ class Device(IRegulApiInterface):
         self.lastupdate = datetime.now()
 
         try:
-            async with self._http_session.post(
-                urljoin(self.iregulApiBaseUrl, "includes/processform.php"),
-                data=payload,
-            ) as resp:
-                return await self.__checkreturn(refreshMandatory, str(resp.url))
+            with timings.measure("refresh"):
+                async with self._http_session.post(
+                    urljoin(self.iregulApiBaseUrl, "includes/processform.php"),
+                    data=payload,
+                ) as resp:
+                    if _is_login_page(resp.url):
+                        raise _SessionExpired()
+                    return await self.__checkreturn(refreshMandatory, str(resp.url))
 
         except aiohttp.ClientConnectionError as e:
             raise CannotConnect() from e
@@ -180,53 +379,74 @@ class Device(IRegulApiInterface):
         LOGGER.debug("Update Ok")
         return True
 
-    async def __collect(self, type_: str) -> dict[str, IRegulData]:
-        """Collect data from device."""
+    async def __collect(self, type_: str, timings: Timings) -> dict[str, IRegulData]:
+        """Collect data from device, recorded as the ``collect_<type_>`` phase."""
         try:
-            async with self._http_session.get(
-                urljoin(self.iregulApiBaseUrl, "index-Etat.php?Etat=" + type_)
-            ) as resp:
-                soup_collect = BeautifulSoup(await resp.text(), "html.parser")
-                table_collect = soup_collect.find("table", attrs={"id": "tbl_etat"})
-                if table_collect is None:
+            with timings.measure(f"collect_{type_}"):
+                async with self._http_session.get(
+                    urljoin(self.iregulApiBaseUrl, "index-Etat.php?Etat=" + type_)
+                ) as resp:
+                    timings.bytes_received += len(await resp.read())
+                    html = await resp.text()
+                    if _is_login_page(resp.url):
+                        raise _SessionExpired()
+                # Parsing is CPU-bound: keep it off the event loop
+                rows = await asyncio.get_running_loop().run_in_executor(
+                    self.parse_executor, _scan_status_page, html
+                )
+                if rows is None:
                     LOGGER.warning("No data table found for %s", type_)
                     return {}
+                LOGGER.debug("%s -> Number of results: %d", type_, len(rows))
+                return self.__map_rows(type_, rows)
+        except aiohttp.ClientConnectionError as e:
+            raise CannotConnect() from e
 
-                if not isinstance(table_collect, Tag):
-                    LOGGER.warning("Unexpected data table type for %s", type_)
-                    return {}
-
-                results_collect = table_collect.find_all("tr")
-                LOGGER.debug("%s -> Number of results: %d", type_, len(results_collect))
-                result: dict[str, IRegulData] = {}
-
-                for row in results_collect:
-                    alias_cell = row.find("td", attrs={"id": "ali_td_tbl_etat"})
-                    value_cell = row.find("td", attrs={"id": "val_td_tbl_etat"})
-                    unit_cell = row.find("td", attrs={"id": "unit_td_tbl_etat"})
+    def __map_rows(self, type_: str, rows: list[tuple[str, str, str]]) -> dict[str, IRegulData]:
+        """Map the rows of a page positionally, using its layout from the last parse."""
+        layout = self._layouts.get(type_)
+        if layout is None or not layout.matches(rows):
+            LOGGER.debug("New row layout for %s", type_)
+            layout = self._layouts[type_] = _PageLayout.of(rows)
+        return layout.map(rows)
 
-                    if alias_cell is None or value_cell is None or unit_cell is None:
-                        LOGGER.debug("Skipping incomplete row for %s", type_)
-                        continue
+    async def __collect_pages(
+        self, pages: list[str], timings: Timings
+    ) -> dict[str, dict[str, IRegulData]]:
+        """Collect status pages concurrently, up to ``max_concurrent_pages`` at once.
 
-                    alias = alias_cell.get_text(strip=True)
-                    identifier = slugify(alias)
+        If a page fails, the other requests are cancelled and the error is
+        raised. Each page is timed separately and its phase is added to
+        ``timings`` in page order, so phases overlap in time.
 
-                    value = Decimal(value_cell.get_text(strip=True))
-                    unit = unit_cell.get_text(strip=True)
+        Args:
+            pages: Names of the pages to collect.
 
-                    if unit == "MWh":
-                        unit = "KWh"
-                        value = value * Decimal(1000)
+        Returns:
+            The collected data of each page, keyed by page name.
+        """
+        page_timings = [Timings(f"collect_{page}") for page in pages]
 
-                    if identifier in result:
-                        result[identifier].value = result[identifier].value + value
-                    else:
-                        result[identifier] = IRegulData(identifier, alias, value, unit)
+        async def collect(page: str, page_timing: Timings) -> dict[str, IRegulData]:
+            async with self._page_semaphore:
+                return await self.__collect(page, page_timing)
 
-                return result
-        except aiohttp.ClientConnectionError as e:
-            raise CannotConnect() from e
+        tasks = [
+            asyncio.ensure_future(collect(page, page_timing))
+            for page, page_timing in zip(pages, page_timings, strict=True)
+        ]
+        try:
+            return dict(zip(pages, await asyncio.gather(*tasks), strict=True))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            for page_timing in page_timings:
+                for phase, elapsed_ns in page_timing.phases.items():
+                    timings.add(phase, elapsed_ns)
+                timings.bytes_received += page_timing.bytes_received
 
     async def defrost(self) -> bool:
         """Trigger defrost operation.
@@ -238,18 +458,34 @@ class Device(IRegulApiInterface):
             CannotConnect: If unable to connect to the device.
             InvalidAuth: If authentication fails.
         """
-        if not await self.__isauth():
-            self._http_session.cookie_jar.clear()
-            await self.__connect(True)
-
-        payload = {"SNiregul": self.device_id, "Update": "203"}
-
-        async with self._http_session.post(
-            urljoin(self.iregulApiBaseUrl, "includes/processform.php"), data=payload
-        ) as resp:
-            return await self.__checkreturn(True, str(resp.url))
+        with track_timings("defrost", self.timings_hook) as timings:
+            payload = {"SNiregul": self.device_id, "Update": "203"}
+
+            async def request() -> bool:
+                with timings.measure("wait_response"):
+                    async with self._http_session.post(
+                        urljoin(self.iregulApiBaseUrl, "includes/processform.php"), data=payload
+                    ) as resp:
+                        if _is_login_page(resp.url):
+                            raise _SessionExpired()
+                        return await self.__checkreturn(True, str(resp.url))
+
+            # The defrost changes the device state: the next poll must see it
+            self._last_frame = None
+            return await self.__with_session(request, timings)
+
+    def __cached_frame(self, groups: frozenset[str]) -> MappedFrame | None:
+        """Return the last frame if it has ``groups`` and is younger than ``frame_max_age``."""
+        if self._last_frame is None or self._last_frame_at is None:
+            return None
+        if not groups <= self._last_frame_groups:
+            return None
+        max_age = self.refresh_rate if self.frame_max_age is None else self.frame_max_age
+        if time.monotonic() - self._last_frame_at >= max_age.total_seconds():
+            return None
+        return self._last_frame
 
-    async def get_data(self) -> MappedFrame | None:
+    async def get_data(self, groups: Collection[str] | None = None) -> MappedFrame | None:
         """Collect all data from device.
 
         The legacy HTML tables are parsed and converted into a :class:`MappedFrame`
@@ -267,30 +503,95 @@ class Device(IRegulApiInterface):
         All other groups (zones, parameters, labels, configuration,
         memory, bus registers) are left empty or ``None``.
 
+        ``groups`` restricts the collection to the pages backing the given
+        groups; the other groups of the frame are left empty.
+
+        Within ``frame_max_age`` (by default ``refresh_rate``) of the last
+        collection, the last frame is returned without any request, provided
+        it holds the requested groups.
+
+        The pages are fetched concurrently, up to ``max_concurrent_pages`` at
+        once.
+
+        The login page is only probed when the session is not known to be
+        valid (see ``session_ttl``); if a page shows the session expired, the
+        device logs in again and retries once.
+
+        ``MappedFrame.timings`` holds the latency of the ``auth``, ``login``,
+        ``refresh``, ``collect_<page>`` and ``map`` phases. Page phases
+        overlap, so their sum exceeds the wall-clock time.
+
         Args:
-            refreshMandatory: Whether to enforce refresh rate limits.
+            groups: MappedFrame groups to collect among ``outputs``,
+                ``analog_sensors``, ``inputs`` and ``measurements``. None
+                collects all of them.
 
         Returns:
             MappedFrame with device data or None if refresh failed.
 
         Raises:
+            ValueError: If ``groups`` names a group not served by v1.
             CannotConnect: If unable to connect to the device.
             InvalidAuth: If authentication fails.
         """
-        if not await self.__isauth():
-            self._http_session.cookie_jar.clear()
-            await self.__connect(True)
-
-        # First Login and Refresh Datas
-        if not await self.__refresh(True):
-            return None
-
-        # Collect legacy HTML data
-        outputs_raw = await self.__collect("sorties")
-        sensors_raw = await self.__collect("sondes")
-        inputs_raw = await self.__collect("entrees")
-        measures_raw = await self.__collect("mesures")
-
+        if groups is None:
+            wanted = frozenset(_PAGES.values())
+        else:
+            wanted = frozenset(groups)
+            unknown = wanted.difference(_PAGES.values())
+            if unknown:
+                raise ValueError(
+                    f"Groups not served by v1: {', '.join(sorted(unknown))}; "
+                    f"expected some of {', '.join(_PAGES.values())}"
+                )
+        pages = [page for page, group in _PAGES.items() if group in wanted]
+
+        cached = self.__cached_frame(wanted)
+        if cached is not None:
+            LOGGER.debug("Serving cached frame")
+            return cached
+
+        with track_timings("get_data", self.timings_hook) as timings:
+
+            async def collect() -> dict[str, dict[str, IRegulData]] | None:
+                last_update = self.lastupdate
+                try:
+                    # Refresh Datas
+                    if not await self.__refresh(True, timings):
+                        return None
+
+                    # Collect legacy HTML data
+                    return await self.__collect_pages(pages, timings)
+                except _SessionExpired:
+                    # Let the retry after the new login refresh again
+                    self.lastupdate = last_update
+                    raise
+
+            collected = await self.__with_session(collect, timings)
+            if collected is None:
+                return None
+
+            with timings.measure("map"):
+                mapped = self.__map(
+                    collected.get("sorties", {}),
+                    collected.get("sondes", {}),
+                    collected.get("entrees", {}),
+                    collected.get("mesures", {}),
+                )
+            mapped.timings = timings
+            self._last_frame = mapped
+            self._last_frame_groups = wanted
+            self._last_frame_at = time.monotonic()
+            return mapped
+
+    @staticmethod
+    def __map(
+        outputs_raw: dict[str, IRegulData],
+        sensors_raw: dict[str, IRegulData],
+        inputs_raw: dict[str, IRegulData],
+        measures_raw: dict[str, IRegulData],
+    ) -> MappedFrame:
+        """Convert the collected HTML tables into a MappedFrame."""
         # Map to shared typed models
         outputs = {
             i: Output(index=i, valeur=int(data.value), alias=data.name)
@@ -342,4 +643,5 @@ class Device(IRegulApiInterface):
             CannotConnect: If unable to connect to the device.
             InvalidAuth: If authentication fails.
         """
-        return await self.__connect(throwException=True)
+        with track_timings("check_auth", self.timings_hook) as timings:
+            return await self.__connect(throwException=True, timings=timings)
@@ -2,6 +2,8 @@
 This type stub file was generated by pyright.
 """
 
+from collections.abc import Collection
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -9,7 +11,7 @@ from decimal import Decimal
 import aiohttp
 from _typeshed import Incomplete
 
-from ..iregulapi import IRegulApiInterface
+from ..iregulapi import IRegulApiInterface, TimingsHook
 from ..models import MappedFrame
 
 """
@@ -39,6 +41,11 @@ class Device(IRegulApiInterface):
     base_url: Incomplete
     refresh_rate: Incomplete
     main_url: Incomplete
+    timings_hook: TimingsHook | None
+    max_concurrent_pages: int
+    session_ttl: timedelta
+    parse_executor: Executor | None
+    frame_max_age: timedelta | None
     def __init__(
         self,
         http_session: aiohttp.ClientSession,
@@ -47,7 +54,13 @@ class Device(IRegulApiInterface):
         device_id: str | None = ...,
         password: str | None = ...,
         refresh_rate: timedelta = ...,
+        timings_hook: TimingsHook | None = ...,
+        max_concurrent_pages: int = ...,
+        session_ttl: timedelta = ...,
+        parse_executor: Executor | None = ...,
+        frame_max_age: timedelta | None = ...,
+        base_url: str | None = ...,
     ) -> None: ...
     async def defrost(self) -> bool: ...
-    async def get_data(self) -> MappedFrame | None: ...
+    async def get_data(self, groups: Collection[str] | None = ...) -> MappedFrame | None: ...
     async def check_auth(self) -> bool: ...
@@ -0,0 +1,179 @@
+"""Polling of many v1 devices over one shared connection pool.
+
+Each :class:`~aioiregul.v1.Device` keeps its login session in the cookie jar of
+its ``aiohttp.ClientSession`` and clears it on re-login, so devices cannot
+share a session. :class:`DeviceFleet` gives every device its own session and
+cookie jar on top of a single :class:`aiohttp.TCPConnector`, so that keep-alive
+connections, the DNS cache and the per-host connection limit are shared by the
+whole fleet.
+
+Example:
+    >>> async with DeviceFleet(max_concurrent=4) as fleet:  # doctest: +SKIP
+    ...     for device_id, password in credentials.items():
+    ...         fleet.add(device_id, password)
+    ...     frames = await fleet.poll()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Collection
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+
+from ..models import MappedFrame
+from . import Device
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DeviceFleet:
+    """v1 devices sharing one connector, each with its own cookie jar."""
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        max_concurrent: int = 8,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        ttl_dns_cache: int | None = 300,
+        keepalive_timeout: float = 30.0,
+        **device_options: Any,
+    ) -> None:
+        """Configure the fleet.
+
+        Args:
+            host: Server of the devices, see :class:`~aioiregul.v1.Device`.
+            port: Server port, see :class:`~aioiregul.v1.Device`.
+            max_concurrent: Maximum number of devices polled at once by
+                :meth:`poll`.
+            limit: Maximum number of connections of the shared connector.
+            limit_per_host: Maximum number of connections to the same host.
+            ttl_dns_cache: How long resolved addresses are cached, in seconds.
+                None caches them forever.
+            keepalive_timeout: How long idle connections are kept open, in
+                seconds.
+            **device_options: Default keyword arguments of every
+                :class:`~aioiregul.v1.Device`, e.g. ``refresh_rate``.
+
+        Raises:
+            ValueError: If ``max_concurrent`` is lower than 1.
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.device_options = device_options
+        self.devices: dict[str, Device] = {}
+        self._sessions: list[aiohttp.ClientSession] = []
+        self._connector: aiohttp.TCPConnector | None = None
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        """Connector shared by every device, created on first use.
+
+        Raises:
+            RuntimeError: If the fleet is closed.
+        """
+        if self._connector is None:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+        elif self._connector.closed:
+            raise RuntimeError("The fleet is closed")
+        return self._connector
+
+    def add(self, device_id: str, password: str, **options: Any) -> Device:
+        """Create a device of the fleet.
+
+        Args:
+            device_id: Device identifier.
+            password: Device password.
+            **options: Keyword arguments of :class:`~aioiregul.v1.Device`,
+                overriding the fleet's ``device_options``.
+
+        Returns:
+            The new device, also available in :attr:`devices`.
+
+        Raises:
+            ValueError: If the fleet already has a device with this id.
+        """
+        if device_id in self.devices:
+            raise ValueError(f"Device {device_id} is already in the fleet")
+        # The jar only ever talks to the device's server, which may be an IP address
+        session = aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+        )
+        self._sessions.append(session)
+        device = Device(
+            session,
+            host=self.host,
+            port=self.port,
+            device_id=device_id,
+            password=password,
+            **{**self.device_options, **options},
+        )
+        self.devices[device_id] = device
+        return device
+
+    async def poll(
+        self, groups: Collection[str] | None = None
+    ) -> dict[str, MappedFrame | None | Exception]:
+        """Collect the data of every device, up to ``max_concurrent`` at once.
+
+        A device failing does not stop the others: its exception is returned
+        in place of its frame.
+
+        Args:
+            groups: Groups to collect, see :meth:`aioiregul.v1.Device.get_data`.
+
+        Returns:
+            The result of ``get_data`` or the raised exception, per device id.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def poll_device(device: Device) -> MappedFrame | None | Exception:
+            async with semaphore:
+                try:
+                    return await device.get_data(groups)
+                except Exception as e:
+                    LOGGER.warning("Polling device %s failed: %r", device.device_id, e)
+                    return e
+
+        results = await asyncio.gather(*(poll_device(d) for d in self.devices.values()))
+        return dict(zip(self.devices, results, strict=True))
+
+    async def close(self) -> None:
+        """Close the sessions of every device and the shared connector."""
+        for session in self._sessions:
+            await session.close()
+        self._sessions.clear()
+        if self._connector is not None:
+            await self._connector.close()
+
+    async def __aenter__(self) -> DeviceFleet:
+        """Return the fleet, closed on exit."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the fleet."""
+        await self.close()
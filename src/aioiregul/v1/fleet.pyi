@@ -0,0 +1,54 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from collections.abc import Collection
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+from _typeshed import Incomplete
+
+from ..models import MappedFrame
+from . import Device
+
+"""
+This type stub file was generated by pyright.
+"""
+LOGGER: Incomplete
+
+class DeviceFleet:
+    host: str | None
+    port: int | None
+    max_concurrent: int
+    limit: int
+    limit_per_host: int
+    ttl_dns_cache: int | None
+    keepalive_timeout: float
+    device_options: dict[str, Any]
+    devices: dict[str, Device]
+    def __init__(
+        self,
+        host: str | None = ...,
+        port: int | None = ...,
+        max_concurrent: int = ...,
+        limit: int = ...,
+        limit_per_host: int = ...,
+        ttl_dns_cache: int | None = ...,
+        keepalive_timeout: float = ...,
+        **device_options: Any,
+    ) -> None: ...
+    @property
+    def connector(self) -> aiohttp.TCPConnector: ...
+    def add(self, device_id: str, password: str, **options: Any) -> Device: ...
+    async def poll(
+        self, groups: Collection[str] | None = ...
+    ) -> dict[str, MappedFrame | None | Exception]: ...
+    async def close(self) -> None: ...
+    async def __aenter__(self) -> DeviceFleet: ...
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None: ...
@@ -0,0 +1,123 @@
+"""Single-pass extraction of the data served by the v1 web interface.
+
+The v1 pages are large HTML documents of which only a few elements matter:
+the cells of the ``tbl_etat`` status table, the ``btn_i-regul`` button shown
+once logged in, and the ``sublogin`` field of the login form. :func:`scan_page`
+collects them while streaming the page through :class:`html.parser.HTMLParser`,
+without building a document tree.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+# Ids of the status table cells, in the order of PageScan.rows
+_CELL_IDS = ("ali_td_tbl_etat", "val_td_tbl_etat", "unit_td_tbl_etat")
+
+
+@dataclass
+class PageScan:
+    """Elements of interest found in a v1 page.
+
+    Attributes:
+        rows: ``(alias, value, unit)`` text of each complete row of the
+            status table, whitespace stripped as by BeautifulSoup's
+            ``get_text(strip=True)``.
+        has_table: Whether the page contains the ``tbl_etat`` table.
+        logged_in: Whether the page shows the ``btn_i-regul`` button.
+        login_form: Whether the page is the login form.
+    """
+
+    rows: list[tuple[str, str, str]] = field(default_factory=lambda: list[tuple[str, str, str]]())
+    has_table: bool = False
+    logged_in: bool = False
+    login_form: bool = False
+
+
+class _PageScanner(HTMLParser):
+    """Streaming parser filling a :class:`PageScan`."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.scan = PageScan()
+        # Number of open tables, counted from the status table
+        self._table_depth = 0
+        self._row: dict[str, str] | None = None
+        self._cell: str | None = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "div":
+            if ("id", "btn_i-regul") in attrs:
+                self.scan.logged_in = True
+        elif tag == "input":
+            if ("name", "sublogin") in attrs:
+                self.scan.login_form = True
+        elif tag == "table":
+            if self._table_depth:
+                self._table_depth += 1
+            elif not self.scan.has_table and ("id", "tbl_etat") in attrs:
+                self.scan.has_table = True
+                self._table_depth = 1
+        elif self._table_depth:
+            if tag == "tr":
+                self._end_row()
+                self._row = {}
+            elif tag == "td":
+                self._end_cell()
+                cell_id = dict(attrs).get("id")
+                if self._row is not None and cell_id in _CELL_IDS:
+                    self._cell = cell_id
+                    self._text = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self._table_depth:
+            return
+        if tag == "td":
+            self._end_cell()
+        elif tag == "tr":
+            self._end_row()
+        elif tag == "table":
+            self._table_depth -= 1
+            if not self._table_depth:
+                self._end_row()
+
+    def handle_data(self, data: str) -> None:
+        if self._cell is not None:
+            self._text.append(data)
+
+    def close(self) -> None:
+        """Process the remaining input and keep the row left open, if any."""
+        super().close()
+        self._end_row()
+
+    def _end_cell(self) -> None:
+        if self._cell is None or self._row is None:
+            return
+        # The first matching cell of a row wins, like BeautifulSoup's find()
+        self._row.setdefault(
+            self._cell, "".join(part.strip() for part in self._text if part.strip())
+        )
+        self._cell = None
+
+    def _end_row(self) -> None:
+        self._end_cell()
+        row, self._row = self._row, None
+        if row is not None and len(row) == len(_CELL_IDS):
+            self.scan.rows.append((row[_CELL_IDS[0]], row[_CELL_IDS[1]], row[_CELL_IDS[2]]))
+
+
+def scan_page(html: str) -> PageScan:
+    """Extract the status table, login button and login form of a v1 page.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        The elements found in the page.
+    """
+    scanner = _PageScanner()
+    scanner.feed(html)
+    scanner.close()
+    return scanner.scan
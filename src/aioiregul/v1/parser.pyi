@@ -0,0 +1,18 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from dataclasses import dataclass
+
+"""
+This type stub file was generated by pyright.
+"""
+
+@dataclass
+class PageScan:
+    rows: list[tuple[str, str, str]] = ...
+    has_table: bool = ...
+    logged_in: bool = ...
+    login_form: bool = ...
+
+def scan_page(html: str) -> PageScan: ...
@@ -8,25 +8,73 @@ Key Components:
 - IRegulClient: Main socket client for device communication
 - Decoder: Parses undocumented text protocol frames
 - Mappers: Converts raw data to typed dataclasses
+- Transports: Socket framing (asyncio.Protocol or StreamReader based)
+- Capture: Record and replay the raw frames seen by the client
+- SkeletonStore: Configuration skeletons shared between clients
+- SkeletonDirectory: Skeletons persisted per device for warm starts
+- RateLimiter: Fleet-wide command budgets shared between clients
 - Models: Strongly-typed dataclasses for protocol groups
+
+Submodules are imported lazily on first attribute access, and importing the
+package performs no I/O: environment variables are only read when a client is
+created, and ``.env`` files only through :func:`aioiregul.iregulapi.load_env`.
 """
 
-from ..models import (
-    AnalogSensor,
-    Configuration,
-    Input,
-    Label,
-    MappedFrame,
-    Measurement,
-    Memory,
-    ModbusRegister,
-    Output,
-    Parameter,
-    Zone,
-)
-from .client import IRegulClient
-from .decoder import DecodedFrame, decode_file, decode_text
-from .mappers import map_frame
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..models import (
+        AnalogSensor,
+        Configuration,
+        Input,
+        Label,
+        MappedFrame,
+        Measurement,
+        Memory,
+        ModbusRegister,
+        Output,
+        Parameter,
+        Zone,
+    )
+    from .capture import RecordingTransport, ReplayTransport
+    from .client import IRegulClient
+    from .decoder import DecodedFrame, decode_file, decode_text
+    from .limiter import Budget, RateLimiter
+    from .mappers import map_frame
+    from .skeleton import SkeletonDirectory, SkeletonStore
+    from .transport import ProtocolTransport, StreamTransport
+
+# Public name -> module defining it. Submodules are imported on first access
+# (PEP 562) so that ``import aioiregul.v2`` stays cheap.
+_EXPORTS = {
+    "IRegulClient": ".client",
+    "DecodedFrame": ".decoder",
+    "decode_file": ".decoder",
+    "decode_text": ".decoder",
+    "MappedFrame": "..models",
+    "map_frame": ".mappers",
+    "ProtocolTransport": ".transport",
+    "StreamTransport": ".transport",
+    "RecordingTransport": ".capture",
+    "ReplayTransport": ".capture",
+    "SkeletonStore": ".skeleton",
+    "SkeletonDirectory": ".skeleton",
+    "RateLimiter": ".limiter",
+    "Budget": ".limiter",
+    "AnalogSensor": "..models",
+    "Configuration": "..models",
+    "Input": "..models",
+    "Label": "..models",
+    "Measurement": "..models",
+    "Memory": "..models",
+    "ModbusRegister": "..models",
+    "Output": "..models",
+    "Parameter": "..models",
+    "Zone": "..models",
+}
 
 __all__ = [
     "IRegulClient",
@@ -35,6 +83,14 @@ __all__ = [
     "decode_text",
     "MappedFrame",
     "map_frame",
+    "ProtocolTransport",
+    "StreamTransport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "SkeletonStore",
+    "SkeletonDirectory",
+    "RateLimiter",
+    "Budget",
     "AnalogSensor",
     "Configuration",
     "Input",
@@ -46,3 +102,18 @@ __all__ = [
     "Parameter",
     "Zone",
 ]
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining ``name`` on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names, including those not imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -35,6 +35,12 @@ from ..models import (
 from ..models import (
     Zone as Zone,
 )
+from .capture import (
+    RecordingTransport as RecordingTransport,
+)
+from .capture import (
+    ReplayTransport as ReplayTransport,
+)
 from .client import IRegulClient as IRegulClient
 from .decoder import (
     DecodedFrame as DecodedFrame,
@@ -45,7 +51,25 @@ from .decoder import (
 from .decoder import (
     decode_text as decode_text,
 )
+from .limiter import (
+    Budget as Budget,
+)
+from .limiter import (
+    RateLimiter as RateLimiter,
+)
 from .mappers import map_frame as map_frame
+from .skeleton import (
+    SkeletonDirectory as SkeletonDirectory,
+)
+from .skeleton import (
+    SkeletonStore as SkeletonStore,
+)
+from .transport import (
+    ProtocolTransport as ProtocolTransport,
+)
+from .transport import (
+    StreamTransport as StreamTransport,
+)
 
 """
 This type stub file was generated by pyright.
@@ -57,6 +81,14 @@ __all__ = [
     "decode_text",
     "MappedFrame",
     "map_frame",
+    "ProtocolTransport",
+    "StreamTransport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "SkeletonStore",
+    "SkeletonDirectory",
+    "RateLimiter",
+    "Budget",
     "AnalogSensor",
     "Configuration",
     "Input",
@@ -0,0 +1,312 @@
+"""Record and replay the raw frames exchanged by IRegulClient.
+
+:class:`RecordingTransport` wraps another :class:`~aioiregul.v2.transport.FrameTransport`
+and appends every connection, sent command and received frame to a capture
+file, together with its time offset since the recording started.
+:class:`ReplayTransport` reads such a capture back and serves the recorded
+frames to the client, so the full decode/merge/map pipeline runs on production
+traffic without a network. Replay runs at the original pace, scaled by
+``speed``, or as fast as possible when ``speed`` is None.
+
+Capture format:
+    The file starts with the ``IRGCAP2\\n`` magic followed by records made of
+    a one-byte kind, a big-endian float64 offset in seconds, a big-endian
+    uint32 connection id and a big-endian uint32 payload length, then the
+    payload. Kinds are ``C`` (connection opened, payload ``host:port``), ``S``
+    (command sent) and ``F`` (frame received). Connection ids number the
+    ``C`` records from 0, so that the records of connections open at the
+    same time can be told apart. Files ending in ``.gz`` are gzip-compressed.
+
+Example:
+    >>> recorder = RecordingTransport("poll.cap")  # doctest: +SKIP
+    >>> client = IRegulClient(transport=recorder)  # doctest: +SKIP
+    >>> replay = IRegulClient(
+    ...     device_id="dev", password="pw", transport=ReplayTransport("poll.cap", speed=None)
+    ... )  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import struct
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from .transport import FrameConnection, FrameTransport, ProtocolTransport
+
+LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"IRGCAP2\n"
+KIND_CONNECT = b"C"
+KIND_SEND = b"S"
+KIND_FRAME = b"F"
+
+_RECORD_HEADER = struct.Struct(">cdII")
+# Records are written to the file in chunks of about this size
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+
+@dataclass
+class CaptureRecord:
+    """A single entry of a capture file.
+
+    Attributes:
+        kind: Record kind (``C``, ``S`` or ``F``).
+        offset: Seconds elapsed since the recording started.
+        payload: Raw record payload.
+        connection: Id of the connection the record belongs to.
+    """
+
+    kind: bytes
+    offset: float
+    payload: bytes
+    connection: int = 0
+
+
+def _open_capture(path: Path, mode: str) -> BinaryIO:
+    """Open a capture file, transparently handling gzip."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    return path.open(mode)  # type: ignore[return-value]
+
+
+def read_capture(path: Path | str) -> Iterator[CaptureRecord]:
+    """Iterate over the records of a capture file.
+
+    Args:
+        path: Capture file path.
+
+    Yields:
+        CaptureRecord instances in file order.
+
+    Raises:
+        ValueError: If the file is not a capture or is truncated.
+    """
+    with _open_capture(Path(path), "rb") as stream:
+        if stream.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not an IRegul capture file: {path}")
+        while header := stream.read(_RECORD_HEADER.size):
+            if len(header) != _RECORD_HEADER.size:
+                raise ValueError(f"Truncated capture record header in {path}")
+            kind, offset, connection, length = _RECORD_HEADER.unpack(header)
+            payload = stream.read(length)
+            if len(payload) != length:
+                raise ValueError(f"Truncated capture record payload in {path}")
+            yield CaptureRecord(kind, offset, payload, connection)
+
+
+class RecordingConnection:
+    """Frame connection recording the traffic of a wrapped connection."""
+
+    def __init__(
+        self, inner: FrameConnection, recorder: RecordingTransport, connection_id: int = 0
+    ) -> None:
+        """Wrap an open connection.
+
+        Args:
+            inner: Connection doing the actual I/O.
+            recorder: Transport owning the capture file.
+            connection_id: Id of the connection in the capture file.
+        """
+        self.inner = inner
+        self.recorder = recorder
+        self.connection_id = connection_id
+
+    async def send(self, data: bytes) -> None:
+        """Record and send raw bytes."""
+        self.recorder.record(KIND_SEND, data, self.connection_id)
+        await self.inner.send(data)
+
+    async def read_frame(self) -> bytes:
+        """Read the next frame from the wrapped connection and record it."""
+        frame = await self.inner.read_frame()
+        self.recorder.record(KIND_FRAME, frame, self.connection_id)
+        return frame
+
+    async def close(self) -> None:
+        """Close the wrapped connection."""
+        await self.inner.close()
+
+
+class RecordingTransport:
+    """Transport appending every exchanged frame to a capture file.
+
+    Records are buffered in memory and written by a background thread once
+    the buffer is large enough, so that recording does not block the event
+    loop on file I/O or compression. :meth:`close` writes what is left.
+    """
+
+    def __init__(self, path: Path | str, inner: FrameTransport | None = None) -> None:
+        """Create the capture file and wrap a transport.
+
+        Args:
+            path: Capture file to write; ``.gz`` files are compressed.
+            inner: Transport doing the actual I/O. Defaults to
+                :class:`~aioiregul.v2.transport.ProtocolTransport`.
+        """
+        self.path = Path(path)
+        self.inner: FrameTransport = inner or ProtocolTransport()
+        self._stream = _open_capture(self.path, "wb")
+        self._stream.write(CAPTURE_MAGIC)
+        self._started = time.monotonic()
+        self._connections = 0
+        self._buffer = bytearray()
+        # A single worker keeps the chunks in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="irgcap")
+        self._writes: list[Future[int]] = []
+
+    def record(self, kind: bytes, payload: bytes, connection: int = 0) -> None:
+        """Append a record to the capture file.
+
+        Args:
+            kind: Record kind (``C``, ``S`` or ``F``).
+            payload: Raw record payload.
+            connection: Id of the connection the record belongs to.
+        """
+        offset = time.monotonic() - self._started
+        self._buffer += _RECORD_HEADER.pack(kind, offset, connection, len(payload))
+        self._buffer += payload
+        if len(self._buffer) >= _WRITE_BUFFER_SIZE:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        """Hand the buffered records over to the writer thread."""
+        # Keep failed writes so that close() reports them
+        self._writes = [write for write in self._writes if not write.done() or write.exception()]
+        self._writes.append(self._writer.submit(self._stream.write, bytes(self._buffer)))
+        self._buffer.clear()
+
+    async def connect(self, host: str, port: int) -> RecordingConnection:
+        """Open a connection through the wrapped transport and record it."""
+        connection = await self.inner.connect(host, port)
+        connection_id = self._connections
+        self._connections += 1
+        self.record(KIND_CONNECT, f"{host}:{port}".encode(), connection_id)
+        return RecordingConnection(connection, self, connection_id)
+
+    def close(self) -> None:
+        """Write the buffered records and close the capture file.
+
+        Raises:
+            OSError: If writing a chunk of records failed.
+        """
+        if self._buffer:
+            self._write_buffer()
+        self._writer.shutdown(wait=True)
+        try:
+            for write in self._writes:
+                write.result()
+        finally:
+            self._writes.clear()
+            self._stream.close()
+
+
+@dataclass
+class _ReplaySession:
+    """Frames recorded for one connection."""
+
+    offset: float
+    frames: list[CaptureRecord]
+
+
+class ReplayConnection:
+    """Frame connection serving the frames of one recorded session."""
+
+    def __init__(self, session: _ReplaySession, speed: float | None) -> None:
+        """Prepare the session for replay.
+
+        Args:
+            session: Recorded session to serve.
+            speed: Replay speed factor, None for no pacing.
+        """
+        self._frames = iter(session.frames)
+        self._session_offset = session.offset
+        self._speed = speed
+        self._opened_at = asyncio.get_running_loop().time()
+
+    async def send(self, data: bytes) -> None:
+        """Ignore the command; the recorded reply is served regardless."""
+        LOGGER.debug(f"Replay ignoring sent command {data[-6:]!r}")
+
+    async def read_frame(self) -> bytes:
+        """Return the next recorded frame, paced like the original.
+
+        Raises:
+            asyncio.IncompleteReadError: Once the recorded frames are exhausted.
+        """
+        record = next(self._frames, None)
+        if record is None:
+            raise asyncio.IncompleteReadError(b"", None)
+        if self._speed is not None:
+            due = self._opened_at + (record.offset - self._session_offset) / self._speed
+            delay = due - asyncio.get_running_loop().time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return record.payload
+
+    async def close(self) -> None:
+        """Nothing to release."""
+
+
+class ReplayTransport:
+    """Transport replaying a capture written by :class:`RecordingTransport`."""
+
+    def __init__(self, path: Path | str, speed: float | None = 1.0, loop: bool = False) -> None:
+        """Load a capture file.
+
+        Args:
+            path: Capture file to replay.
+            speed: Replay speed factor (2.0 is twice as fast). None serves
+                frames as fast as possible.
+            loop: Whether to start over once every session has been served.
+
+        Raises:
+            ValueError: If the file is not a valid capture.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.speed = speed
+        self.loop = loop
+        self.sessions: list[_ReplaySession] = []
+        # Frames are attached to their own connection, which may not be the
+        # last one opened when several connections were recorded at once
+        by_connection: dict[int, _ReplaySession] = {}
+        for record in read_capture(path):
+            if record.kind == KIND_CONNECT:
+                session = by_connection[record.connection] = _ReplaySession(record.offset, [])
+                self.sessions.append(session)
+            elif record.kind == KIND_FRAME and record.connection in by_connection:
+                by_connection[record.connection].frames.append(record)
+        self._next = 0
+        self._started: float | None = None
+
+    async def connect(self, host: str, port: int) -> ReplayConnection:
+        """Open the next recorded session, waiting for its original start time.
+
+        Raises:
+            ConnectionRefusedError: Once every session has been replayed and
+                ``loop`` is False.
+        """
+        if self._next >= len(self.sessions):
+            if not self.loop or not self.sessions:
+                raise ConnectionRefusedError(f"Capture exhausted, cannot replay {host}:{port}")
+            self._next = 0
+            self._started = None
+
+        session = self.sessions[self._next]
+        self._next += 1
+
+        loop = asyncio.get_running_loop()
+        if self._started is None:
+            self._started = loop.time() - session.offset / (self.speed or 1.0)
+        if self.speed is not None:
+            delay = self._started + session.offset / self.speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return ReplayConnection(session, self.speed)
@@ -0,0 +1,59 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from _typeshed import Incomplete
+
+from .transport import FrameConnection, FrameTransport
+
+"""
+This type stub file was generated by pyright.
+"""
+LOGGER: Incomplete
+CAPTURE_MAGIC: bytes
+KIND_CONNECT: bytes
+KIND_SEND: bytes
+KIND_FRAME: bytes
+
+@dataclass
+class CaptureRecord:
+    kind: bytes
+    offset: float
+    payload: bytes
+    connection: int = ...
+
+def read_capture(path: Path | str) -> Iterator[CaptureRecord]: ...
+
+class RecordingConnection:
+    inner: FrameConnection
+    recorder: RecordingTransport
+    connection_id: int
+    def __init__(
+        self, inner: FrameConnection, recorder: RecordingTransport, connection_id: int = ...
+    ) -> None: ...
+    async def send(self, data: bytes) -> None: ...
+    async def read_frame(self) -> bytes: ...
+    async def close(self) -> None: ...
+
+class RecordingTransport:
+    path: Path
+    inner: FrameTransport
+    def __init__(self, path: Path | str, inner: FrameTransport | None = ...) -> None: ...
+    def record(self, kind: bytes, payload: bytes, connection: int = ...) -> None: ...
+    async def connect(self, host: str, port: int) -> RecordingConnection: ...
+    def close(self) -> None: ...
+
+class ReplayConnection:
+    async def send(self, data: bytes) -> None: ...
+    async def read_frame(self) -> bytes: ...
+    async def close(self) -> None: ...
+
+class ReplayTransport:
+    speed: float | None
+    loop: bool
+    def __init__(self, path: Path | str, speed: float | None = ..., loop: bool = ...) -> None: ...
+    async def connect(self, host: str, port: int) -> ReplayConnection: ...
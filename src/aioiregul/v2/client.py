@@ -8,26 +8,64 @@ End-users can optionally supply a configuration dictionary skeleton (keys only,
 no values) to the constructor. When present, the client will issue the faster
 501 command and merge the returned values into the provided skeleton before
 mapping to typed models.
+
+The skeleton is refreshed with a new 502 when it becomes stale: either because
+``skeleton_refresh_interval`` elapsed, or because a 501 response referenced a
+group, index or field the skeleton does not know about (e.g. a zone or Modbus
+register added on the device). At most one 502 is in flight per client.
+
+Concurrent ``get_data`` calls on the same client share a single request, and an
+optional ``max_age`` lets callers reuse the last mapped frame without any I/O.
+
+With a ``skeleton_directory``, the skeleton is persisted per device and loaded
+back before the first poll, so that a restarted service resumes with 501 polls
+instead of sending a 502 to every device.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
+import hashlib
 import logging
 import os
-
-from dotenv import load_dotenv
-
-from ..iregulapi import IRegulApiInterface, split_host_port
-from .decoder import DecodedFrame, ValueType, decode_text
-from .mappers import MappedFrame, map_frame
-
-# Load environment variables from .env file
-load_dotenv()
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from dataclasses import replace
+from datetime import timedelta
+
+from ..iregulapi import IRegulApiInterface, TimingsHook, split_host_port, track_timings
+from ..models import Timings
+from .decoder import (
+    DecodedFrame,
+    ValueType,
+    decode_segments,
+    decode_text,
+    split_frame,
+    split_groups,
+)
+from .limiter import RateLimiter
+from .mappers import MappedFrame, map_frame, remap_groups
+from .skeleton import (
+    SkeletonDirectory,
+    SkeletonStore,
+    dump_skeleton,
+    is_binary_skeleton,
+    load_skeleton,
+    skeleton_from_json,
+    skeleton_to_json,
+)
+from .transport import FrameConnection, FrameTransport, ProtocolTransport
 
 LOGGER = logging.getLogger(__name__)
 
+# Fields whose values change at runtime and are never cached in the skeleton
+_DYNAMIC_FIELDS = frozenset({"valeur", "resultat", "etat", "mode", "mode_select"})
+# Groups that are never cached in the skeleton
+_EXCLUDED_GROUPS = frozenset({"mem", "P", "J"})
+# Sentinel for fields missing from the skeleton
+_MISSING = object()
+
 
 def _get_env(key: str, default: str | None = None) -> str:
     """Get environment variable with optional default."""
@@ -48,11 +86,20 @@ class IRegulClient(IRegulApiInterface):
         password: str | None = None,
         timeout: float = 60.0,
         config_skeleton: dict[str, dict[int, dict[str, ValueType]]] | None = None,
+        skeleton_refresh_interval: timedelta | None = None,
+        refresh_on_unknown_keys: bool = True,
+        max_age: timedelta | None = None,
+        transport: FrameTransport | None = None,
+        timings_hook: TimingsHook | None = None,
+        skeleton_store: SkeletonStore | None = None,
+        skeleton_directory: SkeletonDirectory | None = None,
+        rate_limiter: RateLimiter | None = None,
     ):
         """
         Initialize IRegul socket client.
 
-        Configuration is loaded from environment variables if not provided as arguments:
+        Configuration is read from environment variables if not provided as arguments
+        (use :func:`aioiregul.iregulapi.load_env` to load them from a ``.env`` file):
         - IREGUL_HOST (default: i-regul.fr)
         - IREGUL_PORT (default: 443)
         - IREGUL_DEVICE_ID (required if not provided)
@@ -70,38 +117,95 @@ class IRegulClient(IRegulApiInterface):
             timeout: Default timeout for socket operations in seconds
             config_skeleton: Configuration dictionary without values, structured
                 as {group: {index: {field_name: ""}}}
+            skeleton_refresh_interval: Maximum age of the skeleton before the next
+                poll re-fetches it with 502. None disables time-based refreshes.
+            refresh_on_unknown_keys: Whether a 501 response containing a group,
+                index or field missing from the skeleton schedules a 502 refresh.
+            max_age: How long the last mapped frame is served by ``get_data``
+                without contacting the device. None always polls the device.
+            transport: Socket transport used to exchange frames. Defaults to
+                :class:`~aioiregul.v2.transport.ProtocolTransport`, which has no
+                frame size limit.
+            timings_hook: Optional callback receiving the per-phase
+                :class:`~aioiregul.models.Timings` of every operation,
+                including failed ones.
+            skeleton_store: Optional store shared between clients; the skeleton
+                is deduplicated against it so that devices with identical
+                configurations reference a single copy.
+            skeleton_directory: Optional directory persisting the skeleton.
+                Unless ``config_skeleton`` is given, the stored skeleton is
+                loaded before the first poll, keeping its age for
+                ``skeleton_refresh_interval``. Skeleton updates are saved
+                back with write coalescing.
+            rate_limiter: Optional limiter shared between clients, bounding
+                the concurrency and rate of each command sent to a host.
 
         Raises:
             ValueError: If required environment variables are missing
         """
         raw_host = host or os.getenv("IREGUL_HOST", "i-regul.fr")
         raw_port = port or int(os.getenv("IREGUL_PORT", "443"))
-        self.host, self.port = split_host_port(raw_host, raw_port)  # type: ignore[assignment]
+        self.host, split_port = split_host_port(raw_host, raw_port)
+        # The port embedded in the host wins over the explicit or default one
+        self.port: int = raw_port if split_port is None else split_port
         self.device_id = device_id or _get_env("IREGUL_DEVICE_ID")
         self.password = password or _get_env("IREGUL_PASSWORD_V2")
         self.timeout = timeout
-        self.config_skeleton: dict[str, dict[int, dict[str, ValueType]]] | None = config_skeleton
-
-    async def _send_command(
-        self, command: str
-    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.transport: FrameTransport = transport or ProtocolTransport()
+        self.timings_hook = timings_hook
+        self.rate_limiter = rate_limiter
+        self.skeleton_store = skeleton_store
+        self.skeleton_directory = skeleton_directory
+        self.config_skeleton: dict[str, dict[int, dict[str, ValueType]]] | None = (
+            self._intern(config_skeleton) if config_skeleton is not None else None
+        )
+        self.skeleton_refresh_interval = skeleton_refresh_interval
+        self.refresh_on_unknown_keys = refresh_on_unknown_keys
+
+        # Monotonic time of the last skeleton (re)load, used for the refresh cadence
+        self._skeleton_loaded_at: float | None = (
+            time.monotonic() if config_skeleton is not None else None
+        )
+        self._skeleton_stale = False
+        # Whether the persisted skeleton still has to be loaded
+        self._warm_start_pending = skeleton_directory is not None and config_skeleton is None
+        # Set by merges that wrote to the skeleton
+        self._skeleton_changed = False
+        # Serializes 502 requests so a device never has more than one in flight
+        self._full_refresh_lock = asyncio.Lock()
+
+        self.max_age = max_age
+        self._last_frame: MappedFrame | None = None
+        self._last_frame_at: float | None = None
+        # Digest and group segments of the payload of the last NEW 501 frame,
+        # to skip unchanged frames and groups
+        self._last_payload_digest: bytes | None = None
+        self._last_segments: tuple[str, dict[str, str]] | None = None
+        # Poll shared by concurrent get_data callers
+        self._inflight: asyncio.Future[MappedFrame] | None = None
+        # Callers waiting for _inflight
+        self._inflight_waiters = 0
+
+    async def _send_command(self, command: str, timings: Timings) -> FrameConnection:
         """Open connection and send command to device.
 
         Args:
             command: Command code to send (e.g., "501", "502", "203")
+            timings: Timings receiving the ``connect`` and ``send`` phases
 
         Returns:
-            Tuple of (reader, writer) for further communication
+            Open frame connection for further communication
 
         Raises:
             TimeoutError: If connection timeout occurs
             ConnectionError: If unable to connect to device
         """
         try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self.host, self.port, limit=100000),
-                timeout=self.timeout,
-            )
+            with timings.measure("connect"):
+                connection = await asyncio.wait_for(
+                    self.transport.connect(self.host, self.port),
+                    timeout=self.timeout,
+                )
         except TimeoutError as e:
             raise TimeoutError(f"Connection timeout to {self.host}:{self.port}") from e
         except (ConnectionRefusedError, OSError) as e:
@@ -109,10 +213,38 @@ class IRegulClient(IRegulApiInterface):
 
         message = f"cdraminfo{self.device_id}{self.password}{{{command}#}}"
         LOGGER.debug(f"Sending command {command} to device {self.device_id}")
-        writer.write(message.encode("utf-8"))
-        await writer.drain()
+        with timings.measure("send"):
+            await connection.send(message.encode("utf-8"))
+
+        return connection
+
+    @contextlib.asynccontextmanager
+    async def _command(
+        self, command: str, timings: Timings
+    ) -> AsyncGenerator[FrameConnection, None]:
+        """Send a command and close its connection on exit.
 
-        return reader, writer
+        With a rate limiter, the request first waits for its budget, recorded
+        as the ``queue`` phase, and holds its slot until the connection closes.
+
+        Args:
+            command: Command code to send (e.g., "501", "502", "203")
+            timings: Timings receiving the ``queue``, ``connect`` and ``send`` phases
+
+        Yields:
+            Open frame connection for further communication
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            if self.rate_limiter is not None:
+                waited = await stack.enter_async_context(
+                    self.rate_limiter.acquire(f"{self.host}:{self.port}", command)
+                )
+                timings.add("queue", int(waited * 1e9))
+            connection = await self._send_command(command, timings)
+            try:
+                yield connection
+            finally:
+                await connection.close()
 
     async def defrost(self) -> bool:
         """
@@ -128,34 +260,43 @@ class IRegulClient(IRegulApiInterface):
             ConnectionError: If unable to connect to device
             ValueError: If response format is invalid
         """
-        reader, writer = await self._send_command("203")
-
-        try:
-            # Read response
-            response = await asyncio.wait_for(reader.readuntil(b"}"), timeout=self.timeout)
-            response_text = response.decode("utf-8")
-            LOGGER.debug(f"Received defrost response: {response_text}")
-
-            # Check for success indication in response
-            return "defrost_ok" in response_text.lower()
-        finally:
-            writer.close()
-            await writer.wait_closed()
+        with track_timings("defrost", self.timings_hook) as timings:
+            async with self._command("203", timings) as connection:
+                # Read response
+                with timings.measure("wait_response"):
+                    response = await asyncio.wait_for(connection.read_frame(), timeout=self.timeout)
+                timings.bytes_received += len(response)
+                response_text = response.decode("utf-8")
+                LOGGER.debug(f"Received defrost response: {response_text}")
+
+                # Check for success indication in response
+                return "defrost_ok" in response_text.lower()
 
     async def get_data(self) -> MappedFrame | None:
         """
         Retrieve device data using 502 (full) or 501 (values-only).
 
         Behavior:
-        - If `config_skeleton` is not provided: issues 502 (full data) and maps.
-        - If `config_skeleton` is provided: issues 501 (values-only), merges the
-          returned values into the skeleton, then maps.
+        - If no skeleton is available, or the skeleton is stale: issues 502
+          (full data), rebuilds the skeleton from it and maps.
+        - Otherwise: issues 501 (values-only), merges the returned values into
+          the skeleton, then maps.
+
+        Concurrent callers share the in-flight request and receive the same
+        MappedFrame instance, as do callers served from the ``max_age`` cache:
+        treat it as read-only and copy it before modifying it. Cancelling a
+        caller does not cancel the shared request while other callers wait for
+        it; once every caller is cancelled, the request is cancelled too,
+        releasing its connection and rate limiter slot. When ``max_age`` is
+        set, a frame younger than it is returned without contacting the device.
+
+        The returned frame carries the per-phase latency of the request that
+        produced it in ``MappedFrame.timings`` (phases ``connect``, ``send``,
+        ``wait_old``, ``wait_new``, ``decode``, ``merge`` and ``map``, plus
+        ``queue`` with a rate limiter).
 
         The device_id is set during client initialization via IREGUL_DEVICE_ID env var.
 
-        Args:
-            timeout: Maximum time in seconds to wait for response (default: 60)
-
         Returns:
             MappedFrame containing the typed device data. Signature allows
             None for interface compatibility.
@@ -165,37 +306,406 @@ class IRegulClient(IRegulApiInterface):
             ConnectionError: If unable to connect to device
             ValueError: If response format is invalid
         """
-        # Choose command based on presence of a config skeleton
-        cmd = "501" if self.config_skeleton is not None else "502"
-        reader, writer = await self._send_command(cmd)
+        cached = self._cached_frame()
+        if cached is not None:
+            LOGGER.debug(f"Serving cached frame for device {self.device_id}")
+            return cached
+
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._poll())
+            self._inflight.add_done_callback(self._on_poll_done)
+            self._inflight_waiters = 0
+        else:
+            LOGGER.debug(f"Joining in-flight request for device {self.device_id}")
+
+        inflight = self._inflight
+        self._inflight_waiters += 1
+        try:
+            # Shield so that one cancelled caller does not cancel the shared poll
+            return await asyncio.shield(inflight)
+        finally:
+            if inflight is self._inflight:
+                self._inflight_waiters -= 1
+                if not self._inflight_waiters and not inflight.done():
+                    LOGGER.debug(f"Every caller left, cancelling poll of {self.device_id}")
+                    inflight.cancel()
+
+    async def _poll(self) -> MappedFrame:
+        """Run one data request with the appropriate command."""
+        with track_timings("get_data", self.timings_hook) as timings:
+            async with self._data_command() as cmd:
+                return await self._fetch_frame(cmd, timings)
+
+    def _on_poll_done(self, future: asyncio.Future[MappedFrame]) -> None:
+        """Release the shared poll once it completes."""
+        self._inflight = None
+        if not future.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            future.exception()
+
+    def _cached_frame(self) -> MappedFrame | None:
+        """Return the last frame if it is younger than ``max_age``."""
+        if self.max_age is None or self._last_frame is None or self._last_frame_at is None:
+            return None
+        if time.monotonic() - self._last_frame_at >= self.max_age.total_seconds():
+            return None
+        return self._last_frame
+
+    async def stream_data(self) -> AsyncIterator[MappedFrame]:
+        """Yield the OLD snapshot as soon as it arrives, then the fresh NEW frame.
+
+        The server answers a data command with the last known snapshot (OLD)
+        before refreshing from the device, which can take several seconds.
+        This generator maps and yields each OLD frame right away, then yields
+        the NEW frame read over the same connection and stops.
+
+        OLD frames are merged against the skeleton without updating it; only
+        the NEW frame refreshes the cached values and the ``max_age`` cache.
+        Unlike ``get_data``, each call opens its own connection.
+
+        The frames are read in the background: the connection, the 502 lock
+        and the rate limiter slot are released as soon as the NEW frame is
+        read, however slowly the caller iterates. A caller lagging behind
+        skips the OLD snapshots already superseded by a newer frame. Closing
+        the generator before the NEW frame (``aclose()``) stops the read.
+
+        Yields:
+            MappedFrame instances: zero or more with ``is_old=True`` followed
+            by exactly one NEW frame. Each carries a snapshot of the stream
+            timings at the time it was yielded.
+
+        Raises:
+            asyncio.TimeoutError: If the NEW frame is not received within timeout
+            ConnectionError: If unable to connect to device
+            ValueError: If response format is invalid
+
+        Example:
+            >>> async for frame in client.stream_data():
+            ...     render(frame)  # OLD first, then NEW
+        """
+        with track_timings("stream_data", self.timings_hook) as timings:
+            # Frames are read by a separate task so that a slow consumer never
+            # holds the connection, the 502 lock or the rate limiter slot
+            queue: asyncio.Queue[MappedFrame | None] = asyncio.Queue(maxsize=2)
+            closed = asyncio.Event()
+            reader = asyncio.ensure_future(self._stream_frames(timings, queue, closed))
+            try:
+                while (frame := await queue.get()) is not None:
+                    yield frame
+            except BaseException:
+                # Closed or cancelled before the NEW frame: stop reading. The
+                # flag also stops a reader whose cancellation was lost because
+                # its read completed at the same time.
+                closed.set()
+                reader.cancel()
+                with contextlib.suppress(BaseException):
+                    await reader
+                raise
+            await reader
+
+    async def _stream_frames(
+        self,
+        timings: Timings,
+        queue: asyncio.Queue[MappedFrame | None],
+        closed: asyncio.Event,
+    ) -> None:
+        """Read and map the frames of one data command into ``queue``, then None.
+
+        The queue holds at most two items: when the consumer lags behind, the
+        oldest pending frame, always an OLD snapshot superseded by the newer
+        frame, is dropped.
+
+        Args:
+            timings: Timings receiving every phase of the request.
+            queue: Queue receiving the mapped frames, then None.
+            closed: Set once the consumer is gone; reading stops.
+        """
+
+        def publish(frame: MappedFrame | None) -> None:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
 
         try:
+            async with (
+                self._data_command() as cmd,
+                self._command(cmd, timings) as connection,
+            ):
+                deadline = asyncio.get_event_loop().time() + self.timeout
+                while not closed.is_set():
+                    response = await self._read_frame(connection, deadline, timings)
+                    if response.startswith("OLD"):
+                        publish(
+                            await self._map_response(cmd, response, timings, update_skeleton=False)
+                        )
+                        continue
+                    publish(await self._map_response(cmd, response, timings))
+                    return
+        finally:
+            publish(None)
+
+    def skeleton_needs_refresh(self) -> bool:
+        """Return whether the next poll should re-fetch the skeleton with 502.
+
+        Returns:
+            True if no skeleton is loaded, it was invalidated, or it is older
+            than ``skeleton_refresh_interval``.
+        """
+        if self.config_skeleton is None or self._skeleton_stale:
+            return True
+        if self.skeleton_refresh_interval is None or self._skeleton_loaded_at is None:
+            return False
+        age = time.monotonic() - self._skeleton_loaded_at
+        return age >= self.skeleton_refresh_interval.total_seconds()
+
+    def invalidate_skeleton(self) -> None:
+        """Mark the skeleton as stale so the next poll refreshes it with 502."""
+        self._skeleton_stale = True
+
+    @contextlib.asynccontextmanager
+    async def _data_command(self) -> AsyncGenerator[str, None]:
+        """Select the data command for the next poll.
+
+        Holds the full-refresh lock for the duration of a 502 so that a device
+        never has more than one 502 in flight.
+
+        Yields:
+            "502" when the skeleton needs a refresh, "501" otherwise.
+        """
+        await self._warm_start()
+        if self.skeleton_needs_refresh():
+            async with self._full_refresh_lock:
+                # Another caller may have refreshed the skeleton while we waited
+                if self.skeleton_needs_refresh():
+                    yield "502"
+                    return
+        yield "501"
+
+    async def _warm_start(self) -> None:
+        """Load the skeleton persisted for this device, once, before the first poll."""
+        if not self._warm_start_pending or self.skeleton_directory is None:
+            return
+        self._warm_start_pending = False
+        record = await asyncio.to_thread(self.skeleton_directory.load, self.device_id)
+        # A skeleton may have been loaded or fetched while reading the file
+        if record is None or self.config_skeleton is not None:
+            return
+        LOGGER.debug(
+            f"Loaded persisted skeleton of device {self.device_id} ({record.age:.0f}s old)"
+        )
+        self.config_skeleton = self._intern(record.skeleton)
+        self._skeleton_loaded_at = time.monotonic() - record.age
+        self._skeleton_stale = False
+        self._last_payload_digest = None
+        self._last_segments = None
+
+    def _persist_skeleton(self, confirmed: bool = False) -> None:
+        """Schedule the current skeleton to be written to the skeleton directory.
+
+        Args:
+            confirmed: Whether a 502 just returned the skeleton, which resets
+                its stored age even when its content is unchanged.
+        """
+        if self.skeleton_directory is not None and self.config_skeleton is not None:
+            self.skeleton_directory.save(self.device_id, self.config_skeleton, confirmed)
+
+    async def _fetch_frame(self, cmd: str, timings: Timings) -> MappedFrame:
+        """Issue a data command and map the NEW frame it returns.
+
+        Args:
+            cmd: Data command to send ("501" or "502").
+            timings: Timings receiving every phase of the request.
+
+        Returns:
+            MappedFrame containing the typed device data.
+        """
+        async with self._command(cmd, timings) as connection:
             # Read responses until we get the NEW format (skip OLD)
-            new_response = await self._read_new_response(reader, timeout=self.timeout)
+            new_response = await self._read_new_response(
+                connection, timeout=self.timeout, timings=timings
+            )
             LOGGER.debug(f"Received NEW response: {len(new_response)} bytes")
+            return await self._map_response(cmd, new_response, timings)
 
-            # Decode the response
-            decoded = await decode_text(new_response)
-            LOGGER.debug(f"Decoded frame with timestamp: {decoded.timestamp}")
+    async def _map_response(
+        self, cmd: str, response: str, timings: Timings, update_skeleton: bool = True
+    ) -> MappedFrame:
+        """Decode a response frame, merge it into the skeleton and map it.
+
+        A 502 response rebuilds the skeleton from scratch so that entries removed
+        or renamed on the device are dropped. A 501 response is merged into the
+        existing skeleton and checked for keys the skeleton does not know.
+
+        A NEW 501 response whose payload is identical to the previous one, as
+        when the device sits idle, is not decoded: the previous frame is
+        reused with the timestamp of the new header. Otherwise, only the
+        groups whose tokens changed since the previous 501 response are
+        decoded, merged and mapped again.
+
+        Args:
+            cmd: Data command the response answers ("501" or "502").
+            response: Raw frame text.
+            timings: Timings receiving the ``decode``, ``merge`` and ``map``
+                phases; a snapshot is attached to the returned frame.
+            update_skeleton: Whether the frame refreshes the cached skeleton.
+                False for OLD snapshots, which are superseded by the NEW frame.
 
-            # Initialize skeleton if not present
-            if self.config_skeleton is None:
-                self.config_skeleton = {}
+        Returns:
+            MappedFrame containing the typed device data.
+        """
+        previous = self._last_frame if update_skeleton and cmd == "501" else None
+        # Everything from the opening brace on, i.e. the payload without the header
+        payload = response[response.find("{") :]
+        digest = hashlib.blake2b(payload.encode(), digest_size=16).digest()
+        if previous is not None and digest == self._last_payload_digest:
+            LOGGER.debug(f"Payload unchanged for device {self.device_id}, reusing last frame")
+            with timings.measure("decode"):
+                is_old, timestamp, _ = split_frame(response)
+            mapped = replace(previous, is_old=is_old, timestamp=timestamp)
+            return self._remember_frame(mapped, timings, digest, self._last_segments)
+
+        segments: tuple[str, dict[str, str]] | None = None
+        if update_skeleton and cmd == "501":
+            with timings.measure("decode"):
+                segments = split_groups(payload[1 : payload.rfind("}")])
+            if previous is not None:
+                mapped = self._map_changed_groups(previous, response, segments, timings)
+                if mapped is not None:
+                    return self._remember_frame(mapped, timings, digest, segments)
+
+        with timings.measure("decode"):
+            decoded = await decode_text(response)
+        LOGGER.debug(f"Decoded frame with timestamp: {decoded.timestamp}")
+
+        with timings.measure("merge"):
+            if cmd == "502" or self.config_skeleton is None:
+                skeleton: dict[str, dict[int, dict[str, ValueType]]] = {}
+            else:
+                skeleton = self.config_skeleton
+                if update_skeleton:
+                    self._check_unknown_keys(skeleton, decoded.groups)
 
             # Merge values into skeleton (handles both initial creation and updates)
-            merged_groups = self._merge_values_into_skeleton(self.config_skeleton, decoded.groups)
-            merged_frame = DecodedFrame(
-                is_old=decoded.is_old,
-                timestamp=decoded.timestamp,
-                count=decoded.count,
-                is_keepalive=decoded.is_keepalive,
-                message_type=decoded.message_type,
-                groups=merged_groups,
+            self._skeleton_changed = False
+            merged_groups = self._merge_values_into_skeleton(
+                skeleton, decoded.groups, update_cache=update_skeleton
             )
-            return map_frame(merged_frame)
-        finally:
-            writer.close()
-            await writer.wait_closed()
+            if update_skeleton and skeleton is not self.config_skeleton:
+                self.config_skeleton = self._intern(skeleton)
+                self._skeleton_loaded_at = time.monotonic()
+                self._skeleton_stale = False
+                self._persist_skeleton(confirmed=True)
+            elif self._skeleton_changed:
+                self._persist_skeleton()
+
+        merged_frame = DecodedFrame(
+            is_old=decoded.is_old,
+            timestamp=decoded.timestamp,
+            count=decoded.count,
+            is_keepalive=decoded.is_keepalive,
+            message_type=decoded.message_type,
+            groups=merged_groups,
+        )
+        with timings.measure("map"):
+            mapped = map_frame(merged_frame)
+        if not update_skeleton:
+            mapped.timings = replace(timings, phases=dict(timings.phases))
+            return mapped
+        # Only 501 payloads are compared: a 502 always rebuilds the skeleton
+        if cmd == "501":
+            return self._remember_frame(mapped, timings, digest, segments)
+        return self._remember_frame(mapped, timings, None, None)
+
+    def _map_changed_groups(
+        self,
+        previous: MappedFrame,
+        response: str,
+        segments: tuple[str, dict[str, str]],
+        timings: Timings,
+    ) -> MappedFrame | None:
+        """Decode, merge and map only the groups whose segment changed.
+
+        Groups whose tokens are identical to the previous 501 response keep
+        their previously mapped objects. This is valid because the skeleton
+        entries of a group only change when that group is merged.
+
+        Args:
+            previous: Frame mapped from the previous 501 response.
+            response: Raw frame text.
+            segments: Type marker and group segments of the response payload.
+            timings: Timings receiving the ``decode``, ``merge`` and ``map`` phases.
+
+        Returns:
+            The updated frame, or None when the responses differ by more than
+            their group contents (type marker or set of groups) and the frame
+            must be decoded in full.
+        """
+        marker, groups = segments
+        if self._last_segments is None or self.config_skeleton is None:
+            return None
+        previous_marker, previous_groups = self._last_segments
+        if marker != previous_marker or groups.keys() != previous_groups.keys():
+            return None
+        changed = {
+            group: tokens for group, tokens in groups.items() if tokens != previous_groups[group]
+        }
+        LOGGER.debug(f"Device {self.device_id} changed groups: {', '.join(changed)}")
+
+        with timings.measure("decode"):
+            is_old, timestamp, _ = split_frame(response)
+            values = decode_segments(changed)
+
+        with timings.measure("merge"):
+            skeleton = self.config_skeleton
+            self._check_unknown_keys(skeleton, values)
+            # Merge into the cached groups only; replaced or new groups are copied back
+            touched = {group: skeleton[group] for group in values if group in skeleton}
+            self._skeleton_changed = False
+            merged_groups = self._merge_values_into_skeleton(touched, values)
+            skeleton.update(touched)
+            if self._skeleton_changed:
+                self._persist_skeleton()
+
+        with timings.measure("map"):
+            return remap_groups(previous, merged_groups, is_old=is_old, timestamp=timestamp)
+
+    def _check_unknown_keys(
+        self,
+        skeleton: dict[str, dict[int, dict[str, ValueType]]],
+        values: dict[str, dict[int, dict[str, ValueType]]],
+    ) -> None:
+        """Schedule a skeleton refresh if ``values`` has keys the skeleton lacks."""
+        if self.refresh_on_unknown_keys and self._has_unknown_keys(skeleton, values):
+            LOGGER.info(
+                f"Device {self.device_id} reported unknown configuration keys, "
+                "scheduling skeleton refresh"
+            )
+            self._skeleton_stale = True
+
+    def _remember_frame(
+        self,
+        mapped: MappedFrame,
+        timings: Timings,
+        digest: bytes | None,
+        segments: tuple[str, dict[str, str]] | None,
+    ) -> MappedFrame:
+        """Attach the timings to a NEW frame and keep it for the next polls.
+
+        Args:
+            mapped: Frame mapped from the response.
+            timings: Timings of the request; a snapshot is attached to the frame.
+            digest: Payload digest of a 501 response, None otherwise.
+            segments: Group segments of a 501 response, None otherwise.
+
+        Returns:
+            The frame itself.
+        """
+        mapped.timings = replace(timings, phases=dict(timings.phases))
+        self._last_frame = mapped
+        self._last_frame_at = time.monotonic()
+        self._last_payload_digest = digest
+        self._last_segments = segments
+        return mapped
 
     async def check_auth(self) -> bool:
         """Check if credentials are valid.
@@ -210,49 +720,53 @@ class IRegulClient(IRegulApiInterface):
             asyncio.TimeoutError: If response not received within timeout period
             ConnectionError: If unable to connect to device
         """
-        reader, writer = await self._send_command("501")
-
-        try:
-            # Read first response - should be OLD frame if auth is valid
-            try:
-                frame = await asyncio.wait_for(
-                    reader.readuntil(b"}"),
-                    timeout=self.timeout,
-                )
-            except asyncio.IncompleteReadError as e:
-                LOGGER.error(f"Incomplete response during auth check: {e}")
-                return False
-            except asyncio.LimitOverrunError as e:
-                LOGGER.error(f"Response too large during auth check: {e}")
+        with track_timings("check_auth", self.timings_hook) as timings:
+            async with self._command("501", timings) as connection:
+                # Read first response - should be OLD frame if auth is valid
+                try:
+                    with timings.measure("wait_old"):
+                        frame = await asyncio.wait_for(
+                            connection.read_frame(),
+                            timeout=self.timeout,
+                        )
+                except asyncio.IncompleteReadError as e:
+                    LOGGER.error(f"Incomplete response during auth check: {e}")
+                    return False
+                except asyncio.LimitOverrunError as e:
+                    LOGGER.error(f"Response too large during auth check: {e}")
+                    return False
+
+                if not frame:
+                    LOGGER.error("Empty response during auth check")
+                    return False
+
+                timings.bytes_received += len(frame)
+                response_text = frame.decode("utf-8")
+                LOGGER.debug(f"Received auth check response: {response_text[:50]}...")
+
+                # Check if this is an OLD format response (indicates successful auth)
+                if response_text.startswith("OLD"):
+                    LOGGER.debug("Auth check successful (OLD frame received)")
+                    return True
+
+                LOGGER.warning("Auth check failed (no OLD frame received)")
                 return False
 
-            if not frame:
-                LOGGER.error("Empty response during auth check")
-                return False
-
-            response_text = frame.decode("utf-8")
-            LOGGER.debug(f"Received auth check response: {response_text[:50]}...")
-
-            # Check if this is an OLD format response (indicates successful auth)
-            if response_text.startswith("OLD"):
-                LOGGER.debug("Auth check successful (OLD frame received)")
-                return True
-
-            LOGGER.warning("Auth check failed (no OLD frame received)")
-            return False
-        finally:
-            writer.close()
-            await writer.wait_closed()
-
-    async def _read_new_response(self, reader: asyncio.StreamReader, timeout: float = 60.0) -> str:
+    async def _read_new_response(
+        self,
+        connection: FrameConnection,
+        timeout: float = 60.0,
+        timings: Timings | None = None,
+    ) -> str:
         """
         Read socket responses until NEW format is received.
 
         Reads complete frames (ending with '}') and skips OLD format responses.
 
         Args:
-            reader: The asyncio stream reader
+            connection: Open frame connection
             timeout: Maximum time to wait for complete NEW response
+            timings: Optional timings receiving the ``wait_old``/``wait_new`` phases
 
         Returns:
             The NEW format response as a string
@@ -262,28 +776,11 @@ class IRegulClient(IRegulApiInterface):
             ValueError: If invalid response format received
         """
         deadline = asyncio.get_event_loop().time() + timeout
+        if timings is None:
+            timings = Timings("read_new_response")
 
         while True:
-            remaining_time = deadline - asyncio.get_event_loop().time()
-            if remaining_time <= 0:
-                raise TimeoutError("Timeout waiting for NEW response")
-
-            try:
-                # Read until end of frame marker
-                frame = await asyncio.wait_for(
-                    reader.readuntil(b"}"),
-                    timeout=remaining_time,
-                )
-            except asyncio.IncompleteReadError as e:
-                raise ValueError(f"Incomplete response from device: {e}") from e
-            except asyncio.LimitOverrunError as e:
-                raise ValueError(f"Response too large or invalid format: {e}") from e
-
-            if not frame:
-                raise ValueError("Empty response from device")
-
-            response_text = frame.decode("utf-8")
-            LOGGER.debug(f"Received frame: {response_text[:50]}...")
+            response_text = await self._read_frame(connection, deadline, timings)
 
             # Check if this is the NEW format (not starting with OLD)
             if not response_text.startswith("OLD"):
@@ -291,10 +788,59 @@ class IRegulClient(IRegulApiInterface):
 
             LOGGER.debug("Skipping OLD format response, waiting for NEW...")
 
+    async def _read_frame(
+        self, connection: FrameConnection, deadline: float, timings: Timings
+    ) -> str:
+        """Read a single complete frame (ending with '}') before the deadline.
+
+        The wait is recorded as ``wait_old`` or ``wait_new`` depending on the
+        frame received, and the frame size is added to ``bytes_received``.
+
+        Args:
+            connection: Open frame connection
+            deadline: Event loop time by which the frame must be received
+            timings: Timings receiving the wait phase and byte count
+
+        Returns:
+            The frame as a string
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+            ValueError: If invalid response format received
+        """
+        remaining_time = deadline - asyncio.get_event_loop().time()
+        if remaining_time <= 0:
+            raise TimeoutError("Timeout waiting for NEW response")
+
+        start = time.perf_counter_ns()
+        try:
+            # Read until end of frame marker
+            frame = await asyncio.wait_for(
+                connection.read_frame(),
+                timeout=remaining_time,
+            )
+        except asyncio.IncompleteReadError as e:
+            raise ValueError(f"Incomplete response from device: {e}") from e
+        except asyncio.LimitOverrunError as e:
+            raise ValueError(f"Response too large or invalid format: {e}") from e
+
+        if not frame:
+            raise ValueError("Empty response from device")
+
+        timings.bytes_received += len(frame)
+        timings.add(
+            "wait_old" if frame.startswith(b"OLD") else "wait_new",
+            time.perf_counter_ns() - start,
+        )
+        response_text = frame.decode("utf-8")
+        LOGGER.debug(f"Received frame: {response_text[:50]}...")
+        return response_text
+
     def _merge_values_into_skeleton(
         self,
         skeleton: dict[str, dict[int, dict[str, ValueType]]],
         values: dict[str, dict[int, dict[str, ValueType]]],
+        update_cache: bool = True,
     ) -> dict[str, dict[int, dict[str, ValueType]]]:
         """Merge values from a response into a configuration skeleton.
 
@@ -305,21 +851,22 @@ class IRegulClient(IRegulApiInterface):
 
         Dynamic fields (valeur, resultat, etat, mode, mode_select) are included
         in the merged result but not cached in the skeleton. Groups 'mem', 'P',
-        and 'J' are not cached.
+        and 'J' are not cached. Groups and entries shared through the
+        skeleton store are copied before being written to.
 
         Args:
             skeleton: Cached configuration dict {group: {index: {field: cached_value}}}.
             values: Decoded groups from a response {group: {index: {field: value}}}.
+            update_cache: Whether static values from the response are written
+                back into the skeleton.
 
         Returns:
             A merged groups dict {group: {index: {field: value}}} where fields
             present in the response override the cached values in the skeleton.
             Fields not present in the response keep their cached value.
         """
-        # Dynamic fields that should not be cached
-        dynamic_fields = {"valeur", "resultat", "etat", "mode", "mode_select"}
-        # Groups that should not be cached
-        excluded_groups = {"mem", "P", "J"}
+        dynamic_fields = _DYNAMIC_FIELDS
+        excluded_groups = _EXCLUDED_GROUPS
 
         merged: dict[str, dict[int, dict[str, ValueType]]] = {}
 
@@ -333,24 +880,88 @@ class IRegulClient(IRegulApiInterface):
 
         # Overlay values from the response and update skeleton cache
         for group, indexes in values.items():
-            if group not in merged:
-                merged[group] = {}
-            if group not in skeleton and group not in excluded_groups:
+            cache_group = update_cache and group not in excluded_groups
+            merged_group = merged.setdefault(group, {})
+            if cache_group and group not in skeleton:
                 skeleton[group] = {}
             for idx, fields in indexes.items():
-                if idx not in merged[group]:
-                    merged[group][idx] = {}
-                if group not in excluded_groups and idx not in skeleton[group]:
-                    skeleton[group][idx] = {}
+                # Always include in merged result
+                merged_group.setdefault(idx, {}).update(fields)
+                if not cache_group:
+                    continue
+
+                cached = skeleton[group].get(idx)
+                if cached is None:
+                    cached = self._writable_group(skeleton, group)[idx] = {}
+                    self._skeleton_changed = True
                 for name, val in fields.items():
-                    # Always include in merged result
-                    merged[group][idx][name] = val
-                    # Cache only non-dynamic fields in non-excluded groups
-                    if group not in excluded_groups and name not in dynamic_fields:
-                        skeleton[group][idx][name] = val
+                    # Cache only changed non-dynamic fields in non-excluded groups
+                    if name in dynamic_fields:
+                        continue
+                    current = cached.get(name, _MISSING)
+                    if current == val and type(current) is type(val):
+                        continue
+                    if self._is_shared(cached):
+                        # Copy-on-write: the entry becomes a per-device overlay
+                        cached = self._writable_group(skeleton, group)[idx] = dict(cached)
+                    cached[name] = val
+                    self._skeleton_changed = True
 
         return merged
 
+    def _intern(
+        self, skeleton: dict[str, dict[int, dict[str, ValueType]]]
+    ) -> dict[str, dict[int, dict[str, ValueType]]]:
+        """Deduplicate ``skeleton`` against the skeleton store, if any."""
+        if self.skeleton_store is None:
+            return skeleton
+        return self.skeleton_store.intern(skeleton)
+
+    def _is_shared(self, obj: object) -> bool:
+        """Tell whether ``obj`` is a canonical part of the skeleton store."""
+        return self.skeleton_store is not None and self.skeleton_store.is_shared(obj)
+
+    def _writable_group(
+        self, skeleton: dict[str, dict[int, dict[str, ValueType]]], group: str
+    ) -> dict[int, dict[str, ValueType]]:
+        """Return ``skeleton[group]``, replacing it by a private copy if shared."""
+        indexes = skeleton[group]
+        if self._is_shared(indexes):
+            indexes = skeleton[group] = dict(indexes)
+        return indexes
+
+    @staticmethod
+    def _has_unknown_keys(
+        skeleton: dict[str, dict[int, dict[str, ValueType]]],
+        values: dict[str, dict[int, dict[str, ValueType]]],
+    ) -> bool:
+        """Check whether decoded values reference keys missing from the skeleton.
+
+        Only cacheable keys are considered: excluded groups and dynamic fields
+        are never stored in the skeleton, so their absence is expected.
+
+        Args:
+            skeleton: Cached configuration dict {group: {index: {field: cached_value}}}.
+            values: Decoded groups from a response {group: {index: {field: value}}}.
+
+        Returns:
+            True if a group, index or static field is unknown to the skeleton.
+        """
+        for group, indexes in values.items():
+            if group in _EXCLUDED_GROUPS:
+                continue
+            cached_indexes = skeleton.get(group)
+            if cached_indexes is None:
+                return True
+            for idx, fields in indexes.items():
+                cached_fields = cached_indexes.get(idx)
+                if cached_fields is None:
+                    return True
+                for name in fields:
+                    if name not in _DYNAMIC_FIELDS and name not in cached_fields:
+                        return True
+        return False
+
     def save_skeleton(self) -> str:
         """Serialize the current configuration skeleton to a JSON string.
 
@@ -365,32 +976,44 @@ class IRegulClient(IRegulApiInterface):
         """
         if self.config_skeleton is None:
             raise ValueError("No skeleton available to save")
-        return json.dumps(self.config_skeleton)
+        return skeleton_to_json(self.config_skeleton)
 
-    def load_skeleton_from(self, skeleton_json: str) -> None:
-        """Deserialize a configuration skeleton from a JSON string.
+    def save_skeleton_binary(self) -> bytes:
+        """Serialize the current configuration skeleton to the binary format.
 
-        Restores the skeleton with proper conversion of string keys back to integers,
-        as JSON serialization converts dict keys to strings.
+        The binary format loads several times faster than JSON; see
+        :mod:`aioiregul.v2.skeleton`.
 
-        Args:
-            skeleton_json: JSON string representation of a skeleton.
+        Returns:
+            Binary representation of the config_skeleton.
 
         Raises:
-            ValueError: If the JSON is invalid or has incorrect structure.
+            ValueError: If no skeleton is available to save.
         """
-        try:
-            deserialized = json.loads(skeleton_json)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON format: {e}") from e
-
-        # Convert string keys back to integers for group indices
-        # JSON converts dict keys to strings, so we need to convert them back
-        skeleton: dict[str, dict[int, dict[str, ValueType]]] = {}
-        for group_key, group_data in deserialized.items():
-            if isinstance(group_data, dict):
-                skeleton[group_key] = {int(k): v for k, v in group_data.items()}  # type: ignore[typeddict-item]
-            else:
-                skeleton[group_key] = group_data  # type: ignore[typeddict-item]
+        if self.config_skeleton is None:
+            raise ValueError("No skeleton available to save")
+        return dump_skeleton(self.config_skeleton)
+
+    def load_skeleton_from(self, skeleton_json: str | bytes) -> None:
+        """Deserialize a configuration skeleton from JSON or the binary format.
+
+        JSON skeletons are restored with proper conversion of string keys back
+        to integers, as JSON serialization converts dict keys to strings. Data
+        produced by :meth:`save_skeleton_binary` is detected by its header.
 
-        self.config_skeleton = skeleton
+        Args:
+            skeleton_json: JSON string or binary representation of a skeleton.
+
+        Raises:
+            ValueError: If the data is invalid or has incorrect structure.
+        """
+        if is_binary_skeleton(skeleton_json):
+            skeleton = load_skeleton(skeleton_json)  # type: ignore[arg-type]
+        else:
+            skeleton = skeleton_from_json(skeleton_json)
+
+        self.config_skeleton = self._intern(skeleton)
+        self._skeleton_loaded_at = time.monotonic()
+        self._skeleton_stale = False
+        self._last_payload_digest = None
+        self._last_segments = None
@@ -2,11 +2,18 @@
 This type stub file was generated by pyright.
 """
 
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
 from _typeshed import Incomplete
 
 from ..iregulapi import IRegulApiInterface as IRegulApiInterface
+from ..iregulapi import TimingsHook
 from .decoder import ValueType as ValueType
+from .limiter import RateLimiter
 from .mappers import MappedFrame as MappedFrame
+from .skeleton import SkeletonDirectory, SkeletonStore
+from .transport import FrameTransport as FrameTransport
 
 """
 This type stub file was generated by pyright.
@@ -19,7 +26,15 @@ class IRegulClient(IRegulApiInterface):
     device_id: Incomplete
     password: Incomplete
     timeout: Incomplete
+    transport: FrameTransport
+    timings_hook: TimingsHook | None
+    rate_limiter: RateLimiter | None
+    skeleton_store: SkeletonStore | None
+    skeleton_directory: SkeletonDirectory | None
     config_skeleton: dict[str, dict[int, dict[str, ValueType]]] | None
+    skeleton_refresh_interval: Incomplete
+    refresh_on_unknown_keys: Incomplete
+    max_age: Incomplete
     def __init__(
         self,
         host: str | None = ...,
@@ -28,9 +43,21 @@ class IRegulClient(IRegulApiInterface):
         password: str | None = ...,
         timeout: float = ...,
         config_skeleton: dict[str, dict[int, dict[str, ValueType]]] | None = ...,
+        skeleton_refresh_interval: timedelta | None = ...,
+        refresh_on_unknown_keys: bool = ...,
+        max_age: timedelta | None = ...,
+        transport: FrameTransport | None = ...,
+        timings_hook: TimingsHook | None = ...,
+        skeleton_store: SkeletonStore | None = ...,
+        skeleton_directory: SkeletonDirectory | None = ...,
+        rate_limiter: RateLimiter | None = ...,
     ) -> None: ...
     async def defrost(self) -> bool: ...
     async def get_data(self) -> MappedFrame | None: ...
+    def stream_data(self) -> AsyncIterator[MappedFrame]: ...
+    def skeleton_needs_refresh(self) -> bool: ...
+    def invalidate_skeleton(self) -> None: ...
     async def check_auth(self) -> bool: ...
     def save_skeleton(self) -> str: ...
-    def load_skeleton_from(self, skeleton_json: str) -> None: ...
+    def save_skeleton_binary(self) -> bytes: ...
+    def load_skeleton_from(self, skeleton_json: str | bytes) -> None: ...
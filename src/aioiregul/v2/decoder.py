@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import asyncio
 import re
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -191,15 +192,15 @@ def _parse_payload(
     return count, message_type, groups
 
 
-async def decode_text(text: str) -> DecodedFrame:
-    """Asynchronously decode a raw IRegul frame string.
+def split_frame(text: str) -> tuple[bool, datetime, str]:
+    """Split a raw frame into its header fields and payload, without decoding it.
 
     Args:
         text: Raw text of the frame (with optional leading whitespace).
 
     Returns:
-        DecodedFrame with timestamp, old/new flag, token count, keepalive status,
-        and groups.
+        A tuple `(is_old, timestamp, payload)` where `payload` is the string
+        between the outer braces.
 
     Raises:
         ValueError: If the frame format is invalid.
@@ -213,7 +214,70 @@ async def decode_text(text: str) -> DecodedFrame:
     if end_brace_index < 0 or end_brace_index <= brace_index:
         raise ValueError("Missing closing '}' in frame")
 
-    payload = raw[brace_index + 1 : end_brace_index]
+    return is_old, ts, raw[brace_index + 1 : end_brace_index]
+
+
+def split_groups(payload: str) -> tuple[str, dict[str, str]]:
+    """Split a payload into its type marker and one token segment per group.
+
+    Segments let callers compare two frames group by group and only decode
+    the groups that changed. Tokens of a group are usually contiguous; when a
+    group appears in several places (e.g. ``mem``), its tokens are joined in
+    payload order.
+
+    Args:
+        payload: String between '{' and '}'.
+
+    Returns:
+        A tuple `(marker, segments)` where `marker` holds the elements that
+        are not tokens (typically the count) and `segments` maps each group to
+        its '#'-separated tokens, in order of first appearance.
+    """
+
+    marker: list[str] = []
+    tokens: dict[str, list[str]] = {}
+    for part in payload.split("#"):
+        at = part.find("@")
+        if at < 0:
+            marker.append(part)
+            continue
+        group = part[:at]
+        group_tokens = tokens.get(group)
+        if group_tokens is None:
+            tokens[group] = [part]
+        else:
+            group_tokens.append(part)
+    return "#".join(marker), {group: "#".join(parts) for group, parts in tokens.items()}
+
+
+def decode_segments(segments: Mapping[str, str]) -> dict[str, dict[int, dict[str, ValueType]]]:
+    """Decode group segments produced by :func:`split_groups`.
+
+    Args:
+        segments: Mapping of group to its '#'-separated tokens.
+
+    Returns:
+        Nested mapping of groups -> index -> field -> parsed value.
+    """
+
+    return _parse_payload("#".join(segments.values()))[2]
+
+
+async def decode_text(text: str) -> DecodedFrame:
+    """Asynchronously decode a raw IRegul frame string.
+
+    Args:
+        text: Raw text of the frame (with optional leading whitespace).
+
+    Returns:
+        DecodedFrame with timestamp, old/new flag, token count, keepalive status,
+        and groups.
+
+    Raises:
+        ValueError: If the frame format is invalid.
+    """
+
+    is_old, ts, payload = split_frame(text)
     count, message_type, groups = _parse_payload(payload)
 
     # Keepalive is detected when payload is empty
@@ -2,6 +2,7 @@
 This type stub file was generated by pyright.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -20,5 +21,10 @@ class DecodedFrame:
     groups: dict[str, dict[int, dict[str, ValueType]]]
     ...
 
+def split_groups(payload: str) -> tuple[str, dict[str, str]]: ...
+def decode_segments(
+    segments: Mapping[str, str],
+) -> dict[str, dict[int, dict[str, ValueType]]]: ...
+def split_frame(text: str) -> tuple[bool, datetime, str]: ...
 async def decode_text(text: str) -> DecodedFrame: ...
 async def decode_file(path: str) -> DecodedFrame: ...
@@ -0,0 +1,261 @@
+"""Fleet-wide rate limiting of the commands sent to IRegul servers.
+
+A single :class:`RateLimiter` is shared by every :class:`~aioiregul.v2.client.IRegulClient`
+of a fleet. It enforces a :class:`Budget` per command (e.g. at most two 502 in
+flight and one 501 every 50 ms) and optionally a budget for all commands sent
+to the same host. Budgets are tracked per host, so clients of different
+servers never wait for each other.
+
+Waiting is asynchronous and fair: requests are served in arrival order, both
+for concurrency slots and for rate tokens. The time spent waiting is reported
+in :attr:`RateLimiter.stats` and, for clients, as the ``queue`` phase of their
+:class:`~aioiregul.models.Timings`.
+
+Example:
+    >>> limiter = RateLimiter(
+    ...     {"502": Budget(max_concurrent=2), "501": Budget(rate=20, burst=5)},
+    ...     host_budget=Budget(rate=50),
+    ... )
+    >>> clients = [
+    ...     IRegulClient(device_id=device_id, rate_limiter=limiter) for device_id in devices
+    ... ]  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Mapping
+from dataclasses import dataclass
+
+# Budget key applying to every command sent to a host
+_HOST = "*"
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Request budget of a command, or of all commands sent to a host.
+
+    Attributes:
+        rate: Sustained number of requests per second. None disables the
+            rate limit.
+        burst: Number of requests that may be sent at once before the rate
+            applies.
+        max_concurrent: Maximum number of requests in flight at once. None
+            disables the concurrency limit.
+    """
+
+    rate: float | None = None
+    burst: int = 1
+    max_concurrent: int | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the budget."""
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("rate must be positive or None")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        if self.max_concurrent is not None and self.max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1 or None")
+
+
+@dataclass
+class LimiterStats:
+    """Queueing statistics of one command.
+
+    Attributes:
+        acquired: Number of requests allowed through.
+        waiting: Number of requests currently queued.
+        in_flight: Number of requests currently holding a slot.
+        total_wait: Cumulated queueing delay in seconds.
+        max_wait: Longest queueing delay in seconds.
+    """
+
+    acquired: int = 0
+    waiting: int = 0
+    in_flight: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Average queueing delay in seconds."""
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+class _FifoSemaphore:
+    """Semaphore handing released slots to waiters in arrival order."""
+
+    def __init__(self, value: int) -> None:
+        self._value = value
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+
+class _TokenBucket:
+    """Token bucket implemented as a generic cell rate algorithm.
+
+    Each reservation is given the earliest time it conforms to the rate, in
+    call order, so waiters are served first come, first served.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._interval = 1.0 / rate
+        self._tolerance = (burst - 1) * self._interval
+        # Theoretical arrival time of the next request
+        self._tat = 0.0
+
+    def reserve(self, now: float) -> tuple[float, float]:
+        """Reserve a token.
+
+        Returns:
+            The time at which the token may be used, and a reservation marker
+            for :meth:`cancel`.
+        """
+        tat = max(self._tat, now)
+        self._tat = tat + self._interval
+        return max(now, tat - self._tolerance), self._tat
+
+    def cancel(self, marker: float) -> None:
+        """Return the token of a reservation, unless later ones were made since."""
+        if self._tat == marker:
+            self._tat -= self._interval
+
+
+class _Limit:
+    """Concurrency slots and rate tokens of one budget on one host."""
+
+    def __init__(self, budget: Budget) -> None:
+        self.semaphore = (
+            _FifoSemaphore(budget.max_concurrent) if budget.max_concurrent is not None else None
+        )
+        self.bucket = _TokenBucket(budget.rate, budget.burst) if budget.rate is not None else None
+
+
+class RateLimiter:
+    """Shared limiter enforcing per-command and per-host request budgets."""
+
+    def __init__(
+        self,
+        budgets: Mapping[str, Budget] | None = None,
+        host_budget: Budget | None = None,
+    ) -> None:
+        """Configure the budgets.
+
+        Args:
+            budgets: Budget per command code ("501", "502", "203"). Commands
+                without a budget are only subject to ``host_budget``.
+            host_budget: Budget shared by all commands sent to the same host.
+        """
+        self.budgets: dict[str, Budget] = dict(budgets or {})
+        if host_budget is not None:
+            self.budgets[_HOST] = host_budget
+        self.stats: dict[str, LimiterStats] = {}
+        self._limits: dict[tuple[str, str], _Limit] = {}
+
+    @property
+    def host_budget(self) -> Budget | None:
+        """Budget shared by all commands sent to the same host."""
+        return self.budgets.get(_HOST)
+
+    def _limits_for(self, host: str, command: str) -> list[_Limit]:
+        """Return the limits applying to a request, command budget first."""
+        limits: list[_Limit] = []
+        for key in (command, _HOST):
+            budget = self.budgets.get(key)
+            if budget is None:
+                continue
+            limit = self._limits.get((host, key))
+            if limit is None:
+                limit = self._limits[(host, key)] = _Limit(budget)
+            limits.append(limit)
+        return limits
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, host: str, command: str) -> AsyncGenerator[float, None]:
+        """Wait until a request may be sent and hold its slot until exit.
+
+        Concurrency slots are taken first, command before host, so that every
+        caller acquires them in the same order, then the request waits for
+        its rate tokens.
+
+        Args:
+            host: Server the request is sent to, e.g. ``"i-regul.fr:443"``.
+            command: Command code of the request.
+
+        Yields:
+            The time spent waiting, in seconds.
+        """
+        stats = self.stats.setdefault(command, LimiterStats())
+        limits = self._limits_for(host, command)
+        held: list[_FifoSemaphore] = []
+        start = time.monotonic()
+        stats.waiting += 1
+        try:
+            for limit in limits:
+                if limit.semaphore is not None:
+                    await limit.semaphore.acquire()
+                    held.append(limit.semaphore)
+            await self._wait_for_tokens(limits)
+        except BaseException:
+            for semaphore in reversed(held):
+                semaphore.release()
+            raise
+        finally:
+            stats.waiting -= 1
+
+        waited = time.monotonic() - start
+        stats.acquired += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        stats.in_flight += 1
+        try:
+            yield waited
+        finally:
+            stats.in_flight -= 1
+            for semaphore in reversed(held):
+                semaphore.release()
+
+    @staticmethod
+    async def _wait_for_tokens(limits: list[_Limit]) -> None:
+        """Reserve a rate token in every bucket and sleep until all are usable."""
+        buckets = [limit.bucket for limit in limits if limit.bucket is not None]
+        if not buckets:
+            return
+        now = time.monotonic()
+        reservations = [(bucket, *bucket.reserve(now)) for bucket in buckets]
+        due = max(reserved for _, reserved, _ in reservations)
+        if due <= now:
+            return
+        try:
+            await asyncio.sleep(due - now)
+        except asyncio.CancelledError:
+            for bucket, _, marker in reservations:
+                bucket.cancel(marker)
+            raise
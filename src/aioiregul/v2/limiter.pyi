@@ -0,0 +1,38 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from collections.abc import Mapping
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+
+"""
+This type stub file was generated by pyright.
+"""
+
+@dataclass(frozen=True)
+class Budget:
+    rate: float | None = ...
+    burst: int = ...
+    max_concurrent: int | None = ...
+    def __post_init__(self) -> None: ...
+
+@dataclass
+class LimiterStats:
+    acquired: int = ...
+    waiting: int = ...
+    in_flight: int = ...
+    total_wait: float = ...
+    max_wait: float = ...
+    @property
+    def mean_wait(self) -> float: ...
+
+class RateLimiter:
+    budgets: dict[str, Budget]
+    stats: dict[str, LimiterStats]
+    def __init__(
+        self, budgets: Mapping[str, Budget] | None = ..., host_budget: Budget | None = ...
+    ) -> None: ...
+    @property
+    def host_budget(self) -> Budget | None: ...
+    def acquire(self, host: str, command: str) -> AbstractAsyncContextManager[float]: ...
@@ -6,6 +6,9 @@ into strongly-typed model objects for easier consumption by API clients.
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime
 from typing import Any
 
 from ..models import (
@@ -334,3 +337,46 @@ def map_frame(frame: DecodedFrame) -> MappedFrame:
         configuration=map_configuration(frame.groups),
         memory=map_memory(frame.groups),
     )
+
+
+# MappedFrame attribute holding each group, and the mapper producing it
+GROUP_MAPPERS: dict[str, tuple[str, Callable[[dict[str, dict[int, dict[str, Any]]]], Any]]] = {
+    "Z": ("zones", map_zones),
+    "I": ("inputs", map_inputs),
+    "O": ("outputs", map_outputs),
+    "M": ("measurements", map_measurements),
+    "P": ("parameters", map_parameters),
+    "J": ("labels", map_labels),
+    "B": ("modbus_registers", map_modbus_registers),
+    "A": ("analog_sensors", map_analog_sensors),
+    "C": ("configuration", map_configuration),
+    "mem": ("memory", map_memory),
+}
+
+
+def remap_groups(
+    previous: MappedFrame,
+    groups: dict[str, dict[int, dict[str, Any]]],
+    *,
+    is_old: bool,
+    timestamp: datetime,
+) -> MappedFrame:
+    """Update a mapped frame with new data for some groups only.
+
+    Attributes of groups missing from ``groups`` are shared with ``previous``.
+
+    Args:
+        previous: Frame mapped from an earlier response.
+        groups: Complete decoded data of the groups to map again.
+        is_old: Whether the new frame is an OLD snapshot.
+        timestamp: Timestamp of the new frame.
+
+    Returns:
+        A new MappedFrame.
+    """
+    changes = {
+        attribute: mapper(groups)
+        for group, (attribute, mapper) in GROUP_MAPPERS.items()
+        if group in groups
+    }
+    return replace(previous, is_old=is_old, timestamp=timestamp, **changes)
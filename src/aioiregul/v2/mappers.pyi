@@ -2,6 +2,8 @@
 This type stub file was generated by pyright.
 """
 
+from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 
 from ..models import (
@@ -56,3 +58,13 @@ def map_analog_sensors(groups: dict[str, dict[int, dict[str, Any]]]) -> dict[int
 def map_configuration(groups: dict[str, dict[int, dict[str, Any]]]) -> Configuration | None: ...
 def map_memory(groups: dict[str, dict[int, dict[str, Any]]]) -> Memory | None: ...
 def map_frame(frame: DecodedFrame) -> MappedFrame: ...
+
+GROUP_MAPPERS: dict[str, tuple[str, Callable[[dict[str, dict[int, dict[str, Any]]]], Any]]]
+
+def remap_groups(
+    previous: MappedFrame,
+    groups: dict[str, dict[int, dict[str, Any]]],
+    *,
+    is_old: bool,
+    timestamp: datetime,
+) -> MappedFrame: ...
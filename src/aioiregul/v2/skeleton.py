@@ -0,0 +1,516 @@
+"""Serialization of configuration skeletons.
+
+A skeleton caches the static configuration of a device as
+``{group: {index: {field: value}}}``. Two formats are supported:
+
+- JSON, human-readable and the historical format. Integer indexes become
+  strings and must be converted back when loading.
+- A compact binary format built for fast startup when many skeletons are
+  loaded at once.
+
+Binary format (version 1):
+    A 5-byte header made of the ``IRSK`` magic and a version byte, followed by
+    the skeleton itself serialized with ``marshal`` (format version 4).
+
+    Before dumping, every group name, field name and string value is replaced
+    by a single shared instance. ``marshal`` writes the first occurrence of an
+    object and back-references for the following ones, so each name is stored
+    once: this reference table acts as the string table of the format. Loading
+    is then a single ``marshal.loads`` call that rebuilds the nested dicts in C,
+    with integer indexes preserved and field names shared between entries.
+
+    Like ``marshal`` itself, the binary format is not meant to be loaded from
+    untrusted sources.
+
+:class:`SkeletonStore` deduplicates identical skeleton parts so that many
+clients of devices sharing a configuration reference a single copy.
+
+:class:`SkeletonDirectory` persists one skeleton per device so that a restarted
+service warm-starts with 501 polls instead of re-fetching every skeleton with
+502. Each file holds a small header (``IRSD`` magic, version byte, save time
+as a big-endian float64 Unix timestamp and the 16-byte content fingerprint)
+followed by the skeleton in the binary format above.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import marshal
+import os
+import struct
+import sys
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from .decoder import ValueType
+
+LOGGER = logging.getLogger(__name__)
+
+Skeleton = dict[str, dict[int, dict[str, ValueType]]]
+
+SKELETON_MAGIC = b"IRSK"
+SKELETON_VERSION = 1
+
+_HEADER = struct.Struct(">4sB")
+_MARSHAL_VERSION = 4
+
+SKELETON_FILE_MAGIC = b"IRSD"
+SKELETON_FILE_VERSION = 1
+SKELETON_FILE_SUFFIX = ".irsk"
+
+_FILE_HEADER = struct.Struct(">4sBd16s")
+
+
+def dump_skeleton(skeleton: Skeleton) -> bytes:
+    """Serialize a skeleton to the binary format.
+
+    Args:
+        skeleton: Skeleton to serialize.
+
+    Returns:
+        The binary representation.
+    """
+    strings: dict[str, str] = {}
+
+    def shared(value: ValueType) -> ValueType:
+        return strings.setdefault(value, value) if isinstance(value, str) else value
+
+    canonical = {
+        shared(group): {
+            index: {shared(name): shared(value) for name, value in fields.items()}
+            for index, fields in entries.items()
+        }
+        for group, entries in skeleton.items()
+    }
+    return _HEADER.pack(SKELETON_MAGIC, SKELETON_VERSION) + marshal.dumps(
+        canonical, _MARSHAL_VERSION
+    )
+
+
+def load_skeleton(data: bytes) -> Skeleton:
+    """Deserialize a skeleton from the binary format.
+
+    Args:
+        data: Bytes produced by :func:`dump_skeleton`.
+
+    Returns:
+        The rebuilt skeleton.
+
+    Raises:
+        ValueError: If the data is not a supported binary skeleton.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Binary skeleton is truncated")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != SKELETON_MAGIC:
+        raise ValueError("Not a binary skeleton")
+    if version != SKELETON_VERSION:
+        raise ValueError(f"Unsupported binary skeleton version {version}")
+
+    try:
+        skeleton = marshal.loads(memoryview(data)[_HEADER.size :])
+    except (EOFError, TypeError, ValueError) as e:
+        raise ValueError(f"Corrupted binary skeleton: {e}") from e
+    if not isinstance(skeleton, dict):
+        raise ValueError("Corrupted binary skeleton: not a mapping")
+    return skeleton  # type: ignore[return-value]
+
+
+def is_binary_skeleton(data: bytes | str) -> bool:
+    """Tell whether ``data`` starts with the binary skeleton magic."""
+    return isinstance(data, bytes) and data.startswith(SKELETON_MAGIC)
+
+
+def skeleton_to_json(skeleton: Skeleton) -> str:
+    """Serialize a skeleton to JSON; integer indexes become strings."""
+    return json.dumps(skeleton)
+
+
+def skeleton_from_json(skeleton_json: str | bytes) -> Skeleton:
+    """Deserialize a skeleton from JSON, converting indexes back to integers.
+
+    Args:
+        skeleton_json: JSON representation of a skeleton.
+
+    Returns:
+        The rebuilt skeleton.
+
+    Raises:
+        ValueError: If the JSON is invalid.
+    """
+    try:
+        deserialized: dict[str, Any] = json.loads(skeleton_json)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON format: {e}") from e
+
+    # JSON converts dict keys to strings, so group indexes are converted back
+    skeleton: Skeleton = {}
+    for group_key, group_data in deserialized.items():
+        if isinstance(group_data, dict):
+            skeleton[group_key] = {int(k): v for k, v in group_data.items()}  # type: ignore[misc]
+        else:
+            skeleton[group_key] = group_data
+    return skeleton
+
+
+class _SharedDict(dict[Any, Any]):
+    """Canonical group or entry of a :class:`SkeletonStore`.
+
+    Unlike a plain dict, it can be weakly referenced, so that the store
+    releases it once no skeleton uses it anymore.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+class SkeletonStore:
+    """Content-addressed store sharing identical skeleton parts between clients.
+
+    Devices of the same model report identical configurations, so their
+    skeletons contain the same entries. :meth:`intern` replaces every entry
+    (the fields of one group index) and every group by a canonical instance
+    with the same content, and returns a small per-client top-level dict
+    pointing at them. Many clients thus reference a single copy of each
+    structure.
+
+    Canonical groups and entries must not be modified in place: a client
+    writing to one first replaces it by a private copy (copy-on-write), which
+    becomes its per-device overlay. :meth:`is_shared` tells whether an object
+    is canonical.
+
+    The store only holds weak references to the canonical instances: a group
+    or entry is dropped as soon as the last skeleton using it is replaced, so
+    a long-running fleet keeps only the parts of its current skeletons.
+
+    Example:
+        >>> store = SkeletonStore()
+        >>> a = store.intern({"B": {1: {"nom_registre": "Salon"}}})
+        >>> b = store.intern({"B": {1: {"nom_registre": "Salon"}}})
+        >>> a["B"] is b["B"], store.fingerprint(a) == store.fingerprint(b)
+        (True, True)
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._entries: weakref.WeakValueDictionary[
+            tuple[tuple[str, type, ValueType], ...], dict[str, ValueType]
+        ] = weakref.WeakValueDictionary()
+        # Keyed by the ids of the member entries, which the group keeps alive
+        self._groups: weakref.WeakValueDictionary[
+            tuple[tuple[int, int], ...], dict[int, dict[str, ValueType]]
+        ] = weakref.WeakValueDictionary()
+        # Canonical instances by id, checked by identity as ids are reused
+        self._shared: weakref.WeakValueDictionary[int, dict[Any, Any]] = (
+            weakref.WeakValueDictionary()
+        )
+
+    @property
+    def entry_count(self) -> int:
+        """Number of distinct entries held by the store."""
+        return len(self._entries)
+
+    @property
+    def group_count(self) -> int:
+        """Number of distinct groups held by the store."""
+        return len(self._groups)
+
+    def is_shared(self, obj: object) -> bool:
+        """Tell whether ``obj`` is a canonical group or entry of this store."""
+        return self._shared.get(id(obj)) is obj
+
+    def intern(self, skeleton: Skeleton) -> Skeleton:
+        """Return a skeleton equal to ``skeleton`` built from shared parts.
+
+        Args:
+            skeleton: Skeleton to deduplicate. It is not modified.
+
+        Returns:
+            A new top-level dict owned by the caller whose groups and entries
+            are canonical, read-only instances.
+        """
+        result: Skeleton = {}
+        for group, entries in skeleton.items():
+            if self.is_shared(entries):
+                result[self._string(group)] = entries
+                continue
+            members = {index: self._intern_entry(fields) for index, fields in entries.items()}
+            key = tuple((index, id(fields)) for index, fields in members.items())
+            canonical = self._groups.get(key)
+            if canonical is None:
+                canonical = _SharedDict(members)
+                self._groups[key] = self._shared[id(canonical)] = canonical
+            result[self._string(group)] = canonical
+        return result
+
+    def _intern_entry(self, fields: dict[str, ValueType]) -> dict[str, ValueType]:
+        """Return the canonical instance of an entry."""
+        if self.is_shared(fields):
+            return fields
+        # The value type is part of the key so that 1, 1.0 and True stay distinct
+        key = tuple((name, type(value), value) for name, value in fields.items())
+        canonical = self._entries.get(key)
+        if canonical is None:
+            canonical = _SharedDict(
+                (self._string(name), self._string(value) if isinstance(value, str) else value)
+                for name, value in fields.items()
+            )
+            self._entries[key] = self._shared[id(canonical)] = canonical
+        return canonical
+
+    @staticmethod
+    def _string(value: str) -> str:
+        """Return the shared instance of a string."""
+        return sys.intern(value)
+
+    @staticmethod
+    def fingerprint(skeleton: Skeleton) -> str:
+        """Content hash of a skeleton, independent of key order and sharing.
+
+        Args:
+            skeleton: Skeleton to hash.
+
+        Returns:
+            Hexadecimal BLAKE2b digest.
+        """
+        canonical = sorted(
+            (
+                group,
+                sorted(
+                    (index, sorted((name, type(v).__name__, v) for name, v in fields.items()))
+                    for index, fields in entries.items()
+                ),
+            )
+            for group, entries in skeleton.items()
+        )
+        return hashlib.blake2b(repr(canonical).encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class SkeletonRecord:
+    """A skeleton read from a :class:`SkeletonDirectory`.
+
+    Attributes:
+        skeleton: The stored skeleton.
+        fingerprint: Content fingerprint, as returned by
+            :meth:`SkeletonStore.fingerprint`.
+        saved_at: Unix time at which the skeleton was written.
+    """
+
+    skeleton: Skeleton
+    fingerprint: str
+    saved_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the skeleton was written, never negative."""
+        return max(0.0, time.time() - self.saved_at)
+
+
+class SkeletonDirectory:
+    """Directory holding the last known skeleton of each device.
+
+    Files are named after the device id and replaced atomically (written to a
+    temporary file, then renamed), so a crash never leaves a partial skeleton
+    behind. Files that cannot be read are ignored, and the client falls back
+    to a 502.
+
+    Writes requested with :meth:`save` are coalesced: the latest skeleton of
+    each device is kept in memory and written by a single background flush
+    ``write_delay`` after the first request, and only when its fingerprint
+    differs from the stored one or when the skeleton was confirmed by a 502:
+    the file is then rewritten with a new save time, so that its age tracks
+    the last confirmation rather than the last change. Call :meth:`flush`
+    before shutting down to write pending skeletons right away.
+
+    Example:
+        >>> directory = SkeletonDirectory("/var/lib/iregul/skeletons")  # doctest: +SKIP
+        >>> client = IRegulClient(device_id="dev", skeleton_directory=directory)  # doctest: +SKIP
+    """
+
+    def __init__(self, path: Path | str, write_delay: timedelta = timedelta(seconds=30)) -> None:
+        """Use ``path`` as skeleton directory, creating it if needed.
+
+        Args:
+            path: Directory holding the skeleton files.
+            write_delay: Time during which skeleton updates are accumulated
+                before being written.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.write_delay = write_delay
+        # Latest skeleton per device waiting to be written
+        self._pending: dict[str, Skeleton] = {}
+        # Pending devices whose save time must be refreshed even if unchanged
+        self._confirmed: set[str] = set()
+        # Fingerprint of the skeleton stored for each device
+        self._stored: dict[str, str] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    def file_for(self, device_id: str) -> Path:
+        """Return the file holding the skeleton of ``device_id``."""
+        return self.path / f"{quote(device_id, safe='')}{SKELETON_FILE_SUFFIX}"
+
+    @property
+    def pending_count(self) -> int:
+        """Number of devices whose skeleton is waiting to be written."""
+        return len(self._pending)
+
+    def load(self, device_id: str) -> SkeletonRecord | None:
+        """Read the stored skeleton of a device.
+
+        This performs blocking file I/O; clients call it through
+        :func:`asyncio.to_thread`.
+
+        Args:
+            device_id: Device identifier.
+
+        Returns:
+            The stored record, or None if there is none or it is unreadable.
+        """
+        path = self.file_for(device_id)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            LOGGER.warning(f"Cannot read skeleton file {path}: {e}")
+            return None
+
+        try:
+            if len(data) < _FILE_HEADER.size:
+                raise ValueError("Skeleton file is truncated")
+            magic, version, saved_at, digest = _FILE_HEADER.unpack_from(data)
+            if magic != SKELETON_FILE_MAGIC:
+                raise ValueError("Not a skeleton file")
+            if version != SKELETON_FILE_VERSION:
+                raise ValueError(f"Unsupported skeleton file version {version}")
+            skeleton = load_skeleton(data[_FILE_HEADER.size :])
+        except ValueError as e:
+            LOGGER.warning(f"Ignoring skeleton file {path}: {e}")
+            return None
+
+        record = SkeletonRecord(skeleton, digest.hex(), saved_at)
+        self._stored[device_id] = record.fingerprint
+        return record
+
+    def write(self, device_id: str, skeleton: Skeleton, confirmed: bool = False) -> bool:
+        """Write the skeleton of a device now, unless it is already stored.
+
+        This performs blocking file I/O.
+
+        Args:
+            device_id: Device identifier.
+            skeleton: Skeleton to store.
+            confirmed: Whether the device just reported this skeleton. The
+                file is then rewritten even if unchanged, to refresh its age.
+
+        Returns:
+            True if the file was written, False if it already held this skeleton.
+        """
+        fingerprint = SkeletonStore.fingerprint(skeleton)
+        if not confirmed and self._stored.get(device_id) == fingerprint:
+            return False
+        self._write_file(device_id, self._encode(skeleton, fingerprint))
+        self._stored[device_id] = fingerprint
+        return True
+
+    def save(self, device_id: str, skeleton: Skeleton, confirmed: bool = False) -> None:
+        """Schedule the skeleton of a device to be written by the next flush.
+
+        Must be called from the event loop. The skeleton is serialized when
+        the flush runs, so it must not be modified in the meantime by anything
+        other than the client owning it.
+
+        Args:
+            device_id: Device identifier.
+            skeleton: Latest skeleton of the device.
+            confirmed: Whether the device just reported this skeleton with a
+                502. The file is then rewritten even if unchanged, to refresh
+                its age.
+        """
+        self._pending[device_id] = skeleton
+        if confirmed:
+            self._confirmed.add(device_id)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.write_delay.total_seconds(), self._start_flush
+            )
+
+    async def flush(self) -> None:
+        """Write every pending skeleton whose content changed or was confirmed.
+
+        Skeletons are serialized on the event loop, so that clients cannot
+        modify them concurrently, and written from a worker thread.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        confirmed, self._confirmed = self._confirmed, set()
+
+        batch: list[tuple[str, str, bytes]] = []
+        for device_id, skeleton in pending.items():
+            fingerprint = SkeletonStore.fingerprint(skeleton)
+            if device_id in confirmed or self._stored.get(device_id) != fingerprint:
+                batch.append((device_id, fingerprint, self._encode(skeleton, fingerprint)))
+        if not batch:
+            return
+
+        written = await asyncio.to_thread(self._write_batch, batch)
+        for device_id, fingerprint, _ in batch:
+            if device_id in written:
+                self._stored[device_id] = fingerprint
+        LOGGER.debug(f"Wrote {len(written)} of {len(pending)} pending skeletons to {self.path}")
+
+    def _start_flush(self) -> None:
+        """Run a flush in the background once the write delay elapsed."""
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task[None]) -> None:
+        """Forget a background flush and log its failure, if any."""
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            LOGGER.warning(f"Failed to write skeletons to {self.path}: {task.exception()}")
+
+    @staticmethod
+    def _encode(skeleton: Skeleton, fingerprint: str) -> bytes:
+        """Serialize a skeleton with its file header."""
+        header = _FILE_HEADER.pack(
+            SKELETON_FILE_MAGIC, SKELETON_FILE_VERSION, time.time(), bytes.fromhex(fingerprint)
+        )
+        return header + dump_skeleton(skeleton)
+
+    def _write_batch(self, batch: list[tuple[str, str, bytes]]) -> set[str]:
+        """Write encoded skeletons, returning the devices written successfully."""
+        written: set[str] = set()
+        for device_id, _, data in batch:
+            try:
+                self._write_file(device_id, data)
+            except OSError as e:
+                LOGGER.warning(f"Cannot write skeleton of device {device_id}: {e}")
+                continue
+            written.add(device_id)
+        return written
+
+    def _write_file(self, device_id: str, data: bytes) -> None:
+        """Atomically replace the skeleton file of a device."""
+        path = self.file_for(device_id)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
@@ -0,0 +1,56 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from .decoder import ValueType
+
+"""
+This type stub file was generated by pyright.
+"""
+Skeleton = dict[str, dict[int, dict[str, ValueType]]]
+SKELETON_MAGIC: bytes
+SKELETON_VERSION: int
+SKELETON_FILE_MAGIC: bytes
+SKELETON_FILE_VERSION: int
+SKELETON_FILE_SUFFIX: str
+
+def dump_skeleton(skeleton: Skeleton) -> bytes: ...
+def load_skeleton(data: bytes) -> Skeleton: ...
+def is_binary_skeleton(data: bytes | str) -> bool: ...
+def skeleton_to_json(skeleton: Skeleton) -> str: ...
+def skeleton_from_json(skeleton_json: str | bytes) -> Skeleton: ...
+
+class SkeletonStore:
+    def __init__(self) -> None: ...
+    @property
+    def entry_count(self) -> int: ...
+    @property
+    def group_count(self) -> int: ...
+    def is_shared(self, obj: object) -> bool: ...
+    def intern(self, skeleton: Skeleton) -> Skeleton: ...
+    @staticmethod
+    def fingerprint(skeleton: Skeleton) -> str: ...
+
+@dataclass
+class SkeletonRecord:
+    skeleton: Skeleton
+    fingerprint: str
+    saved_at: float
+    @property
+    def age(self) -> float: ...
+
+class SkeletonDirectory:
+    path: Path
+    write_delay: timedelta
+    def __init__(self, path: Path | str, write_delay: timedelta = ...) -> None: ...
+    def file_for(self, device_id: str) -> Path: ...
+    @property
+    def pending_count(self) -> int: ...
+    def load(self, device_id: str) -> SkeletonRecord | None: ...
+    def write(self, device_id: str, skeleton: Skeleton, confirmed: bool = ...) -> bool: ...
+    def save(self, device_id: str, skeleton: Skeleton, confirmed: bool = ...) -> None: ...
+    async def flush(self) -> None: ...
@@ -0,0 +1,274 @@
+"""Socket transports delivering complete IRegul frames.
+
+The IRegul server answers a command with one or more frames, each terminated
+by a closing brace ``}``. A transport opens a connection to the server and
+returns a :class:`FrameConnection` that sends raw commands and yields complete
+frames as bytes, ready to be handed to the decoder.
+
+Two implementations are provided:
+
+- :class:`ProtocolTransport` (default): a low-level ``asyncio.Protocol`` that
+  accumulates incoming bytes in a ``bytearray`` and remembers how far it has
+  already scanned for the terminator, so each byte is inspected once and there
+  is no frame size limit.
+- :class:`StreamTransport`: the ``asyncio.StreamReader`` based implementation
+  using ``readuntil(b"}")``. Frames larger than ``limit`` raise
+  ``asyncio.LimitOverrunError``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Protocol
+
+FRAME_TERMINATOR = b"}"
+
+
+class FrameConnection(Protocol):
+    """An open connection exchanging IRegul frames."""
+
+    async def send(self, data: bytes) -> None:
+        """Send raw bytes to the server.
+
+        Args:
+            data: Encoded command message.
+        """
+        ...
+
+    async def read_frame(self) -> bytes:
+        """Read the next complete frame, including its terminating ``}``.
+
+        Returns:
+            The raw frame bytes.
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection closes mid-frame.
+        """
+        ...
+
+    async def close(self) -> None:
+        """Close the connection and wait until it is released."""
+        ...
+
+
+class FrameTransport(Protocol):
+    """Factory opening :class:`FrameConnection` instances."""
+
+    async def connect(self, host: str, port: int) -> FrameConnection:
+        """Open a connection to the server.
+
+        Args:
+            host: Hostname or IP address of the server.
+            port: TCP port of the server.
+
+        Returns:
+            An open frame connection.
+
+        Raises:
+            OSError: If the connection cannot be established.
+        """
+        ...
+
+
+class StreamConnection:
+    """Frame connection backed by an ``asyncio`` stream pair."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Wrap an existing stream pair.
+
+        Args:
+            reader: Stream reader of the connection.
+            writer: Stream writer of the connection.
+        """
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, data: bytes) -> None:
+        """Send raw bytes to the server."""
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def read_frame(self) -> bytes:
+        """Read the next frame with ``StreamReader.readuntil``.
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection closes mid-frame.
+            asyncio.LimitOverrunError: If the frame exceeds the reader limit.
+        """
+        return await self.reader.readuntil(FRAME_TERMINATOR)
+
+    async def close(self) -> None:
+        """Close the writer and wait until it is released."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class StreamTransport:
+    """Transport based on ``asyncio.open_connection``."""
+
+    def __init__(self, limit: int = 100000) -> None:
+        """Initialize the transport.
+
+        Args:
+            limit: Stream reader buffer limit, i.e. the largest frame accepted.
+        """
+        self.limit = limit
+
+    async def connect(self, host: str, port: int) -> StreamConnection:
+        """Open a stream connection to the server."""
+        reader, writer = await asyncio.open_connection(host, port, limit=self.limit)
+        return StreamConnection(reader, writer)
+
+
+class FrameProtocol(asyncio.Protocol):
+    """``asyncio.Protocol`` splitting the byte stream into complete frames.
+
+    Incoming data is appended to a ``bytearray``. The protocol records the
+    offset up to which the buffer has already been searched for ``}``, so a
+    frame arriving in many chunks is scanned exactly once, whatever its size.
+
+    The protocol also follows the transport's write flow control: once the
+    write buffer passes its high-water mark, :meth:`drain` waits until it has
+    been flushed below the low-water mark, as ``StreamWriter.drain`` does.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty protocol."""
+        self._buffer = bytearray()
+        self._scan_offset = 0
+        self._frames: deque[bytes] = deque()
+        self._waiter: asyncio.Future[None] | None = None
+        self._eof = False
+        self._exception: Exception | None = None
+        self._closed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+        self.bytes_received = 0
+
+    def data_received(self, data: bytes) -> None:
+        """Append data and extract every frame completed by it."""
+        self.bytes_received += len(data)
+        buffer = self._buffer
+        buffer.extend(data)
+
+        start = 0
+        end = buffer.find(FRAME_TERMINATOR, self._scan_offset)
+        if end >= 0:
+            # Copy frames out through a view to avoid an intermediate bytearray
+            with memoryview(buffer) as view:
+                while end >= 0:
+                    self._frames.append(bytes(view[start : end + 1]))
+                    start = end + 1
+                    end = buffer.find(FRAME_TERMINATOR, start)
+
+        if start:
+            del buffer[:start]
+        # Everything left in the buffer has been scanned already
+        self._scan_offset = len(buffer)
+
+        if self._frames:
+            self._wake_waiter()
+
+    def eof_received(self) -> bool | None:
+        """Record the end of the stream and let the transport close."""
+        self._eof = True
+        self._wake_waiter()
+        return None
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Record the connection loss and wake any pending reader."""
+        self._eof = True
+        self._exception = exc
+        self._wake_waiter()
+        # Writes will never resume, release the pending drain
+        self._can_write.set()
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self) -> None:
+        """Hold back :meth:`drain` until the transport buffer is flushed."""
+        self._can_write.clear()
+
+    def resume_writing(self) -> None:
+        """Release the writers waiting in :meth:`drain`."""
+        self._can_write.set()
+
+    def _wake_waiter(self) -> None:
+        """Resolve the pending read, if any."""
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def read_frame(self) -> bytes:
+        """Wait for and return the next complete frame.
+
+        Raises:
+            ConnectionError: If the connection was lost with an error.
+            asyncio.IncompleteReadError: If the connection closed mid-frame.
+        """
+        while not self._frames:
+            if self._exception is not None:
+                raise ConnectionError(f"Connection lost: {self._exception}")
+            if self._eof:
+                raise asyncio.IncompleteReadError(bytes(self._buffer), None)
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._frames.popleft()
+
+    async def drain(self) -> None:
+        """Wait until the transport accepts more data.
+
+        Raises:
+            ConnectionResetError: If the connection is lost, since the data
+                written may not have been sent.
+        """
+        if not self._can_write.is_set():
+            await self._can_write.wait()
+        if self._closed.done():
+            raise ConnectionResetError("Connection lost")
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection has been lost."""
+        await self._closed
+
+
+class ProtocolConnection:
+    """Frame connection backed by a :class:`FrameProtocol`."""
+
+    def __init__(self, transport: asyncio.Transport, protocol: FrameProtocol) -> None:
+        """Wrap an established transport/protocol pair.
+
+        Args:
+            transport: Transport returned by ``loop.create_connection``.
+            protocol: Protocol instance attached to the transport.
+        """
+        self.transport = transport
+        self.protocol = protocol
+
+    async def send(self, data: bytes) -> None:
+        """Send raw bytes to the server, waiting while writing is paused."""
+        self.transport.write(data)
+        await self.protocol.drain()
+
+    async def read_frame(self) -> bytes:
+        """Read the next complete frame."""
+        return await self.protocol.read_frame()
+
+    async def close(self) -> None:
+        """Close the transport and wait until the connection is lost."""
+        self.transport.close()
+        await self.protocol.wait_closed()
+
+
+class ProtocolTransport:
+    """Transport based on ``loop.create_connection`` and :class:`FrameProtocol`."""
+
+    async def connect(self, host: str, port: int) -> ProtocolConnection:
+        """Open a protocol connection to the server."""
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_connection(FrameProtocol, host, port)
+        return ProtocolConnection(transport, protocol)
@@ -0,0 +1,55 @@
+"""
+This type stub file was generated by pyright.
+"""
+
+import asyncio
+from typing import Protocol
+
+"""
+This type stub file was generated by pyright.
+"""
+FRAME_TERMINATOR: bytes
+
+class FrameConnection(Protocol):
+    async def send(self, data: bytes) -> None: ...
+    async def read_frame(self) -> bytes: ...
+    async def close(self) -> None: ...
+
+class FrameTransport(Protocol):
+    async def connect(self, host: str, port: int) -> FrameConnection: ...
+
+class StreamConnection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None: ...
+    async def send(self, data: bytes) -> None: ...
+    async def read_frame(self) -> bytes: ...
+    async def close(self) -> None: ...
+
+class StreamTransport:
+    limit: int
+    def __init__(self, limit: int = ...) -> None: ...
+    async def connect(self, host: str, port: int) -> StreamConnection: ...
+
+class FrameProtocol(asyncio.Protocol):
+    bytes_received: int
+    def __init__(self) -> None: ...
+    def data_received(self, data: bytes) -> None: ...
+    def eof_received(self) -> bool | None: ...
+    def connection_lost(self, exc: Exception | None) -> None: ...
+    def pause_writing(self) -> None: ...
+    def resume_writing(self) -> None: ...
+    async def read_frame(self) -> bytes: ...
+    async def drain(self) -> None: ...
+    async def wait_closed(self) -> None: ...
+
+class ProtocolConnection:
+    transport: asyncio.Transport
+    protocol: FrameProtocol
+    def __init__(self, transport: asyncio.Transport, protocol: FrameProtocol) -> None: ...
+    async def send(self, data: bytes) -> None: ...
+    async def read_frame(self) -> bytes: ...
+    async def close(self) -> None: ...
+
+class ProtocolTransport:
+    async def connect(self, host: str, port: int) -> ProtocolConnection: ...
@@ -437,6 +437,34 @@ class TestMainFunction:
 
             assert result == 1
 
+    def test_main_explicit_decode_of_command_named_file(self):
+        """`decode` decodes a frame file named like a command."""
+        with patch("src.aioiregul.cli.decode_command") as mock_decode:
+            mock_decode.return_value = 0
+
+            result = cli.main(["decode", "bench", "--json"])
+
+        assert result == 0
+        args = mock_decode.call_args[0][0]
+        assert (args.command, args.file, args.json) == ("decode", "bench", True)
+
+    def test_main_help_lists_commands(self, capsys):
+        """--help documents both commands."""
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["--help"])
+
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert "decode" in out and "bench" in out
+
+    def test_main_without_arguments(self, capsys):
+        """A missing command or file is a usage error."""
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main([])
+
+        assert exc_info.value.code == 2
+        assert "a command or a frame file is required" in capsys.readouterr().err
+
 
 class TestCLIIntegration:
     """Integration tests using actual test data files."""
@@ -502,3 +530,77 @@ class TestCLIIntegration:
         # Should be valid JSON
         data = json.loads(captured.out)
         assert isinstance(data, dict)
+
+
+class TestBenchCommand:
+    """Test the bench subcommand."""
+
+    def test_report_aggregation(self):
+        """BenchReport computes rates, errors and nearest-rank percentiles."""
+        from src.aioiregul.models import Timings
+
+        report = cli.BenchReport(clients=2, duration=2.0)
+        for i in range(1, 101):
+            report.timings.append(Timings("get_data", {"connect": i * 1_000_000}, 100))
+        report.timings.append(Timings("get_data", {"connect": 5}, 0, error="TimeoutError"))
+
+        summary = report.as_dict()
+
+        assert summary["polls"] == 100
+        assert summary["polls_per_s"] == 50.0
+        assert summary["bytes_per_s"] == 5000.0
+        assert summary["errors"] == {"TimeoutError": 1}
+        assert summary["latency_ms"]["connect"] == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+        assert summary["latency_ms"]["total"]["p99"] == 99.0
+
+    def test_main_dispatches_bench(self, capsys):
+        """`bench` runs against the embedded server and prints JSON."""
+        with patch(
+            "sys.argv",
+            ["cli.py", "bench", "--clients", "3", "--duration", "0.2", "--json"],
+        ):
+            result = cli.main()
+
+        assert result == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["clients"] == 3
+        assert data["polls"] > 0
+        assert data["errors"] == {}
+        assert {"connect", "wait_new", "decode", "merge", "map", "total"} <= set(data["latency_ms"])
+
+    def test_bench_static_data(self, capsys):
+        """--data static serves the same reply to every poll."""
+        result = cli.main(["bench", "--clients", "1", "--duration", "0.2", "--data", "static"])
+
+        assert result == 0
+        assert "Polls:" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    async def test_bench_reports_errors(self, capsys):
+        """Polls against a closed port are counted as errors."""
+        from src.aioiregul.testing import FakeIRegulServer
+
+        server = FakeIRegulServer()
+        await server.start()
+        port = server.port
+        await server.close()
+
+        args = cli._parser().parse_args(
+            [
+                "bench",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--clients",
+                "1",
+                "--duration",
+                "0.1",
+                "--interval",
+                "0.02",
+            ]
+        )
+        result = await cli.bench_command(args)
+
+        assert result == 1
+        assert "ConnectionError" in capsys.readouterr().out
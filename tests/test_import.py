@@ -0,0 +1,87 @@
+"""Tests for the import-time behaviour of the package."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Import time allowed in non-stdlib modules when importing the package, in microseconds
+IMPORT_BUDGET_US = 20_000
+
+
+def _run(code: str, *args: str, cwd: Path | None = None) -> subprocess.CompletedProcess[str]:
+    """Run ``code`` in a fresh interpreter importing the source tree."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    env.pop("IREGUL_DEVICE_ID", None)
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        check=True,
+    )
+
+
+def test_import_v2_is_lazy():
+    """Importing aioiregul.v2 loads neither the client nor dotenv."""
+    result = _run(
+        "import sys, aioiregul.v2\n"
+        "print(sorted(m for m in ('dotenv', 'asyncio', 'aioiregul.v2.client', "
+        "'aioiregul.v2.decoder') if m in sys.modules))"
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_attribute_access():
+    """Public names resolve on first access and unknown names still fail."""
+    result = _run(
+        "import aioiregul.v2 as v2\n"
+        "assert v2.IRegulClient.__module__ == 'aioiregul.v2.client'\n"
+        "assert 'IRegulClient' in dir(v2) and 'Zone' in dir(v2)\n"
+        "from aioiregul.v2 import Zone, decode_text\n"
+        "try:\n"
+        "    v2.missing\n"
+        "except AttributeError:\n"
+        "    print('ok')\n"
+    )
+    assert result.stdout.strip() == "ok"
+
+
+def test_import_does_not_read_dotenv(tmp_path):
+    """Importing the clients ignores a .env file until load_env is called."""
+    (tmp_path / ".env").write_text("IREGUL_DEVICE_ID=from-dotenv\n")
+    result = _run(
+        "import os\n"
+        "import aioiregul.v1, aioiregul.v2.client\n"
+        "print(os.getenv('IREGUL_DEVICE_ID'))\n"
+        "from aioiregul.iregulapi import load_env\n"
+        "print(load_env(), os.getenv('IREGUL_DEVICE_ID'))\n",
+        cwd=tmp_path,
+    )
+    assert result.stdout.split("\n")[:2] == ["None", "True from-dotenv"]
+
+
+@pytest.mark.parametrize("module", ["aioiregul", "aioiregul.v2"])
+def test_import_time_budget(module):
+    """Importing the package spends little time outside the standard library."""
+    result = _run(f"import {module}", "-X", "importtime")
+
+    # Lines look like "import time: <self us> | <cumulative us> | <module>"
+    imported: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            imported[fields[2].strip()] = int(fields[0])
+
+    assert module in imported
+    third_party = {
+        name: self_us
+        for name, self_us in imported.items()
+        if name.split(".")[0] not in sys.stdlib_module_names
+    }
+    assert sum(third_party.values()) < IMPORT_BUDGET_US, third_party
@@ -0,0 +1,170 @@
+"""Tests for the fleet-wide rate limiter."""
+
+import asyncio
+
+import pytest
+from src.aioiregul.testing import FakeIRegulServer
+from src.aioiregul.v2.client import IRegulClient
+from src.aioiregul.v2.limiter import Budget, RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for command budgets."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_is_fair(self):
+        """At most max_concurrent requests run at once, served in arrival order."""
+        limiter = RateLimiter({"502": Budget(max_concurrent=2)})
+        running = 0
+        peak = 0
+        order = []
+
+        async def request(i):
+            nonlocal running, peak
+            async with limiter.acquire("host", "502"):
+                order.append(i)
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request(i) for i in range(8)))
+
+        assert peak == 2
+        assert order == list(range(8))
+        stats = limiter.stats["502"]
+        assert stats.acquired == 8
+        assert stats.waiting == stats.in_flight == 0
+        assert stats.max_wait >= 0.03
+        assert 0 < stats.mean_wait < stats.max_wait
+
+    @pytest.mark.asyncio
+    async def test_rate_and_burst(self):
+        """Requests beyond the burst are spaced by the rate."""
+        limiter = RateLimiter({"501": Budget(rate=50, burst=2)})
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def request():
+            async with limiter.acquire("host", "501") as waited:
+                return waited
+
+        waits = await asyncio.gather(*(request() for _ in range(6)))
+
+        assert waits[:2] == [pytest.approx(0, abs=0.005)] * 2
+        assert loop.time() - start >= 0.075
+        assert waits[2:] == sorted(waits[2:])
+
+    @pytest.mark.asyncio
+    async def test_host_budget_and_isolation(self):
+        """The host budget covers every command, and hosts are independent."""
+        limiter = RateLimiter(host_budget=Budget(max_concurrent=1))
+        async with limiter.acquire("a", "501"):
+            blocked = asyncio.ensure_future(limiter.acquire("a", "203").__aenter__())
+            async with limiter.acquire("b", "501") as waited:
+                assert waited < 0.01
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+            assert limiter.stats["203"].waiting == 1
+        await blocked
+        assert limiter.host_budget == Budget(max_concurrent=1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_its_place(self):
+        """A cancelled waiter neither keeps a slot nor consumes a token."""
+        limiter = RateLimiter({"502": Budget(rate=10, max_concurrent=1)})
+        async with limiter.acquire("host", "502"):
+            waiter = asyncio.ensure_future(limiter.acquire("host", "502").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert limiter.stats["502"].waiting == 0
+
+        # The slot is free and only the first request's token was spent
+        async with limiter.acquire("host", "502") as waited:
+            assert waited < 0.15
+
+    def test_invalid_budget(self):
+        """Budgets reject non-positive limits."""
+        with pytest.raises(ValueError, match="rate"):
+            Budget(rate=0)
+        with pytest.raises(ValueError, match="burst"):
+            Budget(burst=0)
+        with pytest.raises(ValueError, match="max_concurrent"):
+            Budget(max_concurrent=0)
+
+    @pytest.mark.asyncio
+    async def test_clients_share_the_limiter(self):
+        """A fleet never exceeds the 502 cap and reports its queueing delay."""
+        limiter = RateLimiter({"502": Budget(max_concurrent=3)})
+        timings = []
+        async with FakeIRegulServer(latency=0.02) as server:
+            clients = [
+                IRegulClient(
+                    host=server.host,
+                    port=server.port,
+                    device_id=f"dev{i}",
+                    password="pw",
+                    rate_limiter=limiter,
+                    timings_hook=timings.append,
+                )
+                for i in range(12)
+            ]
+            await asyncio.gather(*(client.get_data() for client in clients))
+
+        assert server.stats.commands == {"502": 12}
+        assert server.stats.peak_connections == 3
+        assert limiter.stats["502"].acquired == 12
+        assert all("queue" in t.phases for t in timings)
+        assert max(t.phases["queue"] for t in timings) > 0
+
+    @pytest.mark.asyncio
+    async def test_paused_stream_releases_its_slot(self):
+        """A stream_data consumer stalled on the OLD frame blocks no other 502."""
+        limiter = RateLimiter({"502": Budget(max_concurrent=1)})
+        async with FakeIRegulServer() as server:
+            streaming, other = (
+                IRegulClient(
+                    host=server.host,
+                    port=server.port,
+                    device_id=f"dev{i}",
+                    password="pw",
+                    rate_limiter=limiter,
+                )
+                for i in range(2)
+            )
+            stream = streaming.stream_data()
+            old = await anext(stream)
+
+            # Before the fix this waited for the stream to be resumed
+            frame = await asyncio.wait_for(other.get_data(), timeout=5)
+            same_client = await asyncio.wait_for(streaming.get_data(), timeout=5)
+
+            new = await anext(stream)
+            with pytest.raises(StopAsyncIteration):
+                await anext(stream)
+
+        assert old.is_old and not new.is_old
+        assert frame is not None and same_client is not None
+        assert limiter.stats["502"].in_flight == 0
+        assert limiter.stats["502"].acquired == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_early_releases_its_slot(self):
+        """Closing a stream before the NEW frame stops the read and frees the slot."""
+        limiter = RateLimiter({"502": Budget(max_concurrent=1)})
+        async with FakeIRegulServer(frame_gap=10) as server:
+            client = IRegulClient(
+                host=server.host,
+                port=server.port,
+                device_id="dev",
+                password="pw",
+                rate_limiter=limiter,
+            )
+            stream = client.stream_data()
+            assert (await anext(stream)).is_old
+            await stream.aclose()
+
+        assert limiter.stats["502"].in_flight == 0
+        assert client.skeleton_needs_refresh()
@@ -8,6 +8,7 @@ from aioiregul.models import (
     MappedFrame,
     Measurement,
     Output,
+    Timings,
     Zone,
 )
 
@@ -47,3 +48,35 @@ def test_mapped_frame_as_json_roundtrip() -> None:
     assert parsed["zones"]["1"]["consigne_normal"] == pytest.approx(21.5)
     assert parsed["measurements"]["1"]["alias"] == "Power"
     assert "inputs" in parsed and "outputs" in parsed
+
+
+def test_timings_accumulates_phases() -> None:
+    """Timings.measure adds up repeated phases and excludes them from JSON."""
+    timings = Timings("get_data")
+    with timings.measure("collect"):
+        pass
+    first = timings.phases["collect"]
+    timings.add("collect", 1_000)
+    timings.add("map", 500)
+
+    assert list(timings.phases) == ["collect", "map"]
+    assert timings.phases["collect"] == first + 1_000
+    assert timings.total_ns == first + 1_500
+
+    frame = MappedFrame(
+        is_old=False,
+        timestamp=datetime(2024, 1, 1),
+        count=None,
+        zones={},
+        inputs={},
+        outputs={},
+        measurements={},
+        parameters={},
+        labels={},
+        modbus_registers={},
+        analog_sensors={},
+        configuration=None,
+        memory=None,
+        timings=timings,
+    )
+    assert "timings" not in json.loads(frame.as_json())
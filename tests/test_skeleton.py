@@ -0,0 +1,318 @@
+"""Tests for skeleton serialization."""
+
+import asyncio
+import gc
+import json
+import struct
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from src.aioiregul.models import Timings
+from src.aioiregul.testing import FakeIRegulServer
+from src.aioiregul.v2.client import IRegulClient
+from src.aioiregul.v2.decoder import decode_file
+from src.aioiregul.v2.skeleton import (
+    SkeletonDirectory,
+    SkeletonStore,
+    dump_skeleton,
+    is_binary_skeleton,
+    load_skeleton,
+    skeleton_from_json,
+    skeleton_to_json,
+)
+
+V2_DATA_DIR = Path(__file__).parent / "data" / "v2messages"
+
+
+@pytest.fixture
+async def skeleton():
+    """Skeleton cached by the client for the captured 502 frame."""
+    decoded = await decode_file(str(V2_DATA_DIR / "502-NEW.txt"))
+    client = IRegulClient(host="test.local", port=443, device_id="dev", password="pw")
+    result = {}
+    client._merge_values_into_skeleton(result, decoded.groups)
+    return result
+
+
+def test_binary_roundtrip(skeleton):
+    """The binary format restores the skeleton with integer indexes."""
+    data = dump_skeleton(skeleton)
+
+    assert is_binary_skeleton(data)
+    assert len(data) < len(skeleton_to_json(skeleton))
+    loaded = load_skeleton(data)
+    assert loaded == skeleton
+    assert all(isinstance(index, int) for entries in loaded.values() for index in entries)
+
+
+def test_binary_shares_field_names(skeleton):
+    """Field names are loaded as one shared object per name."""
+    loaded = load_skeleton(dump_skeleton(skeleton))
+    first, second = (next(iter(fields)) for fields in list(loaded["B"].values())[:2])
+    assert first == second and first is second
+
+
+def test_json_roundtrip(skeleton):
+    """JSON export and import stay compatible with the binary format."""
+    assert skeleton_from_json(skeleton_to_json(skeleton)) == skeleton
+    assert load_skeleton(dump_skeleton(skeleton_from_json(skeleton_to_json(skeleton)))) == skeleton
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b"IRS", "truncated"),
+        (b"XXXX\x01", "Not a binary skeleton"),
+        (struct.pack(">4sB", b"IRSK", 99), "Unsupported binary skeleton version 99"),
+        (b"IRSK\x01\xff", "Corrupted"),
+    ],
+)
+def test_invalid_binary(data, message):
+    """Invalid binary data raises ValueError."""
+    with pytest.raises(ValueError, match=message):
+        load_skeleton(data)
+
+
+def test_client_loads_both_formats(skeleton):
+    """load_skeleton_from accepts JSON strings and binary skeletons."""
+    client = IRegulClient(
+        host="test.local", port=443, device_id="dev", password="pw", config_skeleton=skeleton
+    )
+    binary = client.save_skeleton_binary()
+    json_text = client.save_skeleton()
+
+    for data in (binary, json_text):
+        restored = IRegulClient(host="test.local", port=443, device_id="dev", password="pw")
+        restored.load_skeleton_from(data)
+        assert restored.config_skeleton == skeleton
+        assert not restored.skeleton_needs_refresh()
+
+    with pytest.raises(ValueError, match="No skeleton"):
+        IRegulClient(
+            host="test.local", port=443, device_id="d", password="p"
+        ).save_skeleton_binary()
+
+
+class TestSkeletonStore:
+    """Tests for skeleton sharing between clients."""
+
+    def test_identical_skeletons_share_structure(self, skeleton):
+        """Interning equal skeletons returns the same groups and entries."""
+        store = SkeletonStore()
+        first = store.intern(load_skeleton(dump_skeleton(skeleton)))
+        second = store.intern(load_skeleton(dump_skeleton(skeleton)))
+
+        assert first == second == skeleton
+        assert first is not second
+        assert all(first[group] is second[group] for group in first)
+        assert store.is_shared(first["B"]) and store.is_shared(first["B"][1])
+        assert store.group_count == len(skeleton)
+
+    def test_partially_equal_skeletons_share_entries(self):
+        """Entries with the same content are shared even across groups that differ."""
+        store = SkeletonStore()
+        a = store.intern({"B": {1: {"nom_registre": "Salon"}, 2: {"nom_registre": "A"}}})
+        b = store.intern({"B": {1: {"nom_registre": "Salon"}, 2: {"nom_registre": "B"}}})
+
+        assert a["B"] is not b["B"]
+        assert a["B"][1] is b["B"][1]
+        assert store.entry_count == 3
+
+    def test_value_types_are_not_conflated(self):
+        """1, 1.0 and True are distinct values for the store and the fingerprint."""
+        store = SkeletonStore()
+        values = [store.intern({"C": {0: {"x": v}}}) for v in (1, 1.0, True)]
+
+        assert [type(s["C"][0]["x"]) for s in values] == [int, float, bool]
+        assert len({SkeletonStore.fingerprint(s) for s in values}) == 3
+
+    def test_store_stays_bounded_across_refreshes(self):
+        """Parts of replaced skeletons are released by the store."""
+        store = SkeletonStore()
+        clients = [
+            IRegulClient(
+                host="test.local",
+                port=443,
+                device_id=f"dev{i}",
+                password="pw",
+                skeleton_store=store,
+            )
+            for i in range(3)
+        ]
+        for refresh in range(50):
+            for client in clients:
+                client.load_skeleton_from(
+                    json.dumps({"B": {"1": {"nom_registre": f"Salon {refresh}"}, "2": {"x": 1}}})
+                )
+            gc.collect()
+            # Only the current skeleton, shared by every client, is held
+            assert (store.group_count, store.entry_count) == (1, 2)
+
+        shared = clients[0].config_skeleton["B"]
+        assert store.is_shared(shared) and store.is_shared(shared[2])
+        del clients, client, shared
+        gc.collect()
+        assert (store.group_count, store.entry_count) == (0, 0)
+
+    def test_fingerprint_ignores_order(self):
+        """The fingerprint only depends on the content."""
+        a = {"B": {1: {"x": "1", "y": "2"}}, "A": {2: {}}}
+        b = {"A": {2: {}}, "B": {1: {"y": "2", "x": "1"}}}
+        assert SkeletonStore.fingerprint(a) == SkeletonStore.fingerprint(b)
+        assert SkeletonStore.fingerprint(a) != SkeletonStore.fingerprint({"A": {2: {}}})
+
+    @pytest.mark.asyncio
+    async def test_client_writes_copy_on_write(self):
+        """A 501 update changing a cached value leaves other clients untouched."""
+        store = SkeletonStore()
+        base = {"B": {1: {"nom_registre": "Salon"}, 2: {"nom_registre": "Cuisine"}}}
+        clients = [
+            IRegulClient(
+                host="test.local",
+                port=443,
+                device_id=f"dev{i}",
+                password="pw",
+                config_skeleton=base,
+                skeleton_store=store,
+            )
+            for i in range(2)
+        ]
+        shared_group = clients[0].config_skeleton["B"]
+        assert clients[1].config_skeleton["B"] is shared_group
+
+        response = "15/01/2025 23:38:51{10#B@1&nom_registre[Bureau]#B@2&valeur[3]}"
+        frame = await clients[0]._map_response("501", response, Timings("test"))
+
+        assert frame.modbus_registers[1].nom_registre == "Bureau"
+        assert clients[0].config_skeleton["B"][1] == {"nom_registre": "Bureau"}
+        assert clients[0].config_skeleton["B"][2] is shared_group[2]
+        assert shared_group[1] == {"nom_registre": "Salon"}
+        assert clients[1].config_skeleton["B"] is shared_group
+
+    @pytest.mark.asyncio
+    async def test_unchanged_values_keep_sharing(self):
+        """A 501 update repeating cached values does not copy anything."""
+        store = SkeletonStore()
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+            skeleton_store=store,
+        )
+        shared_group = client.config_skeleton["B"]
+
+        response = "15/01/2025 23:38:51{10#B@1&nom_registre[Salon]#B@1&valeur[3]}"
+        await client._map_response("501", response, Timings("test"))
+
+        assert client.config_skeleton["B"] is shared_group
+
+
+class TestSkeletonDirectory:
+    """Tests for skeleton persistence."""
+
+    def test_write_and_load(self, tmp_path, skeleton):
+        """A written skeleton loads back with its fingerprint and age."""
+        directory = SkeletonDirectory(tmp_path / "skeletons")
+
+        assert directory.load("dev/1") is None
+        assert directory.write("dev/1", skeleton)
+        assert not directory.write("dev/1", skeleton)
+
+        record = SkeletonDirectory(tmp_path / "skeletons").load("dev/1")
+        assert record is not None
+        assert record.skeleton == skeleton
+        assert record.fingerprint == SkeletonStore.fingerprint(skeleton)
+        assert 0 <= record.age < 60
+        assert directory.file_for("dev/1").parent == tmp_path / "skeletons"
+        assert not list((tmp_path / "skeletons").glob(".*"))
+
+    def test_unreadable_file_is_ignored(self, tmp_path, skeleton):
+        """Truncated or foreign files are skipped instead of raising."""
+        directory = SkeletonDirectory(tmp_path)
+        directory.write("dev", skeleton)
+        path = directory.file_for("dev")
+        path.write_bytes(path.read_bytes()[:40])
+        assert directory.load("dev") is None
+
+        path.write_bytes(b"{}")
+        assert directory.load("dev") is None
+
+    @pytest.mark.asyncio
+    async def test_saves_are_coalesced(self, tmp_path):
+        """Repeated saves produce a single write once the delay elapsed."""
+        directory = SkeletonDirectory(tmp_path, write_delay=timedelta(seconds=0.05))
+        skeleton = {"B": {1: {"nom_registre": "Salon"}}}
+        for name in ("A", "B", "C"):
+            skeleton["B"][1]["nom_registre"] = name
+            directory.save("dev", skeleton)
+        assert directory.pending_count == 1
+        assert directory.load("dev") is None
+
+        await asyncio.sleep(0.2)
+        assert directory.pending_count == 0
+        assert directory.load("dev").skeleton == {"B": {1: {"nom_registre": "C"}}}
+
+        # Unchanged content is not written again
+        mtime = directory.file_for("dev").stat().st_mtime_ns
+        directory.save("dev", skeleton)
+        await directory.flush()
+        assert directory.file_for("dev").stat().st_mtime_ns == mtime
+
+    @pytest.mark.asyncio
+    async def test_client_warm_starts_from_directory(self, tmp_path):
+        """A new client resumes with 501 using the skeleton saved by a previous one."""
+        async with FakeIRegulServer() as server:
+
+            def client(directory: SkeletonDirectory) -> IRegulClient:
+                return IRegulClient(
+                    host=server.host,
+                    port=server.port,
+                    device_id="dev",
+                    password="pw",
+                    skeleton_refresh_interval=timedelta(hours=1),
+                    skeleton_directory=directory,
+                )
+
+            directory = SkeletonDirectory(tmp_path)
+            first = await client(directory).get_data()
+            await directory.flush()
+
+            restarted = client(SkeletonDirectory(tmp_path))
+            second = await restarted.get_data()
+            assert server.stats.commands == {"502": 1, "501": 1}
+            assert second.zones == first.zones
+
+            # A skeleton older than the refresh interval is re-fetched
+            path = directory.file_for("dev")
+            data = bytearray(path.read_bytes())
+            struct.pack_into(">d", data, 5, time.time() - 7200)
+            path.write_bytes(bytes(data))
+            refreshing = SkeletonDirectory(tmp_path)
+            await client(refreshing).get_data()
+            assert server.stats.commands == {"502": 2, "501": 1}
+
+            # The identical skeleton returned by that 502 resets the stored age
+            await refreshing.flush()
+            assert SkeletonDirectory(tmp_path).load("dev").age < 60
+            await client(SkeletonDirectory(tmp_path)).get_data()
+            assert server.stats.commands == {"502": 2, "501": 2}
+
+    @pytest.mark.asyncio
+    async def test_explicit_skeleton_takes_precedence(self, tmp_path):
+        """A skeleton passed to the constructor is not replaced by the stored one."""
+        directory = SkeletonDirectory(tmp_path)
+        directory.write("dev", {"B": {1: {"nom_registre": "Stored"}}})
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            config_skeleton={"B": {1: {"nom_registre": "Given"}}},
+            skeleton_directory=directory,
+        )
+        await client._warm_start()
+        assert client.config_skeleton == {"B": {1: {"nom_registre": "Given"}}}
@@ -0,0 +1,165 @@
+"""Tests for the fake IRegul socket server."""
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from src.aioiregul.testing import (
+    FakeIRegulServer,
+    changing_frames,
+    generate_frame,
+    generate_groups,
+    load_frames,
+)
+from src.aioiregul.v2.client import IRegulClient
+from src.aioiregul.v2.decoder import decode_text
+
+V2_DATA_DIR = Path(__file__).parent / "data" / "v2messages"
+
+
+def _client(server: FakeIRegulServer, device_id: str = "dev", password: str = "pw"):
+    return IRegulClient(
+        host=server.host,
+        port=server.port,
+        device_id=device_id,
+        password=password,
+        timeout=5.0,
+    )
+
+
+class TestFrameGeneration:
+    """Tests for synthetic frames."""
+
+    @pytest.mark.asyncio
+    async def test_generated_frame_roundtrips_through_decoder(self):
+        """Generated frames decode back to the same groups."""
+        groups = generate_groups(zones=1, inputs=1, outputs=1, measurements=2, seed=1)
+        frame = generate_frame(groups, is_old=True, timestamp=datetime(2025, 1, 15, 23, 38, 51))
+
+        decoded = await decode_text(frame.decode())
+
+        assert decoded.is_old
+        assert decoded.timestamp == datetime(2025, 1, 15, 23, 38, 51)
+        assert decoded.groups["M"][2]["alias"] == "Mesure 2"
+        assert decoded.groups["Z"][1]["consigne_normal"] == 21
+
+    def test_fields_filter(self):
+        """Only the requested fields are encoded."""
+        frame = generate_frame(
+            {"I": {1: {"alias": "Entree 1", "valeur": True}}},
+            timestamp=datetime(2025, 1, 15),
+            fields={"valeur"},
+        )
+        assert frame == b"15/01/2025 00:00:00{10#I@1&valeur[1]}"
+
+    def test_load_frames_orders_old_first(self):
+        """Captured frames are loaded per command, OLD before NEW."""
+        frames = load_frames(V2_DATA_DIR)
+        assert set(frames) == {"501", "502"}
+        assert frames["502"][0].startswith(b"OLD")
+        assert not frames["502"][1].startswith(b"OLD")
+
+
+class TestFakeIRegulServer:
+    """End-to-end tests of IRegulClient against the fake server."""
+
+    @pytest.mark.asyncio
+    async def test_replays_captured_frames(self):
+        """The client polls captured frames through the fake server."""
+        async with FakeIRegulServer(load_frames(V2_DATA_DIR)) as server:
+            client = _client(server)
+            frame = await client.get_data()
+            frame_501 = await client.get_data()
+
+        assert frame is not None and len(frame.measurements) == 58
+        assert frame_501 is not None
+        assert server.stats.commands == {"502": 1, "501": 1}
+
+    @pytest.mark.asyncio
+    async def test_default_device_supports_all_commands(self):
+        """The synthetic device answers data, auth and defrost commands."""
+        async with FakeIRegulServer() as server:
+            client = _client(server)
+            frame = await client.get_data()
+            assert frame is not None and len(frame.zones) == 2
+            assert await client.check_auth()
+            assert await client.defrost()
+
+    @pytest.mark.asyncio
+    async def test_invalid_credentials_rejected(self):
+        """Unknown credentials get no reply and are counted."""
+        async with FakeIRegulServer(devices={"dev": "pw"}) as server:
+            assert await _client(server).check_auth()
+            assert not await _client(server, password="wrong").check_auth()
+
+        assert server.stats.auth_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_changing_frames(self):
+        """Every poll of the changing device decodes new values."""
+        async with FakeIRegulServer(changing_frames()) as server:
+            client = _client(server)
+            frames = [await client.get_data() for _ in range(3)]
+
+        assert server.stats.commands == {"502": 1, "501": 2}
+        values = [[m.valeur for m in frame.measurements.values()] for frame in frames]
+        assert values[0] != values[1] != values[2]
+        assert all("merge" in frame.timings.phases for frame in frames)
+
+    @pytest.mark.asyncio
+    async def test_per_device_frame_source(self):
+        """A callable frame source receives the authenticated device id."""
+        seen = []
+
+        def frames(device_id, command):
+            seen.append((device_id, command))
+            groups = {"B": {1: {"nom_registre": device_id}}}
+            return [generate_frame(groups, is_old=True), generate_frame(groups)]
+
+        async with FakeIRegulServer(frames, devices={"a": "1", "b": "2"}) as server:
+            frame = await _client(server, device_id="b", password="2").get_data()
+
+        assert seen == [("b", "502")]
+        assert frame is not None
+        assert frame.modbus_registers[1].nom_registre == "b"
+
+    @pytest.mark.asyncio
+    async def test_partial_throttled_writes(self):
+        """Throttled replies arrive in several chunks and still decode."""
+        async with FakeIRegulServer(chunk_size=64, bytes_per_second=200_000) as server:
+            frame = await _client(server).get_data()
+
+        assert frame is not None
+        assert server.stats.bytes_sent > 64
+
+    @pytest.mark.asyncio
+    async def test_latency(self):
+        """Replies are delayed by the configured latency."""
+        async with FakeIRegulServer(latency=0.05) as server:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await _client(server).get_data()
+            assert loop.time() - start >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_disconnect_every_other_connection(self):
+        """Every second connection is aborted mid-frame."""
+        async with FakeIRegulServer(disconnect_after=20, disconnect_every=2) as server:
+            assert await _client(server).get_data() is not None
+            with pytest.raises(ValueError, match="Incomplete response"):
+                await _client(server).get_data()
+
+        assert server.stats.disconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_many_concurrent_devices(self):
+        """Hundreds of simulated devices are served concurrently."""
+        async with FakeIRegulServer(latency=0.01) as server:
+            clients = [_client(server, device_id=f"dev{i}") for i in range(300)]
+            frames = await asyncio.gather(*(client.get_data() for client in clients))
+
+        assert all(frame is not None for frame in frames)
+        assert server.stats.connections == 300
+        assert server.stats.peak_connections > 1
+        assert server.stats.active_connections == 0
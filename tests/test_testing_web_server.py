@@ -0,0 +1,94 @@
+"""Tests for the fake IRegul v1 web server."""
+
+from datetime import timedelta
+from pathlib import Path
+
+import aiohttp
+import pytest
+from src.aioiregul.testing import FakeIRegulWebServer, generate_status_page, load_pages
+from src.aioiregul.v1 import CannotConnect, Device, InvalidAuth
+from src.aioiregul.v1.fleet import DeviceFleet
+from src.aioiregul.v1.parser import scan_page
+
+STATIC_DIR = Path(__file__).parent / "data" / "static"
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+        yield session
+
+
+def _device(session, server, device_id="dev", password="pw", **kwargs):
+    return Device(session, device_id=device_id, password=password, base_url=server.url, **kwargs)
+
+
+def test_generated_page_scans_back():
+    """Generated status pages hold the given rows."""
+    page = generate_status_page([("T° <ext>", 12.5, "°C"), ("Sortie", 1, "")])
+    assert scan_page(page).rows == [("T° <ext>", "12.5", "°C"), ("Sortie", "1", "")]
+
+
+class TestFakeIRegulWebServer:
+    """End-to-end tests of v1.Device against the fake web server."""
+
+    @pytest.mark.asyncio
+    async def test_serves_recorded_pages(self, session):
+        """The device logs in, refreshes and collects the recorded pages."""
+        async with FakeIRegulWebServer(load_pages(STATIC_DIR)) as server:
+            device = _device(session, server, frame_max_age=None)
+            frame = await device.get_data()
+            assert await device.defrost()
+
+        assert frame is not None
+        assert len(frame.analog_sensors) == 15 and len(frame.outputs) == 18
+        assert server.stats.logins == 1
+        assert server.stats.requests == {"main": 1, "login": 1, "etat": 5, "processform": 1}
+
+    @pytest.mark.asyncio
+    async def test_invalid_credentials_rejected(self, session):
+        """Unknown credentials are refused and counted."""
+        async with FakeIRegulWebServer(devices={"dev": "pw"}) as server:
+            with pytest.raises(InvalidAuth):
+                await _device(session, server, password="wrong").check_auth()
+            assert await _device(session, server).check_auth()
+
+        assert (server.stats.auth_failures, server.stats.logins) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_expired_session_triggers_login(self, session):
+        """Pages requested after the session expired redirect to the login page."""
+        async with FakeIRegulWebServer() as server:
+            device = _device(session, server, frame_max_age=timedelta(0))
+            assert await device.get_data() is not None
+            server.expire_sessions()
+            assert await device.get_data() is not None
+
+        assert server.stats.logins == 2
+        assert server.stats.expired >= 1
+
+    @pytest.mark.asyncio
+    async def test_fault_injection(self, session):
+        """Injected errors give empty pages and dropped connections fail the poll."""
+        async with FakeIRegulWebServer(error_every=4, latency=0.01) as server:
+            frame = await _device(session, server).get_data()
+        assert frame is not None and frame.measurements == {}
+        assert server.stats.errors == 1
+
+        async with FakeIRegulWebServer(disconnect_every=1) as server:
+            with pytest.raises(CannotConnect):
+                await _device(session, server).get_data()
+        assert server.stats.disconnects >= 1
+
+    @pytest.mark.asyncio
+    async def test_fleet_concurrency(self):
+        """A fleet polls the devices through one server with bounded concurrency."""
+        server = FakeIRegulWebServer(latency=0.01)
+        async with server, DeviceFleet(max_concurrent=3, base_url=server.url) as fleet:
+            for i in range(6):
+                fleet.add(f"dev{i}", "pw", max_concurrent_pages=1)
+            frames = await fleet.poll()
+
+        assert all(frame is not None for frame in frames.values())
+        assert server.stats.logins == 6
+        assert server.stats.peak_requests == 3
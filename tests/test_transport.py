@@ -0,0 +1,316 @@
+"""Tests for the v2 frame transports."""
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from src.aioiregul.testing import FakeIRegulServer, load_frames
+from src.aioiregul.v2.capture import RecordingTransport, ReplayTransport, read_capture
+from src.aioiregul.v2.client import IRegulClient
+from src.aioiregul.v2.transport import (
+    FrameProtocol,
+    ProtocolConnection,
+    ProtocolTransport,
+    StreamTransport,
+)
+
+V2_DATA_DIR = Path(__file__).parent / "data" / "v2messages"
+
+
+@pytest.fixture
+async def frame_server() -> AsyncIterator[Callable[[list[bytes]], Awaitable[int]]]:
+    """Start local servers replying with the given chunks, returning their port."""
+    servers: list[asyncio.Server] = []
+
+    async def start(chunks: list[bytes]) -> int:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.readuntil(b"}")
+            for chunk in chunks:
+                writer.write(chunk)
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    yield start
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+class TestFrameProtocol:
+    """Unit tests for FrameProtocol framing."""
+
+    @pytest.mark.asyncio
+    async def test_frame_split_across_chunks(self):
+        """A frame delivered in several chunks is returned once complete."""
+        protocol = FrameProtocol()
+        protocol.data_received(b"OLD01/01/2025 00:00:00{10#")
+        protocol.data_received(b"mem@0&etat[10]")
+        assert not protocol._frames
+        protocol.data_received(b"}")
+
+        assert await protocol.read_frame() == b"OLD01/01/2025 00:00:00{10#mem@0&etat[10]}"
+        assert protocol.bytes_received == 41
+
+    @pytest.mark.asyncio
+    async def test_multiple_frames_in_one_chunk(self):
+        """Several frames in a single chunk are all extracted in order."""
+        protocol = FrameProtocol()
+        protocol.data_received(b"OLD{1#}{2#}{3")
+
+        assert await protocol.read_frame() == b"OLD{1#}"
+        assert await protocol.read_frame() == b"{2#}"
+        protocol.data_received(b"#}")
+        assert await protocol.read_frame() == b"{3#}"
+
+    @pytest.mark.asyncio
+    async def test_scan_offset_skips_scanned_bytes(self):
+        """The scan offset advances so earlier bytes are not searched again."""
+        protocol = FrameProtocol()
+        protocol.data_received(b"x" * 1000)
+        assert protocol._scan_offset == 1000
+        protocol.data_received(b"y" * 10)
+        assert protocol._scan_offset == 1010
+
+    @pytest.mark.asyncio
+    async def test_read_waits_for_data(self):
+        """read_frame waits until a frame is completed."""
+        protocol = FrameProtocol()
+        pending = asyncio.ensure_future(protocol.read_frame())
+        await asyncio.sleep(0)
+        assert not pending.done()
+
+        protocol.data_received(b"{10#}")
+        assert await pending == b"{10#}"
+
+    @pytest.mark.asyncio
+    async def test_eof_mid_frame_raises_incomplete_read(self):
+        """Closing the connection mid-frame raises IncompleteReadError."""
+        protocol = FrameProtocol()
+        protocol.data_received(b"{10#mem")
+        protocol.connection_lost(None)
+
+        with pytest.raises(asyncio.IncompleteReadError) as exc_info:
+            await protocol.read_frame()
+        assert exc_info.value.partial == b"{10#mem"
+
+    @pytest.mark.asyncio
+    async def test_connection_error_raises(self):
+        """A connection lost with an error raises ConnectionError."""
+        protocol = FrameProtocol()
+        protocol.connection_lost(OSError("reset"))
+
+        with pytest.raises(ConnectionError, match="reset"):
+            await protocol.read_frame()
+
+    @pytest.mark.asyncio
+    async def test_send_waits_while_writing_is_paused(self):
+        """send returns once the transport resumes writing."""
+        protocol = FrameProtocol()
+        written = []
+        transport = Mock(spec=asyncio.Transport, write=written.append)
+        connection = ProtocolConnection(transport, protocol)
+
+        protocol.pause_writing()
+        pending = asyncio.ensure_future(connection.send(b"cdraminfo{501#}"))
+        await asyncio.sleep(0)
+        assert written == [b"cdraminfo{501#}"]
+        assert not pending.done()
+
+        protocol.resume_writing()
+        await asyncio.wait_for(pending, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_send_fails_when_lost_while_paused(self):
+        """A connection lost while writing is paused fails the pending send."""
+        protocol = FrameProtocol()
+        connection = ProtocolConnection(Mock(spec=asyncio.Transport), protocol)
+
+        protocol.pause_writing()
+        pending = asyncio.ensure_future(connection.send(b"{501#}"))
+        await asyncio.sleep(0)
+        protocol.connection_lost(None)
+
+        with pytest.raises(ConnectionResetError):
+            await asyncio.wait_for(pending, timeout=1)
+
+
+class TestProtocolTransport:
+    """End-to-end tests against a local server."""
+
+    @pytest.mark.asyncio
+    async def test_large_frame_has_no_size_limit(self, frame_server):
+        """Frames larger than the stream limit are read by the protocol transport."""
+        frame = b"01/01/2025 00:00:00{1#" + b"M@1&alias[x]#" * 20000 + b"}"
+        assert len(frame) > 100000
+        chunks = [frame[i : i + 4096] for i in range(0, len(frame), 4096)]
+        port = await frame_server(chunks)
+
+        connection = await ProtocolTransport().connect("127.0.0.1", port)
+        try:
+            await connection.send(b"cdraminfodevpw{502#}")
+            assert await connection.read_frame() == frame
+        finally:
+            await connection.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_transport_rejects_large_frame(self, frame_server):
+        """The stream transport still enforces its buffer limit."""
+        frame = b"{" + b"x" * 2000 + b"}"
+        port = await frame_server([frame])
+
+        connection = await StreamTransport(limit=1000).connect("127.0.0.1", port)
+        try:
+            await connection.send(b"cdraminfodevpw{502#}")
+            with pytest.raises(asyncio.LimitOverrunError):
+                await connection.read_frame()
+        finally:
+            await connection.close()
+
+    @pytest.mark.asyncio
+    async def test_client_default_transport_with_real_frames(self, frame_server):
+        """IRegulClient reads OLD then NEW 502 frames through the default transport."""
+        old = (V2_DATA_DIR / "502-OLD.txt").read_bytes()
+        new = (V2_DATA_DIR / "502-NEW.txt").read_bytes()
+        payload = old + new
+        chunks = [payload[i : i + 1500] for i in range(0, len(payload), 1500)]
+        port = await frame_server(chunks)
+
+        client = IRegulClient(host="127.0.0.1", port=port, device_id="dev", password="pw")
+        assert isinstance(client.transport, ProtocolTransport)
+
+        frame = await client.get_data()
+
+        assert frame is not None
+        assert not frame.is_old
+        assert len(frame.measurements) == 58
+        assert client.config_skeleton is not None
+
+
+class TestCapture:
+    """Tests for the recording and replay transports."""
+
+    @staticmethod
+    async def _record(path: Path, polls: int = 2, latency: float = 0.0) -> list:
+        recorder = RecordingTransport(path)
+        async with FakeIRegulServer(load_frames(V2_DATA_DIR), latency=latency) as server:
+            client = IRegulClient(
+                host=server.host,
+                port=server.port,
+                device_id="dev",
+                password="pw",
+                transport=recorder,
+            )
+            frames = [await client.get_data() for _ in range(polls)]
+        recorder.close()
+        return frames
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", ["poll.cap", "poll.cap.gz"])
+    async def test_record_then_replay(self, tmp_path, name):
+        """Replaying a capture reproduces the recorded frames."""
+        path = tmp_path / name
+        recorded = await self._record(path)
+
+        kinds = [record.kind for record in read_capture(path)]
+        assert kinds == [b"C", b"S", b"F", b"F"] * 2
+
+        client = IRegulClient(
+            host="replay",
+            port=1,
+            device_id="dev",
+            password="pw",
+            transport=ReplayTransport(path, speed=None),
+        )
+        replayed = [await client.get_data() for _ in range(2)]
+
+        assert replayed == recorded
+        with pytest.raises(ConnectionError, match="Capture exhausted"):
+            await client.get_data()
+
+    @pytest.mark.asyncio
+    async def test_replay_paces_frames(self, tmp_path):
+        """Replay at original speed keeps the recorded delays, scaled by speed."""
+        path = tmp_path / "slow.cap"
+        await self._record(path, polls=1, latency=0.1)
+
+        loop = asyncio.get_running_loop()
+        transport = ReplayTransport(path, speed=2.0, loop=True)
+        for _ in range(2):
+            connection = await transport.connect("replay", 1)
+            start = loop.time()
+            await connection.read_frame()
+            assert loop.time() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_record_concurrent_clients(self, tmp_path):
+        """Frames of connections open at the same time replay on their own connection."""
+        path = tmp_path / "fleet.cap"
+        recorder = RecordingTransport(path)
+        async with FakeIRegulServer(load_frames(V2_DATA_DIR), frame_gap=0.01) as server:
+            clients = [
+                IRegulClient(
+                    host=server.host,
+                    port=server.port,
+                    device_id=f"dev{i}",
+                    password="pw",
+                    transport=recorder,
+                )
+                for i in range(3)
+            ]
+            recorded = await asyncio.gather(*(client.get_data() for client in clients))
+        recorder.close()
+
+        records = list(read_capture(path))
+        # The frames of the three connections are interleaved in the file
+        assert [r.connection for r in records if r.kind == b"C"] == [0, 1, 2]
+        frames = [r.connection for r in records if r.kind == b"F"]
+        assert sorted(frames) == [0, 0, 1, 1, 2, 2]
+        assert frames != sorted(frames)
+
+        transport = ReplayTransport(path, speed=None)
+        assert [len(session.frames) for session in transport.sessions] == [2, 2, 2]
+        replayed = await asyncio.gather(
+            *(
+                IRegulClient(
+                    host="replay", port=1, device_id=f"dev{i}", password="pw", transport=transport
+                ).get_data()
+                for i in range(3)
+            )
+        )
+        assert replayed == recorded
+
+    def test_records_are_written_off_the_event_loop_thread(self, tmp_path):
+        """Records are buffered and written in chunks by the writer thread."""
+        path = tmp_path / "big.cap"
+        recorder = RecordingTransport(path)
+        writers = []
+        write = recorder._stream.write
+
+        def tracking_write(data):
+            writers.append(threading.get_ident())
+            return write(data)
+
+        recorder._stream.write = tracking_write
+        recorder.record(b"F", b"x" * 70_000)
+        recorder.record(b"F", b"y}", connection=1)
+        assert len(writers) <= 1
+        recorder.close()
+
+        assert len(writers) == 2 and threading.get_ident() not in writers
+        records = list(read_capture(path))
+        assert [(len(r.payload), r.connection) for r in records] == [(70_000, 0), (2, 1)]
+
+    def test_rejects_unknown_file(self, tmp_path):
+        """A file without the capture magic is rejected."""
+        path = tmp_path / "bad.cap"
+        path.write_bytes(b"not a capture")
+        with pytest.raises(ValueError, match="Not an IRegul capture"):
+            ReplayTransport(path)
@@ -1,9 +1,12 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta
 
 import aiohttp
 import pytest
 import src.aioiregul.v1 as v1
 from aiohttp import web
+from src.aioiregul.v1.fleet import DeviceFleet
 
 
 def _html_no_table() -> str:
@@ -332,3 +335,380 @@ async def test_defrost_non_success(server_bad_update):
         dev.iregulApiBaseUrl = f"{server_bad_update}/modules/i-regul/"
         res = await dev.defrost()
         assert res is False
+
+
+@pytest.mark.asyncio
+async def test_get_data_timings(mock_server):
+    reported = []
+    async with aiohttp.ClientSession() as session:
+        dev = v1.Device(
+            session,
+            host="localhost",
+            port=8780,
+            device_id="user",
+            password="pass",
+            timings_hook=reported.append,
+        )
+        dev.base_url = f"{mock_server}/modules/"
+        dev.main_url = f"{mock_server}/modules/login/main.php"
+        dev.login_url = f"{mock_server}/modules/login/process.php"
+        dev.iregulApiBaseUrl = f"{mock_server}/modules/i-regul/"
+        res = await dev.get_data()
+
+    assert res is not None and res.timings is not None
+    # The first refresh is skipped, so only the page requests are recorded
+    assert list(res.timings.phases) == [
+        "auth",
+        "collect_sorties",
+        "collect_sondes",
+        "collect_entrees",
+        "collect_mesures",
+        "map",
+    ]
+    assert res.timings.bytes_received > 0
+    assert reported == [res.timings]
+
+
+@pytest.fixture
+async def slow_pages_server():
+    """Server holding the status pages until ``overlap`` of them are in flight.
+
+    The pages record their overlap; none is answered before ``overlap`` pages
+    are served at the same time.
+    """
+    state = {"running": 0, "peak": 0, "overlap": 1, "released": asyncio.Event()}
+
+    async def login_main(request):
+        return web.Response(text="<div id='btn_i-regul'></div>", content_type="text/html")
+
+    async def etat_page(request):
+        etat = request.query.get("Etat", "").lower()
+        if etat == state.get("fail"):
+            request.transport.close()
+            return web.Response()
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            if state["running"] >= state["overlap"]:
+                state["released"].set()
+            await state["released"].wait()
+        finally:
+            state["running"] -= 1
+        content = f"<table id='tbl_etat'><tr><td id='ali_td_tbl_etat'>{etat}</td><td id='val_td_tbl_etat'>1</td><td id='unit_td_tbl_etat'>unit</td></tr></table>"
+        return web.Response(text=content, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/modules/login/main.php", login_main)
+    app.router.add_get("/modules/i-regul/index-Etat.php", etat_page)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 8785)
+    await site.start()
+
+    yield "http://localhost:8785", state
+
+    state["released"].set()
+    await runner.cleanup()
+
+
+def _slow_device(session, base, **kwargs):
+    dev = v1.Device(session, host="localhost", port=8785, device_id="u", password="p", **kwargs)
+    dev.main_url = f"{base}/modules/login/main.php"
+    dev.iregulApiBaseUrl = f"{base}/modules/i-regul/"
+    return dev
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("max_pages", "peak"), [(4, 4), (2, 2), (1, 1)])
+async def test_pages_collected_concurrently(slow_pages_server, max_pages, peak):
+    """Status pages overlap, up to the per-device cap."""
+    base, state = slow_pages_server
+    state["overlap"] = peak
+    async with aiohttp.ClientSession() as session:
+        dev = _slow_device(session, base, max_concurrent_pages=max_pages)
+        # Pages collected one after the other never reach the overlap
+        res = await asyncio.wait_for(dev.get_data(), timeout=5)
+
+    assert res is not None
+    assert [data.alias for data in res.outputs.values()] == ["sorties"]
+    assert [data.alias for data in res.measurements.values()] == ["mesures"]
+    assert state["peak"] == peak
+    assert list(res.timings.phases)[1:5] == [
+        "collect_sorties",
+        "collect_sondes",
+        "collect_entrees",
+        "collect_mesures",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_page_failure_cancels_other_pages(slow_pages_server):
+    """A failing page raises CannotConnect without waiting for the other pages."""
+    base, state = slow_pages_server
+    state["fail"] = "sondes"
+    # The other pages are held until the end of the test
+    state["overlap"] = len(v1._PAGES) + 1
+    async with aiohttp.ClientSession() as session:
+        dev = _slow_device(session, base)
+        with pytest.raises(v1.CannotConnect):
+            await asyncio.wait_for(dev.get_data(), timeout=5)
+    assert not state["released"].is_set()
+
+
+def test_invalid_page_concurrency():
+    with pytest.raises(ValueError, match="max_concurrent_pages"):
+        v1.Device(None, host="localhost", device_id="u", password="p", max_concurrent_pages=0)
+
+
+@pytest.fixture
+async def session_server():
+    """Server keeping a login session in a cookie and counting requests."""
+    state = {"main": 0, "login": 0, "pages": 0, "sessions": set()}
+
+    def logged_in(request):
+        return request.cookies.get("PHPSESSID") in state["sessions"]
+
+    def login_page():
+        return web.Response(
+            text="<form><input name='sublogin' value='1'><input name='pass'></form>",
+            content_type="text/html",
+        )
+
+    async def login_main(request):
+        state["main"] += 1
+        if not logged_in(request):
+            return login_page()
+        return web.Response(text="<div id='btn_i-regul'></div>", content_type="text/html")
+
+    async def login_process(request):
+        state["login"] += 1
+        session_id = f"s{state['login']}"
+        state["sessions"].add(session_id)
+        response = web.Response(text="<div id='btn_i-regul'></div>", content_type="text/html")
+        response.set_cookie("PHPSESSID", session_id)
+        return response
+
+    async def etat_page(request):
+        if not logged_in(request):
+            return login_page()
+        state["pages"] += 1
+        etat = request.query.get("Etat", "").lower()
+        content = f"<table id='tbl_etat'><tr><td id='ali_td_tbl_etat'>{etat}</td><td id='val_td_tbl_etat'>1</td><td id='unit_td_tbl_etat'>unit</td></tr></table>"
+        return web.Response(text=content, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/modules/login/main.php", login_main)
+    app.router.add_post("/modules/login/process.php", login_process)
+    app.router.add_get("/modules/i-regul/index-Etat.php", etat_page)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 8786)
+    await site.start()
+
+    yield "http://localhost:8786", state
+
+    await runner.cleanup()
+
+
+def _session_device(session, base, **kwargs):
+    # Every poll reaches the server unless a test enables the frame cache
+    kwargs.setdefault("frame_max_age", timedelta(0))
+    dev = v1.Device(session, host="localhost", port=8786, device_id="u", password="p", **kwargs)
+    dev.main_url = f"{base}/modules/login/main.php"
+    dev.login_url = f"{base}/modules/login/process.php"
+    dev.iregulApiBaseUrl = f"{base}/modules/i-regul/"
+    return dev
+
+
+@pytest.mark.asyncio
+async def test_auth_probe_skipped_while_session_valid(session_server):
+    """Only the first poll probes login/main.php; expiry triggers a single re-login."""
+    base, state = session_server
+    async with aiohttp.ClientSession() as session:
+        dev = _session_device(session, base, refresh_rate=timedelta(hours=1))
+        assert await dev.get_data() is not None
+        res = await dev.get_data()
+        assert res is not None and "auth" not in res.timings.phases
+        assert (state["main"], state["login"]) == (1, 1)
+
+        # The server drops the session: the pages answer with the login form
+        state["sessions"].clear()
+        res = await dev.get_data()
+        assert res is not None and len(res.outputs) == 1
+        assert (state["main"], state["login"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_auth_probed_after_session_ttl(session_server):
+    """An old session, or one without cookie, is probed again."""
+    base, state = session_server
+    async with aiohttp.ClientSession() as session:
+        dev = _session_device(session, base, session_ttl=timedelta(minutes=20))
+        await dev.get_data()
+        await dev.get_data()
+        assert state["main"] == 1
+
+        # Age the session past its TTL instead of waiting for it
+        dev._authenticated_at -= dev.session_ttl.total_seconds()
+        await dev.get_data()
+        assert state["main"] == 2
+
+        session.cookie_jar.clear()
+        await dev.get_data()
+        assert state["main"] == 3
+
+
+@pytest.mark.asyncio
+async def test_pages_parsed_in_executor(mock_server):
+    """Pages parsed in a process pool give the same frame as the default pool."""
+    frames = []
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for parse_executor in (None, executor):
+            async with aiohttp.ClientSession() as session:
+                dev = v1.Device(
+                    session,
+                    host="localhost",
+                    port=8780,
+                    device_id="u",
+                    password="p",
+                    parse_executor=parse_executor,
+                )
+                dev.main_url = f"{mock_server}/modules/login/main.php"
+                dev.login_url = f"{mock_server}/modules/login/process.php"
+                dev.iregulApiBaseUrl = f"{mock_server}/modules/i-regul/"
+                frames.append(await dev.get_data())
+
+    default, pooled = frames
+    assert pooled is not None and default is not None
+    assert pooled.outputs == default.outputs
+    assert pooled.measurements == default.measurements
+    assert v1._scan_status_page(_html_no_table()) is None
+
+
+@pytest.mark.asyncio
+async def test_login_checks_parsed_in_executor(mock_server):
+    """Login pages are scanned in the parse executor, not on the event loop."""
+    scanned = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            scanned.append(fn)
+            return super().submit(fn, *args, **kwargs)
+
+    with RecordingExecutor(max_workers=1) as executor:
+        async with aiohttp.ClientSession() as session:
+            dev = v1.Device(
+                session,
+                host="localhost",
+                port=8780,
+                device_id="u",
+                password="p",
+                parse_executor=executor,
+            )
+            dev.main_url = f"{mock_server}/modules/login/main.php"
+            dev.login_url = f"{mock_server}/modules/login/process.php"
+            dev.iregulApiBaseUrl = f"{mock_server}/modules/i-regul/"
+            assert await dev.get_data() is not None
+
+    assert v1._is_logged_in in scanned
+    assert v1._scan_status_page in scanned
+
+
+@pytest.mark.asyncio
+async def test_frame_cached_within_refresh_window(session_server):
+    """Polls within the refresh window are served without any request."""
+    base, state = session_server
+    async with aiohttp.ClientSession() as session:
+        dev = _session_device(session, base, refresh_rate=timedelta(hours=1), frame_max_age=None)
+        first = await dev.get_data()
+        assert first is not None
+        assert await dev.get_data() is first
+        assert (state["main"], state["pages"]) == (1, 4)
+
+        # Once the window is over, the pages are collected again
+        dev._last_frame_at -= 3600
+        second = await dev.get_data()
+        assert second is not None and second is not first
+        assert state["pages"] == 8
+
+        dev.frame_max_age = timedelta(hours=2)
+        dev._last_frame_at -= 3600
+        assert await dev.get_data() is second
+
+
+@pytest.mark.asyncio
+async def test_fleet_shares_connector_with_isolated_cookies(session_server):
+    """Devices share the connector but each keeps its own login session."""
+    base, state = session_server
+    async with DeviceFleet(
+        host="localhost", port=8786, max_concurrent=2, frame_max_age=timedelta(0)
+    ) as fleet:
+        for device_id in ("a", "b", "c"):
+            dev = fleet.add(device_id, "p")
+            dev.main_url = f"{base}/modules/login/main.php"
+            dev.login_url = f"{base}/modules/login/process.php"
+            dev.iregulApiBaseUrl = f"{base}/modules/i-regul/"
+        with pytest.raises(ValueError, match="already"):
+            fleet.add("a", "p")
+
+        frames = await fleet.poll()
+        assert all(len(frame.outputs) == 1 for frame in frames.values())
+        assert state["login"] == 3
+        sessions = [dev._http_session for dev in fleet.devices.values()]
+        assert {s.connector for s in sessions} == {fleet.connector}
+        assert len({id(s.cookie_jar) for s in sessions}) == 3
+
+        # Only the device whose session expired logs in again
+        state["sessions"].discard("s2")
+        frames = await fleet.poll()
+        assert all(len(frame.outputs) == 1 for frame in frames.values())
+        assert state["login"] == 4
+
+    assert all(s.closed for s in sessions)
+    with pytest.raises(RuntimeError, match="closed"):
+        fleet.add("d", "p")
+
+
+def test_rows_mapped_with_cached_layout():
+    """Rows are mapped positionally until the aliases or units change."""
+    dev = v1.Device(None, host="localhost", port=80, device_id="u", password="p")  # type: ignore[arg-type]
+    rows = [("Énergie", "1.5", "MWh"), ("Énergie", "2", "KWh"), ("T° ext", "3", "°")]
+    first = dev._Device__map_rows("mesures", rows)
+    assert first["energie"] == v1.IRegulData("energie", "Énergie", v1.Decimal("1502.0"), "KWh")
+    assert first["tdeg-ext"].value == 3
+    layout = dev._layouts["mesures"]
+
+    second = dev._Device__map_rows("mesures", [(a, "4", u) for a, _, u in rows])
+    assert dev._layouts["mesures"] is layout
+    assert (second["energie"].value, second["tdeg-ext"].value) == (4004, 4)
+
+    third = dev._Device__map_rows("mesures", [*rows[:2], ("T° int", "5", "°")])
+    assert dev._layouts["mesures"] is not layout
+    assert list(third) == ["energie", "tdeg-int"]
+
+
+@pytest.mark.asyncio
+async def test_get_data_selected_groups(session_server):
+    """Only the pages backing the requested groups are collected."""
+    base, state = session_server
+    async with aiohttp.ClientSession() as session:
+        dev = _session_device(session, base, refresh_rate=timedelta(hours=1), frame_max_age=None)
+        res = await dev.get_data(groups={"measurements", "analog_sensors"})
+        assert res is not None and state["pages"] == 2
+        assert len(res.measurements) == len(res.analog_sensors) == 1
+        assert res.outputs == res.inputs == {}
+        assert [p for p in res.timings.phases if p.startswith("collect_")] == [
+            "collect_sondes",
+            "collect_mesures",
+        ]
+
+        # The cached frame serves its groups only
+        assert await dev.get_data(groups=["measurements"]) is res
+        full = await dev.get_data()
+        assert full is not None and full is not res and state["pages"] == 6
+        assert await dev.get_data(groups={"inputs"}) is full
+
+        with pytest.raises(ValueError, match="zones"):
+            await dev.get_data(groups={"zones"})
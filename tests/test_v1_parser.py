@@ -0,0 +1,62 @@
+"""Parity of the v1 page scanner with BeautifulSoup."""
+
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+from src.aioiregul.v1.parser import scan_page
+
+STATIC_DIR = Path(__file__).parent / "data" / "static"
+CELL_IDS = ("ali_td_tbl_etat", "val_td_tbl_etat", "unit_td_tbl_etat")
+
+
+def soup_rows(html):
+    """Rows of the status table as extracted by the former BeautifulSoup code."""
+    table = BeautifulSoup(html, "html.parser").find("table", attrs={"id": "tbl_etat"})
+    if table is None:
+        return None
+    rows = []
+    for row in table.find_all("tr"):
+        cells = [row.find("td", attrs={"id": cell_id}) for cell_id in CELL_IDS]
+        if None not in cells:
+            rows.append(tuple(cell.get_text(strip=True) for cell in cells))
+    return rows
+
+
+@pytest.mark.parametrize("page", sorted(p.name for p in STATIC_DIR.glob("*.html")))
+def test_static_pages_match_beautifulsoup(page):
+    """Rows and login markers match BeautifulSoup on the recorded pages."""
+    html = (STATIC_DIR / page).read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "html.parser")
+    scan = scan_page(html)
+
+    expected = soup_rows(html)
+    assert scan.has_table == (expected is not None)
+    assert scan.rows == (expected or [])
+    assert scan.logged_in == (soup.find("div", attrs={"id": "btn_i-regul"}) is not None)
+    assert scan.login_form == (soup.find("input", attrs={"name": "sublogin"}) is not None)
+
+
+def test_malformed_rows():
+    """Unclosed cells, incomplete rows and nested tables are handled."""
+    html = (
+        "<table id='tbl_etat'>"
+        "<tr><td id='ali_td_tbl_etat'> A &amp; <b>B</b> <td id='val_td_tbl_etat'>1"
+        "<td id='unit_td_tbl_etat'>°C</tr>"
+        "<tr><td id='ali_td_tbl_etat'>missing</td></tr>"
+        "<tr><td><table><tr><td>x</td></tr></table></td></tr>"
+        "</table>"
+        "<table id='tbl_etat'><tr><td id='ali_td_tbl_etat'>ignored</td></tr></table>"
+    )
+    scan = scan_page(html)
+    assert scan.rows == [("A &B", "1", "°C")]
+    assert scan.has_table and not scan.logged_in and not scan.login_form
+
+
+def test_truncated_page_keeps_last_row():
+    """A row left open at the end of a truncated page is kept."""
+    html = (
+        "<table id='tbl_etat'><tr><td id='ali_td_tbl_etat'>T ext</td>"
+        "<td id='val_td_tbl_etat'>12.5</td><td id='unit_td_tbl_etat'>°C"
+    )
+    assert scan_page(html).rows == soup_rows(html) == [("T ext", "12.5", "°C")]
@@ -2,13 +2,18 @@
 
 import asyncio
 import contextlib
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+from src.aioiregul.models import Timings
 from src.aioiregul.v2.client import IRegulClient
+from src.aioiregul.v2.decoder import decode_text
+from src.aioiregul.v2.limiter import Budget, RateLimiter
 from src.aioiregul.v2.mappers import MappedFrame
+from src.aioiregul.v2.transport import StreamConnection, StreamTransport
 
 
 class TestIRegulClientInit:
@@ -22,6 +27,7 @@ class TestIRegulClientInit:
             device_id="dev123",
             password="key456",
             timeout=30.0,
+            transport=StreamTransport(),
         )
 
         assert client.host == "test.local"
@@ -102,6 +108,7 @@ class TestDefrostCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         # Mock the socket connection
@@ -137,6 +144,7 @@ class TestDefrostCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -159,6 +167,7 @@ class TestDefrostCommand:
             device_id="dev123",
             password="key456",
             timeout=1.0,
+            transport=StreamTransport(),
         )
 
         with (
@@ -175,6 +184,7 @@ class TestDefrostCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         with (
@@ -193,6 +203,7 @@ class TestDefrostCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         with (
@@ -209,6 +220,7 @@ class TestDefrostCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -231,6 +243,7 @@ class TestDefrostCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -258,6 +271,7 @@ class TestGetDataCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         # Mock the socket connection
@@ -315,6 +329,7 @@ class TestGetDataCommand:
             device_id="dev123",
             password="key456",
             config_skeleton=skeleton,
+            transport=StreamTransport(),
         )
 
         # Mock the socket connection
@@ -366,6 +381,7 @@ class TestGetDataCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         # First call: no skeleton, expect 502 and skeleton population
@@ -450,6 +466,7 @@ class TestGetDataCommand:
             device_id="dev123",
             password="key456",
             timeout=1.0,
+            transport=StreamTransport(),
         )
 
         with (
@@ -466,6 +483,7 @@ class TestGetDataCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         with (
@@ -484,6 +502,7 @@ class TestGetDataCommand:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -517,12 +536,15 @@ class TestReadNewResponse:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
         mock_reader.readuntil.return_value = b"NEW15/01/2025 23:38:51{10#mem@0&etat[10]}"
 
-        result = await client._read_new_response(mock_reader, timeout=5.0)
+        result = await client._read_new_response(
+            StreamConnection(mock_reader, AsyncMock()), timeout=5.0
+        )
 
         assert result == "NEW15/01/2025 23:38:51{10#mem@0&etat[10]}"
         mock_reader.readuntil.assert_called_once()
@@ -535,6 +557,7 @@ class TestReadNewResponse:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -544,7 +567,9 @@ class TestReadNewResponse:
             b"NEW15/01/2025 23:38:51{10#}",
         ]
 
-        result = await client._read_new_response(mock_reader, timeout=5.0)
+        result = await client._read_new_response(
+            StreamConnection(mock_reader, AsyncMock()), timeout=5.0
+        )
 
         assert result == "NEW15/01/2025 23:38:51{10#}"
         assert mock_reader.readuntil.call_count == 2
@@ -557,6 +582,7 @@ class TestReadNewResponse:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -568,7 +594,7 @@ class TestReadNewResponse:
         mock_reader.readuntil.side_effect = slow_read
 
         with pytest.raises(TimeoutError):
-            await client._read_new_response(mock_reader, timeout=0.1)
+            await client._read_new_response(StreamConnection(mock_reader, AsyncMock()), timeout=0.1)
 
     @pytest.mark.asyncio
     async def test_read_new_response_incomplete_read(self):
@@ -578,13 +604,14 @@ class TestReadNewResponse:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
         mock_reader.readuntil.side_effect = asyncio.IncompleteReadError(b"partial", 10)
 
         with pytest.raises(ValueError, match="Incomplete response from device"):
-            await client._read_new_response(mock_reader, timeout=5.0)
+            await client._read_new_response(StreamConnection(mock_reader, AsyncMock()), timeout=5.0)
 
     @pytest.mark.asyncio
     async def test_read_new_response_limit_overrun(self):
@@ -594,13 +621,14 @@ class TestReadNewResponse:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
         mock_reader.readuntil.side_effect = asyncio.LimitOverrunError("too much data", 1000)
 
         with pytest.raises(ValueError, match="Response too large or invalid format"):
-            await client._read_new_response(mock_reader, timeout=5.0)
+            await client._read_new_response(StreamConnection(mock_reader, AsyncMock()), timeout=5.0)
 
     @pytest.mark.asyncio
     async def test_read_new_response_empty_response(self):
@@ -610,13 +638,14 @@ class TestReadNewResponse:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
         mock_reader.readuntil.return_value = b""
 
         with pytest.raises(ValueError, match="Empty response from device"):
-            await client._read_new_response(mock_reader, timeout=5.0)
+            await client._read_new_response(StreamConnection(mock_reader, AsyncMock()), timeout=5.0)
 
 
 class TestIRegulClientIntegration:
@@ -630,6 +659,7 @@ class TestIRegulClientIntegration:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         mock_reader = AsyncMock()
@@ -674,6 +704,7 @@ class TestGetConfigSkeleton:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         # Mock the socket connection
@@ -755,6 +786,7 @@ class TestGetConfigSkeleton:
             port=443,
             device_id="dev123",
             password="key456",
+            transport=StreamTransport(),
         )
 
         # Initially, client has no skeleton
@@ -845,3 +877,569 @@ class TestGetConfigSkeleton:
             assert len(result_2.inputs) > 0  # Verify we have input data from merged response
 
             assert result_2.measurements.get(4).valeur == 2.11656  # Example access to measurement 4
+
+
+def _mock_connection(response: bytes) -> tuple[AsyncMock, AsyncMock]:
+    """Build a mocked (reader, writer) pair returning a single frame."""
+    mock_reader = AsyncMock()
+    mock_writer = AsyncMock()
+    mock_writer.close = Mock()
+    mock_writer.write = Mock()
+    mock_reader.readuntil.return_value = response
+    return mock_reader, mock_writer
+
+
+class TestSkeletonRefreshPolicy:
+    """Tests for the adaptive 501/502 scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_keys_schedule_502_refresh(self):
+        """A 501 response with an unknown index should trigger a 502 on the next poll."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+            transport=StreamTransport(),
+        )
+
+        reader, writer = _mock_connection(
+            b"15/01/2025 23:38:51{10#B@1&adresse[20]#B@2&adresse[18]}"
+        )
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            await client.get_data()
+        assert b"{501#}" in writer.write.call_args[0][0]
+        assert client.skeleton_needs_refresh()
+
+        reader, writer = _mock_connection(
+            b"15/01/2025 23:39:51{10#B@1&nom_registre[Salon]#B@2&nom_registre[Cuisine]}"
+        )
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            await client.get_data()
+        assert b"{502#}" in writer.write.call_args[0][0]
+        assert client.config_skeleton == {
+            "B": {1: {"nom_registre": "Salon"}, 2: {"nom_registre": "Cuisine"}}
+        }
+        assert not client.skeleton_needs_refresh()
+
+    @pytest.mark.asyncio
+    async def test_dynamic_fields_are_not_unknown_keys(self):
+        """Dynamic fields and excluded groups never invalidate the skeleton."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"M": {1: {"alias": "T ext"}}},
+            transport=StreamTransport(),
+        )
+
+        reader, writer = _mock_connection(
+            b"15/01/2025 23:38:51{10#M@1&valeur[2.5]#mem@0&etat[10]#J@3&titre[Menu]}"
+        )
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            await client.get_data()
+
+        assert not client.skeleton_needs_refresh()
+
+    @pytest.mark.asyncio
+    async def test_unknown_keys_ignored_when_disabled(self):
+        """Unknown keys do not trigger a refresh when the option is disabled."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+            refresh_on_unknown_keys=False,
+            transport=StreamTransport(),
+        )
+
+        reader, writer = _mock_connection(b"15/01/2025 23:38:51{10#B@2&nom_registre[Cuisine]}")
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            await client.get_data()
+
+        assert not client.skeleton_needs_refresh()
+
+    @pytest.mark.asyncio
+    async def test_refresh_interval_triggers_502(self):
+        """An expired skeleton is re-fetched with 502 and replaces the old one."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"B": {1: {"nom_registre": "Old"}}, "I": {7: {"alias": "x"}}},
+            skeleton_refresh_interval=timedelta(minutes=10),
+            transport=StreamTransport(),
+        )
+        assert not client.skeleton_needs_refresh()
+
+        # Age the skeleton past the refresh interval
+        client._skeleton_loaded_at -= 601
+        assert client.skeleton_needs_refresh()
+        reader, writer = _mock_connection(b"15/01/2025 23:38:51{10#B@1&nom_registre[New]}")
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            await client.get_data()
+
+        assert b"{502#}" in writer.write.call_args[0][0]
+        # Entries removed on the device are dropped from the skeleton
+        assert client.config_skeleton == {"B": {1: {"nom_registre": "New"}}}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_skeleton(self):
+        """invalidate_skeleton() forces the next poll to use 502."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+            transport=StreamTransport(),
+        )
+        client.invalidate_skeleton()
+
+        reader, writer = _mock_connection(b"15/01/2025 23:38:51{10#B@1&nom_registre[Salon]}")
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            await client.get_data()
+
+        assert b"{502#}" in writer.write.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_single_502_in_flight(self):
+        """Concurrent streams without skeleton issue one 502, the others use 501."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            transport=StreamTransport(),
+        )
+        commands: list[bytes] = []
+
+        async def open_connection(*args, **kwargs):
+            reader, writer = _mock_connection(b"15/01/2025 23:38:51{10#B@1&nom_registre[Salon]}")
+
+            async def slow_readuntil(*_args):
+                await asyncio.sleep(0.01)
+                return b"15/01/2025 23:38:51{10#B@1&nom_registre[Salon]}"
+
+            reader.readuntil.side_effect = slow_readuntil
+            writer.write.side_effect = commands.append
+            return reader, writer
+
+        async def consume() -> None:
+            async for _ in client.stream_data():
+                pass
+
+        with patch("asyncio.open_connection", side_effect=open_connection):
+            await asyncio.gather(*(consume() for _ in range(5)))
+
+        full_requests = [c for c in commands if b"{502#}" in c]
+        assert len(full_requests) == 1
+        assert len(commands) == 5
+
+
+class TestStreamData:
+    """Tests for the stale-while-revalidate stream_data() API."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_old_then_new(self):
+        """OLD frame is mapped and yielded before the NEW frame on one connection."""
+        data_dir = Path(__file__).parent / "data" / "v2messages"
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            transport=StreamTransport(),
+        )
+
+        reader, writer = _mock_connection(b"")
+        reader.readuntil.side_effect = [
+            (data_dir / "502-OLD.txt").read_bytes(),
+            (data_dir / "502-NEW.txt").read_bytes(),
+        ]
+
+        with patch("asyncio.open_connection", return_value=(reader, writer)) as mock_conn:
+            frames = [frame async for frame in client.stream_data()]
+
+        mock_conn.assert_called_once()
+        assert [frame.is_old for frame in frames] == [True, False]
+        assert frames[0].measurements and frames[1].measurements
+        assert b"{502#}" in writer.write.call_args[0][0]
+        assert client.config_skeleton is not None
+        writer.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_old_frame_does_not_update_skeleton(self):
+        """Stopping after the OLD frame leaves the skeleton untouched."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+            transport=StreamTransport(),
+        )
+
+        reader, writer = _mock_connection(b"")
+        frames = [b"OLD15/01/2025 23:38:51{10#B@1&nom_registre[Ancien]#B@2&nom_registre[X]}"]
+        reads = 0
+
+        async def readuntil(separator):
+            # OLD once, then the NEW frame never comes
+            nonlocal reads
+            reads += 1
+            if frames:
+                return frames.pop()
+            await asyncio.Event().wait()
+
+        reader.readuntil.side_effect = readuntil
+
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            stream = client.stream_data()
+            old = await anext(stream)
+            # Well within the client timeout: the pending read is cancelled
+            await asyncio.wait_for(stream.aclose(), timeout=5)
+
+        assert reads == 2
+
+        assert old.is_old
+        assert old.modbus_registers[1].nom_registre == "Ancien"
+        assert client.config_skeleton == {"B": {1: {"nom_registre": "Salon"}}}
+        assert not client.skeleton_needs_refresh()
+        writer.close.assert_called_once()
+        writer.wait_closed.assert_called_once()
+
+
+class TestTimings:
+    """Tests for per-phase latency instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_get_data_records_phases_and_calls_hook(self):
+        """get_data attaches its timings to the frame and reports them to the hook."""
+        data_dir = Path(__file__).parent / "data" / "v2messages"
+        old = (data_dir / "502-OLD.txt").read_bytes()
+        new = (data_dir / "502-NEW.txt").read_bytes()
+        reported = []
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            transport=StreamTransport(),
+            timings_hook=reported.append,
+        )
+
+        reader, writer = _mock_connection(b"")
+        reader.readuntil.side_effect = [old, new]
+        with patch("asyncio.open_connection", return_value=(reader, writer)):
+            frame = await client.get_data()
+
+        assert frame is not None and frame.timings is not None
+        assert list(frame.timings.phases) == [
+            "connect",
+            "send",
+            "wait_old",
+            "wait_new",
+            "decode",
+            "merge",
+            "map",
+        ]
+        assert frame.timings.bytes_received == len(old) + len(new)
+        assert [t.operation for t in reported] == ["get_data"]
+        assert reported[0].error is None
+
+    @pytest.mark.asyncio
+    async def test_hook_reports_failures(self):
+        """A failed operation still reports its timings with the error name."""
+        reported = []
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            transport=StreamTransport(),
+            timings_hook=reported.append,
+        )
+
+        with (
+            patch("asyncio.open_connection", side_effect=OSError("refused")),
+            pytest.raises(ConnectionError),
+        ):
+            await client.defrost()
+
+        assert len(reported) == 1
+        assert reported[0].operation == "defrost"
+        assert reported[0].error == "ConnectionError"
+        assert "connect" in reported[0].phases
+
+
+class TestUnchangedPayload:
+    """Tests for the unchanged-payload short-circuit."""
+
+    @staticmethod
+    def _client():
+        return IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="key456",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+        )
+
+    @pytest.mark.asyncio
+    async def test_identical_payload_reuses_last_frame(self):
+        """Only the timestamp of a repeated 501 payload is parsed."""
+        client = self._client()
+        payload = "{10#B@1&nom_registre[Salon]#B@1&valeur[3]}"
+        first = await client._map_response("501", f"15/01/2025 23:38:51{payload}", Timings("a"))
+
+        with patch("src.aioiregul.v2.client.decode_text") as decode:
+            second = await client._map_response(
+                "501", f"15/01/2025 23:39:51{payload}", Timings("b")
+            )
+
+        decode.assert_not_called()
+        assert second == replace(first, timestamp=datetime(2025, 1, 15, 23, 39, 51))
+        assert second.timings is not None and list(second.timings.phases) == ["decode"]
+        assert client._last_frame is second
+
+    @pytest.mark.asyncio
+    async def test_changed_payload_is_decoded(self):
+        """A different payload, a 502 or a reloaded skeleton disable the reuse."""
+        client = self._client()
+        frame = "15/01/2025 23:38:51{10#B@1&nom_registre[Salon]#B@1&valeur[3]}"
+        await client._map_response("501", frame, Timings("a"))
+
+        changed = await client._map_response("501", frame.replace("[3]", "[4]"), Timings("b"))
+        assert changed.modbus_registers[1].valeur == 4
+
+        client.load_skeleton_from(client.save_skeleton())
+        with patch("src.aioiregul.v2.client.decode_text", wraps=decode_text) as decode:
+            await client._map_response("501", frame, Timings("c"))
+            await client._map_response("502", frame, Timings("d"))
+            await client._map_response("501", frame, Timings("e"))
+        assert decode.call_count == 3
+
+
+class TestChangedGroups:
+    """Tests for group-level partial decoding of 501 responses."""
+
+    @staticmethod
+    async def _client_after_poll(data_dir):
+        client = IRegulClient(host="test.local", port=443, device_id="dev123", password="pw")
+        await client._map_response("502", (data_dir / "502-NEW.txt").read_text(), Timings("a"))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_only_changed_groups_are_remapped(self):
+        """A partial update equals a full decode and keeps unchanged group objects."""
+        data_dir = Path(__file__).parent / "data" / "v2messages"
+        response = (data_dir / "501-NEW.txt").read_text()
+        changed = response.replace("mem@0&etat[10]", "mem@0&etat[11]").replace(
+            "M@1&valeur[", "M@1&valeur[9"
+        )
+        assert changed.count("#") == response.count("#") and changed != response
+
+        client = await self._client_after_poll(data_dir)
+        first = await client._map_response("501", response, Timings("b"))
+        with patch("src.aioiregul.v2.client.decode_text") as decode:
+            second = await client._map_response("501", changed, Timings("c"))
+        decode.assert_not_called()
+
+        reference = await self._client_after_poll(data_dir)
+        expected = await reference._map_response("501", changed, Timings("d"))
+        assert second == expected
+        assert client.config_skeleton == reference.config_skeleton
+        assert second.memory != first.memory
+        assert second.measurements[1] != first.measurements[1]
+        assert second.zones is first.zones
+        assert second.modbus_registers is first.modbus_registers
+
+    @pytest.mark.asyncio
+    async def test_different_groups_fall_back_to_full_decode(self):
+        """A response with another set of groups is decoded in full."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev123",
+            password="pw",
+            config_skeleton={"B": {1: {"nom_registre": "Salon"}}},
+        )
+        await client._map_response("501", "15/01/2025 23:38:51{10#B@1&valeur[3]}", Timings("a"))
+        with patch("src.aioiregul.v2.client.decode_text", wraps=decode_text) as decode:
+            frame = await client._map_response(
+                "501", "15/01/2025 23:39:51{10#B@1&valeur[3]#mem@0&etat[10]}", Timings("b")
+            )
+
+        decode.assert_called_once()
+        assert frame.memory is not None and frame.memory.state == {"etat": "10"}
+
+
+class TestSingleFlight:
+    """Tests for get_data() request coalescing and max_age caching."""
+
+    @staticmethod
+    def _slow_connection(commands: list[bytes], delay: float = 0.01):
+        """Return an open_connection side effect with a slow frame read."""
+
+        async def open_connection(*args, **kwargs):
+            reader, writer = _mock_connection(b"")
+
+            async def slow_readuntil(*_args):
+                await asyncio.sleep(delay)
+                return b"15/01/2025 23:38:51{10#M@1&valeur[2.5]}"
+
+            reader.readuntil.side_effect = slow_readuntil
+            writer.write.side_effect = commands.append
+            return reader, writer
+
+        return open_connection
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self):
+        """Concurrent callers share one round-trip and the same result."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            transport=StreamTransport(),
+        )
+        commands: list[bytes] = []
+
+        with patch("asyncio.open_connection", side_effect=self._slow_connection(commands)):
+            results = await asyncio.gather(*(client.get_data() for _ in range(5)))
+
+        assert len(commands) == 1
+        assert all(result is results[0] for result in results)
+
+        # Once complete, the next call issues a new request
+        with patch("asyncio.open_connection", side_effect=self._slow_connection(commands)):
+            await client.get_data()
+        assert len(commands) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_callers(self):
+        """A failed shared request raises in every caller and is not cached."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            transport=StreamTransport(),
+        )
+
+        async def refuse(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise ConnectionRefusedError("refused")
+
+        with patch("asyncio.open_connection", side_effect=refuse):
+            results = await asyncio.gather(
+                *(client.get_data() for _ in range(3)), return_exceptions=True
+            )
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert client._inflight is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self):
+        """Cancelling one waiter leaves the shared request running for the others."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            transport=StreamTransport(),
+        )
+        commands: list[bytes] = []
+
+        with patch("asyncio.open_connection", side_effect=self._slow_connection(commands, 0.05)):
+            first = asyncio.ensure_future(client.get_data())
+            second = asyncio.ensure_future(client.get_data())
+            await asyncio.sleep(0.01)
+            first.cancel()
+            result = await second
+
+        assert isinstance(result, MappedFrame)
+        assert len(commands) == 1
+
+    @pytest.mark.asyncio
+    async def test_request_cancelled_with_its_last_caller(self):
+        """Once every caller is cancelled, the shared request releases its slot."""
+        limiter = RateLimiter({"502": Budget(max_concurrent=1)})
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            transport=StreamTransport(),
+            rate_limiter=limiter,
+        )
+        commands: list[bytes] = []
+
+        with patch("asyncio.open_connection", side_effect=self._slow_connection(commands, 60)):
+            callers = [asyncio.ensure_future(client.get_data()) for _ in range(2)]
+            while not commands:
+                await asyncio.sleep(0)
+            inflight = client._inflight
+            callers[0].cancel()
+            await asyncio.sleep(0)
+            assert not inflight.done()
+
+            callers[1].cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            with contextlib.suppress(asyncio.CancelledError):
+                await inflight
+
+        assert inflight.cancelled()
+        assert client._inflight is None
+        assert limiter.stats["502"].in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_max_age_serves_cached_frame(self):
+        """Calls within max_age reuse the last frame without I/O."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            max_age=timedelta(seconds=30),
+            transport=StreamTransport(),
+        )
+        commands: list[bytes] = []
+
+        with patch("asyncio.open_connection", side_effect=self._slow_connection(commands)):
+            first = await client.get_data()
+            second = await client.get_data()
+
+            assert second is first
+            assert len(commands) == 1
+
+            # Age the cached frame past max_age
+            client._last_frame_at -= 31
+            third = await client.get_data()
+
+        assert third is not first
+        assert len(commands) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_max_age_always_polls(self):
+        """Without max_age every sequential call contacts the device."""
+        client = IRegulClient(
+            host="test.local",
+            port=443,
+            device_id="dev",
+            password="pw",
+            transport=StreamTransport(),
+        )
+        commands: list[bytes] = []
+
+        with patch("asyncio.open_connection", side_effect=self._slow_connection(commands)):
+            await client.get_data()
+            await client.get_data()
+
+        assert len(commands) == 2